@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+CRAFT AI Response Cache
+
+Content-addressed store for AI completions: the key is a SHA-256 of
+(model, rendered prompt, generation parameters), so an adapter whose inputs
+have not changed is answered from disk and only new or changed APIs reach
+the model.
+
+Entries live in a SQLite database (WAL mode), which makes the cache safe to
+share between threads and worker processes. Lookups are plain reads, so
+concurrent readers never wait on each other or on a writer. Each hit
+refreshes the entry's access stamp (a logical clock shared through the
+database); stamps and hit/miss counts are buffered and written back in one
+short transaction every few lookups and before each put. When the stored
+bytes exceed ``max_bytes`` (or the entry count exceeds ``max_entries``) the
+least recently used entries are evicted. Hit/miss counters are kept per
+instance and accumulated in the database.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import asdict
+from typing import Dict, Optional
+
+from ai_client import Completion
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Rows examined per eviction round
+_EVICT_BATCH = 64
+# Buffered lookups before their access stamps and counters are written back
+_FLUSH_EVERY = 32
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters VALUES
+    ('clock', 0), ('bytes', 0), ('hits', 0), ('misses', 0), ('evictions', 0);
+"""
+
+
+def cache_key(model: str, prompt: str, **params) -> str:
+    """SHA-256 over the model, the rendered prompt and the generation parameters."""
+    material = json.dumps({"model": model, "prompt": prompt, "params": params},
+                          sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """LRU, size-bounded on-disk map from cache_key() to a Completion."""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: Optional[int] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Keys hit since the last write-back, least recent first; pending counter deltas
+        self._touched: Dict[str, None] = {}
+        self._pending_hits = 0
+        self._pending_misses = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db().executescript(_SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        # One connection per thread; each process opens its own.
+        db = getattr(self._local, 'db', None)
+        if db is None or getattr(self._local, 'pid', None) != os.getpid():
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def _transaction(self):
+        return _Transaction(self._db())
+
+    @staticmethod
+    def _tick(db: sqlite3.Connection) -> int:
+        db.execute("UPDATE counters SET value = value + 1 WHERE name = 'clock'")
+        return db.execute("SELECT value FROM counters WHERE name = 'clock'").fetchone()[0]
+
+    key = staticmethod(cache_key)
+
+    def get(self, key: str) -> Optional[Completion]:
+        # A plain read outside any write transaction; the access stamp is written back later
+        row = self._db().execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                self._pending_misses += 1
+            else:
+                self.hits += 1
+                self._pending_hits += 1
+                self._touched.pop(key, None)
+                self._touched[key] = None
+            due = len(self._touched) + self._pending_misses >= _FLUSH_EVERY
+        if due:
+            self.flush()
+        if row is None:
+            return None
+        return Completion(**dict(json.loads(row[0]), latency=0.0, cached=True))
+
+    def _take_pending(self):
+        with self._lock:
+            pending = list(self._touched), self._pending_hits, self._pending_misses
+            self._touched, self._pending_hits, self._pending_misses = {}, 0, 0
+        return pending
+
+    @staticmethod
+    def _write_back(db: sqlite3.Connection, pending):
+        """Apply buffered access stamps (in hit order) and hit/miss counts."""
+        touched, hits, misses = pending
+        if touched:
+            db.execute("UPDATE counters SET value = value + ? WHERE name = 'clock'", (len(touched),))
+            clock = db.execute("SELECT value FROM counters WHERE name = 'clock'").fetchone()[0]
+            start = clock - len(touched) + 1
+            db.executemany("UPDATE entries SET accessed = ? WHERE key = ?",
+                           ((start + i, key) for i, key in enumerate(touched)))
+        for name, delta in (('hits', hits), ('misses', misses)):
+            if delta:
+                db.execute("UPDATE counters SET value = value + ? WHERE name = ?", (delta, name))
+
+    def flush(self):
+        """Write buffered access stamps and hit/miss counts in one short transaction."""
+        pending = self._take_pending()
+        if any(pending[1:]):
+            with self._transaction() as db:
+                self._write_back(db, pending)
+
+    def put(self, key: str, completion: Completion):
+        value = json.dumps(dict(asdict(completion), cached=False, latency=0.0), ensure_ascii=False)
+        size = len(value.encode('utf-8'))
+        pending = self._take_pending()
+        with self._transaction() as db:
+            self._write_back(db, pending)   # so eviction sees recent hits
+            old = db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", (key, value, size, self._tick(db)))
+            db.execute("UPDATE counters SET value = value + ? WHERE name = 'bytes'",
+                       (size - (old[0] if old else 0),))
+            self._evict(db)
+
+    def _evict(self, db: sqlite3.Connection):
+        """Drop least recently used entries until both bounds hold (inside put's transaction)."""
+        total = db.execute("SELECT value FROM counters WHERE name = 'bytes'").fetchone()[0]
+        excess = 0
+        if self.max_entries is not None:
+            excess = db.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+        freed = evicted = 0
+        while total - freed > self.max_bytes or evicted < excess:
+            victims = db.execute("SELECT key, size FROM entries ORDER BY accessed LIMIT ?",
+                                 (_EVICT_BATCH,)).fetchall()
+            if not victims:
+                break
+            for key, size in victims:
+                if total - freed <= self.max_bytes and evicted >= excess:
+                    break
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                freed += size
+                evicted += 1
+        if evicted:
+            db.execute("UPDATE counters SET value = value - ? WHERE name = 'bytes'", (freed,))
+            db.execute("UPDATE counters SET value = value + ? WHERE name = 'evictions'", (evicted,))
+
+    def __len__(self) -> int:
+        return self._db().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        return self._db().execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is not None
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """This instance's hit rate plus totals accumulated by every user of the file."""
+        self.flush()
+        counters = dict(self._db().execute("SELECT name, value FROM counters").fetchall())
+        lookups = counters['hits'] + counters['misses']
+        return {
+            "entries": len(self),
+            "bytes": counters['bytes'],
+            "evictions": counters['evictions'],
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "total_hits": counters['hits'],
+            "total_misses": counters['misses'],
+            "total_hit_rate": round(counters['hits'] / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self):
+        self.flush()
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, so concurrent writers serialize on the database lock."""
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, *exc):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
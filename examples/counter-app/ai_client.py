@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+CRAFT AI Client
+
+Python counterpart of the Rust ClaudeClient. Every request passes through a
+token-bucket limiter sized from ai.rate_limit_rpm / ai.rate_limit_tpm, so
+throughput runs up to the quota instead of into it; 429 and transient
+errors are retried up to ai.retry_attempts times with jittered exponential
+backoff (honouring Retry-After). The HTTP backend keeps one persistent
+connection per thread.
+
+MockBackend returns canned completions with configurable latency and can
+enforce its own quota; MockServer exposes it over the Messages API wire
+format so the HTTP path can be exercised offline.
+"""
+
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from sdk_model import CONFIG_PATH
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional; fall back to the defaults below
+    yaml = None
+
+API_URL = "https://api.anthropic.com/v1"
+API_VERSION = "2023-06-01"
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token)."""
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+@dataclass
+class AiConfig:
+    """The ``ai`` section of craft_config.yaml."""
+    provider: str = "anthropic"
+    model_light: str = "claude-3-haiku-20240307"
+    model_standard: str = "claude-sonnet-4-20250514"
+    model_advanced: str = "claude-opus-4-5-20251101"
+    max_tokens: int = 4096
+    temperature: float = 0.2
+    rate_limit_rpm: int = 50
+    rate_limit_tpm: Optional[int] = None
+    retry_attempts: int = 3
+    prompt_budget: int = 8000
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'AiConfig':
+        path = path or CONFIG_PATH
+        if yaml is None or not os.path.exists(path):
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            section = (yaml.safe_load(f) or {}).get('ai') or {}
+        known = {name: section[name] for name in cls.__dataclass_fields__ if name in section}
+        return cls(**known)
+
+
+class AiError(Exception):
+    """Request failed and should not be retried."""
+
+
+class TransientError(AiError):
+    """Overload, 5xx or connection failure; worth retrying."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimitError(TransientError):
+    """HTTP 429."""
+
+
+@dataclass
+class Completion:
+    text: str
+    model: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency: float = 0.0
+    cached: bool = False
+
+# ============================================================================
+# Rate limiting
+# ============================================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at ``rate`` per second.
+    acquire() reserves first and sleeps off any deficit outside the lock, so
+    concurrent callers are served in arrival order.
+    """
+
+    def __init__(self, capacity: float, rate: float,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, amount: float = 1.0) -> Optional[float]:
+        """Take ``amount`` if available now; otherwise return the seconds until it will be."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return None
+            return (amount - self._tokens) / self.rate
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Block until ``amount`` is granted; returns the seconds waited."""
+        amount = min(amount, self.capacity)  # an oversized request waits for a full bucket
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def debit(self, amount: float):
+        """Charge usage known only afterwards (output tokens); may go negative."""
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+
+
+class RateLimiter:
+    """Requests-per-minute and (optionally) tokens-per-minute buckets."""
+
+    def __init__(self, rpm: int, tpm: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.requests = TokenBucket(rpm, rpm / 60.0, clock, sleep)
+        self.tokens = TokenBucket(tpm, tpm / 60.0, clock, sleep) if tpm else None
+
+    def acquire(self, input_tokens: int = 0) -> float:
+        waited = self.requests.acquire(1)
+        if self.tokens is not None:
+            waited += self.tokens.acquire(input_tokens)
+        return waited
+
+    def record_output(self, output_tokens: int):
+        if self.tokens is not None:
+            self.tokens.debit(output_tokens)
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+CannedResponse = Union[str, Callable[[str], str]]
+
+
+class MockBackend:
+    """
+    Offline stand-in: the first ``responses`` key found in the prompt picks
+    the completion (a string, or a callable taking the prompt), else
+    ``default``. ``quota_rpm`` makes it answer 429 like a real endpoint.
+    """
+
+    def __init__(self, responses: Optional[Dict[str, CannedResponse]] = None,
+                 default: CannedResponse = "// TODO: adapter", latency: float = 0.0,
+                 quota_rpm: Optional[int] = None, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.responses = dict(responses or {})
+        self.default = default
+        self.latency = latency
+        self._sleep = sleep
+        self.quota = TokenBucket(quota_rpm, quota_rpm / 60.0, clock, sleep) if quota_rpm else None
+        self.calls: List[Tuple[str, str]] = []  # (model, prompt)
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def complete(self, model: str, prompt: str, max_tokens: int, temperature: float) -> Completion:
+        if self.quota is not None:
+            retry_after = self.quota.try_acquire()
+            if retry_after is not None:
+                with self._lock:
+                    self.rejected += 1
+                raise RateLimitError("rate limited", retry_after)
+        if self.latency:
+            self._sleep(self.latency)
+        with self._lock:
+            self.calls.append((model, prompt))
+        canned = next((v for k, v in self.responses.items() if k in prompt), self.default)
+        text = canned(prompt) if callable(canned) else canned
+        return Completion(text, model, estimate_tokens(prompt), estimate_tokens(text), self.latency)
+
+
+class HttpBackend:
+    """Messages API over one keep-alive connection per thread."""
+
+    def __init__(self, api_key: Optional[str] = None, base_url: str = API_URL, timeout: float = 120.0):
+        self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+        if not self.api_key:
+            raise AiError("ANTHROPIC_API_KEY not set")
+        url = urlsplit(base_url)
+        self._https = url.scheme == 'https'
+        self._host = url.netloc
+        self._path = url.path.rstrip('/') + '/messages'
+        self.timeout = timeout
+        self._local = threading.local()
+        self.connections = 0  # connections opened (for diagnostics)
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+            conn = self._local.conn = cls(self._host, timeout=self.timeout)
+            self.connections += 1
+        return conn
+
+    def _post(self, body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        headers = {"x-api-key": self.api_key, "anthropic-version": API_VERSION,
+                   "content-type": "application/json"}
+        for attempt in range(2):  # a reused connection may have been closed by the server
+            conn = self._connection()
+            try:
+                conn.request("POST", self._path, body, headers)
+                response = conn.getresponse()
+                return response.status, dict(response.getheaders()), response.read()
+            except (http.client.HTTPException, ConnectionError) as e:
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise TransientError(f"connection failed: {e}") from e
+            except OSError as e:
+                conn.close()
+                self._local.conn = None
+                raise TransientError(f"connection failed: {e}") from e
+
+    def complete(self, model: str, prompt: str, max_tokens: int, temperature: float) -> Completion:
+        start = time.perf_counter()
+        body = json.dumps({"model": model, "max_tokens": max_tokens, "temperature": temperature,
+                           "messages": [{"role": "user", "content": prompt}]}).encode('utf-8')
+        status, headers, data = self._post(body)
+        headers = {k.lower(): v for k, v in headers.items()}
+        if status == 429:
+            raise RateLimitError("rate limited", _retry_after(headers))
+        if status >= 500:
+            raise TransientError(f"server error {status}", _retry_after(headers))
+        if status >= 400:
+            raise AiError(f"API request failed ({status}): {data.decode('utf-8', 'replace')}")
+        payload = json.loads(data)
+        usage = payload.get("usage") or {}
+        text = "".join(block.get("text", "") for block in payload.get("content") or [])
+        return Completion(text, payload.get("model", model), usage.get("input_tokens", 0),
+                          usage.get("output_tokens", 0), time.perf_counter() - start)
+
+
+def _retry_after(headers: Dict[str, str]) -> Optional[float]:
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
+class MockServer:
+    """Serves a MockBackend over HTTP/1.1 keep-alive, Messages API shaped."""
+
+    def __init__(self, backend: MockBackend, host: str = "127.0.0.1", port: int = 0):
+        self.backend = backend
+        self.connections = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                server.connections += 1
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))))
+                prompt = "".join(m["content"] for m in request["messages"])
+                try:
+                    result = server.backend.complete(request["model"], prompt,
+                                                     request.get("max_tokens", 0), request.get("temperature", 0))
+                except RateLimitError as e:
+                    self._send(429, {"type": "error", "error": {"type": "rate_limit_error"}},
+                               {"retry-after": f"{e.retry_after or 1:.3f}"})
+                    return
+                self._send(200, {"model": result.model, "content": [{"type": "text", "text": result.text}],
+                                 "usage": {"input_tokens": result.input_tokens,
+                                           "output_tokens": result.output_tokens}})
+
+            def _send(self, status, payload, headers=None):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f"http://{host}:{self._httpd.server_address[1]}/v1"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self) -> 'MockServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+# ============================================================================
+# Client
+# ============================================================================
+
+@dataclass
+class ClientStats:
+    requests: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    throttled_seconds: float = 0.0   # time spent waiting on the local limiter
+    cache_hits: int = 0
+
+
+class AiClient:
+    """Rate-limited, retrying front end over a backend."""
+
+    BACKOFF_BASE = 1.0
+    BACKOFF_CAP = 60.0
+
+    def __init__(self, config: Optional[AiConfig] = None, backend=None,
+                 limiter: Optional[RateLimiter] = None, sleep: Callable[[float], None] = time.sleep,
+                 rng: Callable[[], float] = random.random, cache=None):
+        self.config = config or AiConfig.load()
+        self.backend = backend if backend is not None else default_backend(self.config)
+        self.limiter = limiter or RateLimiter(self.config.rate_limit_rpm, self.config.rate_limit_tpm)
+        self.cache = cache  # ai_cache.ResponseCache; hits skip the limiter entirely
+        self._sleep = sleep
+        self._rng = rng
+        self.stats = ClientStats()
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for retry ``attempt`` (0-based)."""
+        return self._rng() * min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2 ** attempt)
+
+    def complete(self, prompt: str, model: Optional[str] = None, max_tokens: Optional[int] = None,
+                 temperature: Optional[float] = None) -> Completion:
+        model = model or self.config.model_standard
+        max_tokens = max_tokens or self.config.max_tokens
+        temperature = self.config.temperature if temperature is None else temperature
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(model, prompt, max_tokens=max_tokens, temperature=temperature)
+            hit = self.cache.get(key)
+            if hit is not None:
+                with self._lock:
+                    self.stats.cache_hits += 1
+                return hit
+        input_tokens = estimate_tokens(prompt)
+
+        for attempt in range(self.config.retry_attempts + 1):
+            waited = self.limiter.acquire(input_tokens)
+            with self._lock:
+                self.stats.requests += 1
+                self.stats.throttled_seconds += waited
+            try:
+                result = self.backend.complete(model, prompt, max_tokens, temperature)
+            except TransientError as e:
+                with self._lock:
+                    self.stats.rate_limited += isinstance(e, RateLimitError)
+                if attempt == self.config.retry_attempts:
+                    raise
+                with self._lock:
+                    self.stats.retries += 1
+                self._sleep(max(e.retry_after or 0.0, self.backoff(attempt)))
+                continue
+            self.limiter.record_output(result.output_tokens)
+            with self._lock:
+                self.stats.input_tokens += result.input_tokens
+                self.stats.output_tokens += result.output_tokens
+            if key is not None:
+                self.cache.put(key, result)
+            return result
+
+
+def default_backend(config: AiConfig):
+    """Backend for ``ai.provider``: 'mock' runs offline, anything else calls the API."""
+    if config.provider == "mock":
+        return MockBackend()
+    return HttpBackend()
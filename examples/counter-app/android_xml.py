@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+CRAFT Android XML Reader
+
+Streams Android XML (layouts, manifest, value resources) through expat in a
+single pass. The same pass validates nesting and builds a compact element
+tree, so CodeVerifier and the generators share one parse per file.
+"""
+
+import os
+import xml.parsers.expat
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+ANDROID_PREFIX = "android:"
+
+_READ_CHUNK = 64 * 1024
+
+
+@dataclass
+class LayoutNode:
+    """
+    One XML element. android:* attributes are stored without the prefix.
+    ``text`` is the element's own text, stripped; as in ElementTree,
+    ``leading`` is the raw text before the first child and ``tail`` the raw
+    text after the end tag, so mixed content survives (see itertext()).
+    """
+    tag: str
+    attrs: Dict[str, str] = field(default_factory=dict)
+    children: List['LayoutNode'] = field(default_factory=list)
+    text: str = ""
+    line: int = 0
+    leading: str = ""
+    tail: str = ""
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.attrs.get(name, default)
+
+    def iter(self) -> Iterator['LayoutNode']:
+        """Depth-first iteration over this node and its descendants."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def itertext(self) -> Iterator[str]:
+        """All text inside this element in document order (children's text and tails included)."""
+        if self.leading:
+            yield self.leading
+        for child in self.children:
+            yield from child.itertext()
+            if child.tail:
+                yield child.tail
+
+    def signature(self) -> Tuple:
+        """Hashable structural key (tag, attributes, text, children)."""
+        return (self.tag, tuple(sorted(self.attrs.items())), self.text,
+                tuple(child.signature() for child in self.children))
+
+
+@dataclass
+class XmlDocument:
+    root: Optional[LayoutNode] = None
+    has_declaration: bool = False
+    error: Optional[str] = None
+
+    @property
+    def well_formed(self) -> bool:
+        return self.error is None and self.root is not None
+
+
+class _TreeBuilder:
+    def __init__(self, parser):
+        self.parser = parser
+        self.document = XmlDocument()
+        self.stack: List[LayoutNode] = []
+        self.text: List[List[str]] = []
+        self.tail: Optional[LayoutNode] = None   # last closed element, until the next tag
+
+    def xml_decl(self, version, encoding, standalone):
+        self.document.has_declaration = True
+
+    def start(self, tag, attrs):
+        compact = {}
+        for name, value in attrs.items():
+            if name.startswith(ANDROID_PREFIX):
+                compact[name[len(ANDROID_PREFIX):]] = value
+            elif not name.startswith("xmlns"):
+                compact[name] = value
+        node = LayoutNode(tag, compact, line=self.parser.CurrentLineNumber)
+        if self.stack:
+            parent = self.stack[-1]
+            if not parent.children:
+                parent.leading = ''.join(self.text[-1])
+            parent.children.append(node)
+        else:
+            self.document.root = node
+        self.stack.append(node)
+        self.text.append([])
+        self.tail = None
+
+    def end(self, tag):
+        node = self.stack.pop()
+        own = ''.join(self.text.pop())
+        node.text = own.strip()
+        if not node.children:
+            node.leading = own
+        self.tail = node   # text that follows belongs to this node's tail
+
+    def data(self, text):
+        if self.text:
+            self.text[-1].append(text)
+        if self.tail is not None:
+            self.tail.tail += text
+
+
+def _new_parser() -> Tuple[object, _TreeBuilder]:
+    parser = xml.parsers.expat.ParserCreate()
+    parser.buffer_text = True
+    builder = _TreeBuilder(parser)
+    parser.XmlDeclHandler = builder.xml_decl
+    parser.StartElementHandler = builder.start
+    parser.EndElementHandler = builder.end
+    parser.CharacterDataHandler = builder.data
+    return parser, builder
+
+
+def parse_xml(content: Union[str, bytes]) -> XmlDocument:
+    """Parse XML text in one pass; nesting errors are reported, not raised."""
+    parser, builder = _new_parser()
+    try:
+        parser.Parse(content, True)
+    except xml.parsers.expat.ExpatError as e:
+        builder.document.error = f"{xml.parsers.expat.ErrorString(e.code)} at line {e.lineno}, column {e.offset + 1}"
+    return builder.document
+
+
+def parse_stream(stream) -> XmlDocument:
+    """Parse from a binary file object in fixed-size chunks."""
+    parser, builder = _new_parser()
+    try:
+        while True:
+            chunk = stream.read(_READ_CHUNK)
+            parser.Parse(chunk, not chunk)
+            if not chunk:
+                break
+    except xml.parsers.expat.ExpatError as e:
+        builder.document.error = f"{xml.parsers.expat.ErrorString(e.code)} at line {e.lineno}, column {e.offset + 1}"
+    return builder.document
+
+
+_DOCUMENTS: Dict[str, Tuple[Tuple[int, int], XmlDocument]] = {}
+
+
+def load_xml(path: str) -> XmlDocument:
+    """
+    Parse an XML file once per process. Results are reused until the
+    file's mtime or size changes, so verification and generation share them.
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _DOCUMENTS.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with open(key, 'rb') as f:
+        document = parse_stream(f)
+    _DOCUMENTS[key] = (stamp, document)
+    return document
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - Android 调用点重写器
+
+基于 API 映射表, 在 Android 源码中查找所有已映射 API 的使用位置:
+1. 用全部映射的方法名/类名构建一个 Aho-Corasick 自动机
+2. 每个文件只扫描一次, 跳过注释和字符串字面量
+3. 输出调用点报告, 或直接生成重写后的源码
+
+自动机以词法 token (标识符和 '.') 为字母表, 因此天然只匹配完整标识符,
+同时支持 `Activity.finish` / `android.app.Activity` 这类限定名模式。
+扫描先用一个由全部模式首 token 构成的 trie 正则 (C 速度) 跳到候选位置,
+只在候选处逐 token 推进自动机; 不含任何模式的代码不进入 Python 层。
+方法声明 (`public void finish() {`) 不是调用点: 名字前是返回类型/修饰符,
+或参数表后跟 `{` / `throws` 的匹配会被跳过。
+
+用法:
+    python3 call_site_rewriter.py <src_root>            # 打印调用点报告
+    python3 call_site_rewriter.py <src_root> --json     # JSON 报告
+    python3 call_site_rewriter.py <src_root> --apply    # 原地重写
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import deque
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from craft_generate import API_MAPPING
+
+# ============================================================================
+# 数据模型
+# ============================================================================
+
+@dataclass
+class CallSite:
+    path: str
+    line: int
+    column: int
+    pattern: str
+    replacement: str
+    kind: str  # 'call' | 'reference'
+    start: int
+    end: int
+
+
+@dataclass
+class RewritePattern:
+    pattern: str
+    replacement: str
+    kind: str  # 'method' | 'class'
+
+# ============================================================================
+# 词法分析
+# ============================================================================
+
+# 注释和字符串整体作为一个 token 被跳过; Java 文本块 / 字符字面量 / TS 模板字符串都在此列
+_SKIP_SOURCE = (
+    r'//[^\n]*'
+    r'|/\*.*?(?:\*/|\Z)'
+    r'|""".*?(?:"""|\Z)'
+    r'|"(?:[^"\\\n]|\\.)*"'
+    r"|'(?:[^'\\\n]|\\.)*'"
+    r'|`(?:[^`\\]|\\.)*`'
+)
+_TOKEN_RE = re.compile(
+    f'(?P<skip>{_SKIP_SOURCE})'
+    r'|(?P<ident>[A-Za-z_$][\w$]*)'
+    r'|(?P<dot>\.)'
+    r'|(?P<paren>\()'
+    r'|(?P<other>[^\s\w$.(\'"`/]+|/)',
+    re.DOTALL
+)
+_SKIP, _IDENT, _DOT, _PAREN, _OTHER = 1, 2, 3, 4, 5
+
+# 声明的参数表之后: 方法体或 throws 子句
+_DECLARATION_TAIL_RE = re.compile(r'\s*(?:\{|throws\b)')
+_PARENS_RE = re.compile(r'[()]')
+# 方法名之后下一个有效 token 是 '(' (中间可隔空白/注释)
+_CALL_OPEN_RE = re.compile(f'(?:\\s+|{_SKIP_SOURCE})*\\(', re.DOTALL)
+_WORD_RE = re.compile(r'[\w$]+')
+# 可以直接出现在调用表达式前的关键字; 其余标识符在方法名前说明这是声明 (返回类型/修饰符/fun)
+_CALL_KEYWORDS = frozenset({'return', 'throw', 'else', 'case', 'yield', 'await', 'assert', 'do', 'in', 'is'})
+
+_PATTERN_TOKEN_RE = re.compile(r'[A-Za-z_$][\w$]*|\.')
+
+
+def _split_pattern(pattern: str) -> Tuple[str, ...]:
+    """把 'Activity.finish' 拆成 ('Activity', '.', 'finish')"""
+    tokens = tuple(_PATTERN_TOKEN_RE.findall(pattern))
+    if not tokens or ''.join(tokens) != pattern.replace(' ', ''):
+        raise ValueError(f"无效的匹配模式: {pattern!r}")
+    return tokens
+
+
+def _trie_regex(words) -> str:
+    """把一组字面量合并为按前缀共享的正则, 避免数千个分支逐个尝试"""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: dict) -> str:
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ''
+        body = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+def _is_declaration(content: str, start: int, paren: int) -> bool:
+    """start 处的方法名后跟 paren 处的 '(', 判断这是方法声明而不是调用"""
+    # 前一个标识符: 在倒序文本上做锚定匹配, 不必从左向右搜索
+    previous = _WORD_RE.match(content[max(0, start - 64):start].rstrip()[::-1])
+    if previous and previous.group()[::-1] not in _CALL_KEYWORDS:
+        return True
+
+    depth = 0
+    for m in _PARENS_RE.finditer(content, paren):
+        depth += 1 if m.group() == '(' else -1
+        if depth == 0:
+            return _DECLARATION_TAIL_RE.match(content, m.end()) is not None
+    return False
+
+# ============================================================================
+# Aho-Corasick 自动机
+# ============================================================================
+
+class AhoCorasick:
+    """以 token 为字母表的 Aho-Corasick 自动机"""
+
+    def __init__(self, patterns: Dict[Tuple[str, ...], object]):
+        # goto[state] = {token: next_state}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # output[state] = [(pattern_length, value), ...]
+        self._output: List[List[Tuple[int, object]]] = [[]]
+
+        for tokens, value in patterns.items():
+            self._add(tokens, value)
+        self._build()
+
+    def _add(self, tokens: Tuple[str, ...], value: object):
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append((len(tokens), value))
+
+    def _build(self):
+        """BFS 计算失败链接, 并把后缀模式的输出合并到当前状态"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(token, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    @property
+    def root_tokens(self) -> Dict[str, int]:
+        """能从根状态出发的 token 集合"""
+        return self._goto[0]
+
+    def step(self, state: int, token: str) -> int:
+        """沿 goto/fail 转移一步"""
+        goto = self._goto
+        while True:
+            nxt = goto[state].get(token)
+            if nxt is not None:
+                return nxt
+            if state == 0:
+                return 0
+            state = self._fail[state]
+
+    def outputs(self, state: int) -> List[Tuple[int, object]]:
+        return self._output[state]
+
+    def children(self, state: int) -> Dict[str, int]:
+        return self._goto[state]
+
+# ============================================================================
+# 重写器
+# ============================================================================
+
+class CallSiteRewriter:
+    """一次扫描完成全部映射 API 的查找与重写"""
+
+    def __init__(self, patterns: List[RewritePattern]):
+        # 恒等映射 (onCreate -> onCreate) 无需重写, 也不报告
+        self.patterns = [p for p in patterns if p.pattern != p.replacement]
+        table = {}
+        for p in self.patterns:
+            table[_split_pattern(p.pattern)] = p
+        self._automaton = AhoCorasick(table)
+        self._max_length = max((len(tokens) for tokens in table), default=1)
+        roots = [token for token in self._automaton.root_tokens if token != '.']
+        candidate = f'(?:{_trie_regex(roots)})(?![\\w$])' if roots else '(?!)'
+        if '.' in self._automaton.root_tokens:
+            candidate += r'|\.'
+        # 一次 match 越过不可能开始模式的全部文本 (非候选标识符/注释/字符串/其他字符),
+        # 停在候选 token 上; 没有候选时停在末尾或孤立的引号前
+        self._candidate_re = re.compile(
+            f'(?:[^A-Za-z_$/"\'`.]+|/(?![/*])|{_SKIP_SOURCE}|(?!{candidate})(?:[A-Za-z_$][\\w$]*|\\.))*'
+            f'(?P<candidate>{candidate})?',
+            re.DOTALL
+        )
+        # 不是任何更长模式前缀的单 token 模式 (绝大多数), 匹配时无需逐 token 推进自动机
+        self._single_token = {
+            token: [p for _, p in self._automaton.outputs(state)]
+            for token, state in self._automaton.root_tokens.items()
+            if not self._automaton.children(state)
+        }
+
+    @classmethod
+    def from_api_mapping(cls, api_mapping: Optional[Dict[str, dict]] = None,
+                         class_mapping: Optional[Dict[str, str]] = None) -> 'CallSiteRewriter':
+        """由 API_MAPPING (方法) 和类名映射构建重写器"""
+        api_mapping = API_MAPPING if api_mapping is None else api_mapping
+        patterns = [
+            RewritePattern(name, info['target'], 'method')
+            for name, info in api_mapping.items()
+        ]
+        for android_class, harmony_class in (class_mapping or {}).items():
+            patterns.append(RewritePattern(android_class, harmony_class, 'class'))
+        return cls(patterns)
+
+    def scan(self, content: str, path: str = '<string>') -> List[CallSite]:
+        """扫描源码, 返回调用点列表 (按出现顺序)"""
+        sites: list = []
+        match = self._candidate_re.match
+        single_token = self._single_token
+        pos, size = 0, len(content)
+        while pos < size:
+            m = match(content, pos)
+            token = m.group('candidate')
+            if token is None:
+                pos = m.end() + 1   # 孤立的引号等, 跳过一个字符
+                continue
+            start, pos = m.span('candidate')
+            patterns = single_token.get(token)
+            if patterns is None:
+                pos = self._scan_from(content, start, sites)
+                continue
+            for pattern in patterns:
+                if pattern.kind == 'class':
+                    sites.append((start, pos, pattern, 'reference'))
+                    continue
+                # 方法模式只有后跟 '(' 且不是声明才算调用点
+                paren = _CALL_OPEN_RE.match(content, pos)
+                if paren and not _is_declaration(content, start, paren.end() - 1):
+                    sites.append((start, pos, pattern, 'call'))
+        sites.sort(key=lambda s: s[0])
+        return self._to_call_sites(content, path, sites)
+
+    def _scan_from(self, content: str, pos: int, sites: list) -> int:
+        """从候选 token 起推进自动机, 回到根状态后返回继续搜索的位置"""
+        automaton = self._automaton
+        # 当前匹配链上最近 token 的起始偏移, 用于从匹配长度回推起始位置
+        window: deque = deque(maxlen=self._max_length)
+        pending: List[Tuple[RewritePattern, int, int]] = []
+        state = 0
+
+        for m in _TOKEN_RE.finditer(content, pos):
+            kind = m.lastindex
+            if kind == _SKIP:
+                continue
+
+            # 方法模式只有后跟 '(' 且不是声明才算调用点
+            if pending:
+                if kind == _PAREN:
+                    sites.extend((start, end, pattern, 'call') for pattern, start, end in pending
+                                 if not _is_declaration(content, start, m.start()))
+                pending = []
+
+            if kind >= _PAREN:
+                return m.end()
+
+            window.append(m.start())
+            state = automaton.step(state, m.group())
+            for length, pattern in automaton.outputs(state):
+                start = window[-length]
+                if pattern.kind == 'class':
+                    sites.append((start, m.end(), pattern, 'reference'))
+                else:
+                    pending.append((pattern, start, m.end()))
+            if state == 0 and not pending:
+                return m.end()
+        return len(content)
+
+    def rewrite(self, content: str) -> Tuple[str, List[CallSite]]:
+        """重写源码, 返回 (新内容, 调用点)"""
+        sites = self._non_overlapping(self.scan(content))
+        parts = []
+        last = 0
+        for site in sites:
+            parts.append(content[last:site.start])
+            parts.append(site.replacement)
+            last = site.end
+        parts.append(content[last:])
+        return ''.join(parts), sites
+
+    def scan_tree(self, root: str) -> Iterator[CallSite]:
+        """遍历目录下所有源文件, 每个文件读取并扫描一次"""
+        for path in iter_source_files(root):
+            content = path.read_text(encoding='utf-8', errors='replace')
+            yield from self.scan(content, str(path))
+
+    @staticmethod
+    def _to_call_sites(content: str, path: str, raw: list) -> List[CallSite]:
+        """按偏移顺序增量计算行列号, 避免每个调用点都从头数换行"""
+        result = []
+        line, line_start, pos = 1, 0, 0
+        for start, end, pattern, kind in raw:
+            newlines = content.count('\n', pos, start)
+            if newlines:
+                line += newlines
+                line_start = content.rfind('\n', pos, start) + 1
+            pos = start
+            result.append(CallSite(path, line, start - line_start + 1,
+                                   pattern.pattern, pattern.replacement, kind, start, end))
+        return result
+
+    @staticmethod
+    def _non_overlapping(sites: List[CallSite]) -> List[CallSite]:
+        """重叠时保留更长的匹配 (限定名优先于简单名)"""
+        result: List[CallSite] = []
+        for site in sorted(sites, key=lambda s: (s.start, -(s.end - s.start))):
+            if result and site.start < result[-1].end:
+                continue
+            result.append(site)
+        return result
+
+def iter_source_files(root: str, suffixes: Tuple[str, ...] = ('.java', '.kt')) -> Iterator[Path]:
+    """按路径顺序列出源文件"""
+    for path in sorted(Path(root).rglob('*')):
+        if path.suffix in suffixes and path.is_file():
+            yield path
+
+# ============================================================================
+# 主函数
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description='CRAFT Android 调用点重写器')
+    arg_parser.add_argument('src_root', help='Android 源码根目录')
+    arg_parser.add_argument('--json', action='store_true', help='输出 JSON 报告')
+    arg_parser.add_argument('--apply', action='store_true', help='原地重写源文件')
+    args = arg_parser.parse_args(argv)
+
+    rewriter = CallSiteRewriter.from_api_mapping()
+
+    if args.apply:
+        total = 0
+        for path in iter_source_files(args.src_root):
+            content = path.read_text(encoding='utf-8')
+            new_content, sites = rewriter.rewrite(content)
+            if sites:
+                path.write_text(new_content, encoding='utf-8')
+                total += len(sites)
+                print(f"  重写: {path} ({len(sites)} 处)")
+        print(f"  共重写 {total} 处调用")
+        return 0
+
+    sites = list(rewriter.scan_tree(args.src_root))
+    if args.json:
+        print(json.dumps([asdict(s) for s in sites], ensure_ascii=False, indent=2))
+    else:
+        for s in sites:
+            print(f"  {s.path}:{s.line}:{s.column}  {s.pattern} -> {s.replacement} [{s.kind}]")
+        print(f"  共 {len(sites)} 处调用点")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+CRAFT Change-Impact Graph
+
+Records, for every generated adapter file, what AdapterGenerator consumed
+to produce it (lifecycle mappings and type translations it looked up, the
+ApiSpec and the target class), together with a fingerprint of each. After a
+rule edit only the files whose recorded fingerprints no longer match are
+regenerated.
+
+Lookups are recorded by handing the generator tracking views of its tables,
+so misses are recorded too: adding an 'onResume' lifecycle rule invalidates
+exactly the adapters that looked it up and found nothing.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, is_dataclass
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from class_hierarchy import fqn
+from sdk_model import LIFECYCLE_MAPPING, TS_TYPE_MAP, AdapterGenerator, ApiSpec
+
+_MISSING = object()
+_MISSING_FINGERPRINT = '-'
+# Dependency on a whole table (the consumer iterated it)
+_WHOLE_TABLE = '*'
+# ApiSpec fields the generator never reads (where the spec was parsed from)
+_UNFINGERPRINTED = frozenset({'origin'})
+
+
+def fingerprint(value) -> str:
+    if value is _MISSING:
+        return _MISSING_FINGERPRINT
+    if is_dataclass(value):
+        value = {k: v for k, v in asdict(value).items() if k not in _UNFINGERPRINTED}
+    data = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()[:16]
+
+
+def rule_tables() -> Dict[str, Mapping]:
+    """The lookup tables AdapterGenerator reads, by namespace."""
+    return {'lifecycle': LIFECYCLE_MAPPING, 'ts_type': TS_TYPE_MAP}
+
+
+def impact_sources(specs: Iterable[ApiSpec], tables: Optional[Mapping[str, Mapping]] = None,
+                   target_class: str = "UIAbility") -> Dict[str, Mapping]:
+    """Current value of every dependency namespace: rule tables, specs and target classes."""
+    specs = list(specs)
+    sources = dict(tables or rule_tables())
+    sources['spec'] = {fqn(spec): spec for spec in specs}
+    sources['target'] = {fqn(spec): target_class for spec in specs}
+    return sources
+
+# ============================================================================
+# Recording
+# ============================================================================
+
+class DependencyRecorder:
+    """Collects 'namespace:key' -> fingerprint for everything one output consumed."""
+
+    def __init__(self):
+        self.deps: Dict[str, str] = {}
+
+    def use(self, namespace: str, key: str, value=_MISSING):
+        self.deps[f'{namespace}:{key}'] = fingerprint(value)
+
+    def track(self, namespace: str, table: Mapping) -> 'TrackedMapping':
+        return TrackedMapping(self, namespace, table)
+
+
+class TrackedMapping(Mapping):
+    """Read-only view of a lookup table that records each key looked up."""
+
+    def __init__(self, recorder: DependencyRecorder, namespace: str, table: Mapping):
+        self._recorder = recorder
+        self._namespace = namespace
+        self._table = table
+
+    def __getitem__(self, key):
+        value = self._table.get(key, _MISSING)
+        self._recorder.use(self._namespace, key, value)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key) -> bool:
+        value = self._table.get(key, _MISSING)
+        self._recorder.use(self._namespace, key, value)
+        return value is not _MISSING
+
+    def __iter__(self) -> Iterator:
+        self._recorder.use(self._namespace, _WHOLE_TABLE, dict(self._table))
+        return iter(self._table)
+
+    def __len__(self) -> int:
+        self._recorder.use(self._namespace, _WHOLE_TABLE, dict(self._table))
+        return len(self._table)
+
+# ============================================================================
+# Graph
+# ============================================================================
+
+class ImpactGraph:
+    """Persistent output -> consumed dependencies map with a reverse index."""
+
+    FORMAT = 1
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.outputs: Dict[str, Dict[str, str]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get('format') == self.FORMAT:
+                for output, deps in data.get('outputs', {}).items():
+                    self.record(output, deps)
+
+    def record(self, output: str, deps: Dict[str, str]):
+        """Replace the dependencies recorded for ``output``."""
+        self.forget(output)
+        self.outputs[output] = dict(deps)
+        for dep in deps:
+            self._dependents.setdefault(dep, set()).add(output)
+
+    def forget(self, output: str):
+        for dep in self.outputs.pop(output, {}):
+            dependents = self._dependents.get(dep)
+            if dependents is not None:
+                dependents.discard(output)
+                if not dependents:
+                    del self._dependents[dep]
+
+    def dependents(self, dep: str) -> Set[str]:
+        return set(self._dependents.get(dep, ()))
+
+    def changed(self, sources: Mapping[str, Mapping]) -> Set[str]:
+        """Recorded dependencies whose current fingerprint differs (each checked once)."""
+        changed = set()
+        for dep, outputs in self._dependents.items():
+            namespace, key = dep.split(':', 1)
+            table = sources.get(namespace, {})
+            current = fingerprint(dict(table) if key == _WHOLE_TABLE else table.get(key, _MISSING))
+            recorded = self.outputs[next(iter(outputs))][dep]
+            if current != recorded:
+                changed.add(dep)
+        return changed
+
+    def affected(self, sources: Mapping[str, Mapping]) -> Set[str]:
+        """Outputs that consumed at least one changed dependency."""
+        outputs = set()
+        for dep in self.changed(sources):
+            outputs |= self._dependents[dep]
+        return outputs
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        if not path:
+            return
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'format': self.FORMAT, 'outputs': self.outputs}, f, sort_keys=True)
+        os.replace(tmp, path)
+
+# ============================================================================
+# Targeted regeneration
+# ============================================================================
+
+def adapter_outputs(spec: ApiSpec) -> Dict[str, str]:
+    """Relative output path -> language for one class."""
+    base = os.path.join(*spec.package.split('.'), f'{spec.class_name}Adapter')
+    return {f'{base}.java': 'java', f'{base}.ets': 'arkts'}
+
+
+def generate_tracked(spec: ApiSpec, language: str, target_class: str,
+                     sources: Mapping[str, Mapping]) -> Tuple[str, Dict[str, str]]:
+    """Generate one adapter and return (code, consumed dependencies)."""
+    recorder = DependencyRecorder()
+    recorder.use('spec', fqn(spec), spec)
+    recorder.use('target', fqn(spec), target_class)
+    generator = AdapterGenerator(recorder.track('lifecycle', sources['lifecycle']),
+                                 recorder.track('ts_type', sources['ts_type']))
+    if language == 'java':
+        code = generator.generate_java(spec, target_class)
+    else:
+        code = generator.generate_arkts(spec, target_class)
+    return code, recorder.deps
+
+
+def regenerate(specs: Iterable[ApiSpec], out_dir: str, graph: ImpactGraph,
+               sources: Optional[Mapping[str, Mapping]] = None,
+               target_class: str = "UIAbility") -> List[str]:
+    """
+    Regenerate only adapters that are new, missing on disk, or affected by a
+    changed rule, ApiSpec or target class. Returns the relative paths written.
+    """
+    specs = list(specs)
+    sources = impact_sources(specs, sources, target_class)
+    stale = graph.affected(sources)
+
+    written = []
+    expected = set()
+    for spec in specs:
+        for rel_path, language in adapter_outputs(spec).items():
+            expected.add(rel_path)
+            path = os.path.join(out_dir, rel_path)
+            if rel_path in graph.outputs and rel_path not in stale and os.path.exists(path):
+                continue
+            code, deps = generate_tracked(spec, language, target_class, sources)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(code)
+            graph.record(rel_path, deps)
+            written.append(rel_path)
+
+    for rel_path in set(graph.outputs) - expected:
+        graph.forget(rel_path)  # class removed from the corpus
+    graph.save()
+    return written
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+CRAFT Class Hierarchy Index
+
+Resolves the bare parent_class / interfaces names of a parsed ApiSpec corpus
+to fully qualified names and computes each class's effective method set
+(own methods plus everything inherited, overrides applied).
+
+Effective sets are memoized per class and built from the parent's set, so
+each class is flattened once and a class that declares nothing new shares
+its parent's mapping outright. Replacing or removing a class invalidates
+only that class and its descendants.
+"""
+
+import copy
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from sdk_model import ApiSpec, MethodSpec
+
+# Override key: method name + parameter types
+MethodKey = Tuple[str, Tuple[str, ...]]
+
+_EMPTY: Mapping[MethodKey, 'InheritedMethod'] = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class InheritedMethod:
+    owner: str  # FQN of the declaring class
+    method: MethodSpec
+
+
+def fqn(spec: ApiSpec) -> str:
+    return f"{spec.package}.{spec.class_name}"
+
+
+def method_key(method: MethodSpec) -> MethodKey:
+    return method.name, tuple(p.param_type for p in method.parameters)
+
+
+def _base_name(name: str) -> str:
+    """Strip generic arguments: 'ArrayList<T>' -> 'ArrayList'."""
+    return name.split('<', 1)[0].strip()
+
+
+class HierarchyIndex:
+    """Class hierarchy over an ApiSpec corpus with memoized inherited members."""
+
+    def __init__(self, specs: Iterable[ApiSpec] = ()):
+        self._specs: Dict[str, ApiSpec] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        # Simple name -> classes that reference it as a supertype
+        self._referrers: Dict[str, Set[str]] = {}
+        # Resolved supertype FQN -> direct subtypes
+        self._dependents: Dict[str, Set[str]] = {}
+        self._supers: Dict[str, Tuple[str, ...]] = {}
+        self._effective: Dict[str, Mapping[MethodKey, InheritedMethod]] = {}
+        self.computed = 0  # number of effective sets built (for diagnostics)
+        for spec in specs:
+            self.add(spec)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def get(self, name: str) -> Optional[ApiSpec]:
+        return self._specs.get(name)
+
+    # ------------------------------------------------------------------------
+    # Corpus changes
+    # ------------------------------------------------------------------------
+
+    def add(self, spec: ApiSpec):
+        """Add or replace a class; dependent memoized sets are invalidated."""
+        name = fqn(spec)
+        if name in self._specs:
+            self.remove(name)
+        self._specs[name] = spec
+        self._by_name.setdefault(spec.class_name, set()).add(name)
+        for ref in self._references(spec):
+            self._referrers.setdefault(ref, set()).add(name)
+        # A new class can change how other classes' bare names resolve.
+        for referrer in list(self._referrers.get(spec.class_name, ())):
+            self.invalidate(referrer)
+
+    update = add
+
+    def remove(self, name: str):
+        spec = self._specs.get(name)
+        if spec is None:
+            return
+        self.invalidate(name)
+        del self._specs[name]
+        self._by_name[spec.class_name].discard(name)
+        for ref in self._references(spec):
+            self._referrers.get(ref, set()).discard(name)
+        for referrer in list(self._referrers.get(spec.class_name, ())):
+            self.invalidate(referrer)
+
+    def invalidate(self, name: str):
+        """Drop memoized data for ``name`` and every class below it."""
+        stack = [name]
+        seen = set()
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            self._effective.pop(current, None)
+            for parent in self._supers.pop(current, ()):
+                self._dependents.get(parent, set()).discard(current)
+            stack.extend(self._dependents.pop(current, ()))
+
+    @staticmethod
+    def _references(spec: ApiSpec) -> List[str]:
+        names = [spec.parent_class] if spec.parent_class else []
+        return [_base_name(n) for n in names + list(spec.interfaces)]
+
+    # ------------------------------------------------------------------------
+    # Resolution
+    # ------------------------------------------------------------------------
+
+    def resolve(self, name: str, package: Optional[str] = None) -> Optional[str]:
+        """
+        Bare or qualified type name -> FQN in the corpus. Looks in the
+        referencing class's package, then for a unique class of that name,
+        then in java.lang.
+        """
+        name = _base_name(name)
+        if name in self._specs:
+            return name
+        if package and f"{package}.{name}" in self._specs:
+            return f"{package}.{name}"
+        candidates = self._by_name.get(name)
+        if candidates and len(candidates) == 1:
+            return next(iter(candidates))
+        if f"java.lang.{name}" in self._specs:
+            return f"java.lang.{name}"
+        return None
+
+    def supertypes(self, name: str) -> Tuple[str, ...]:
+        """Resolved direct supertypes: superclass first, then interfaces."""
+        cached = self._supers.get(name)
+        if cached is not None:
+            return cached
+        spec = self._specs[name]
+        resolved = []
+        for ref in self._references(spec):
+            target = self.resolve(ref, spec.package)
+            if target is not None and target != name and target not in resolved:
+                resolved.append(target)
+                self._dependents.setdefault(target, set()).add(name)
+        supers = tuple(resolved)
+        self._supers[name] = supers
+        return supers
+
+    def superclass(self, name: str) -> Optional[str]:
+        spec = self._specs[name]
+        return self.resolve(spec.parent_class, spec.package) if spec.parent_class else None
+
+    def ancestors(self, name: str) -> List[str]:
+        """All resolved supertypes, nearest first, each listed once."""
+        result: List[str] = []
+        queue = list(self.supertypes(name))
+        while queue:
+            current = queue.pop(0)
+            if current in result or current == name:
+                continue
+            result.append(current)
+            queue.extend(self.supertypes(current))
+        return result
+
+    def unresolved(self, name: str) -> List[str]:
+        """Supertype names of ``name`` that are not in the corpus."""
+        spec = self._specs[name]
+        return [ref for ref in self._references(spec) if self.resolve(ref, spec.package) is None]
+
+    # ------------------------------------------------------------------------
+    # Effective members
+    # ------------------------------------------------------------------------
+
+    def effective_methods(self, name: str) -> Mapping[MethodKey, InheritedMethod]:
+        """
+        Read-only mapping of every method visible on ``name``. Interface
+        methods come first, then the superclass chain, then the class's own
+        declarations, so overrides replace inherited entries.
+        """
+        cached = self._effective.get(name)
+        if cached is not None:
+            return cached
+        self._effective[name] = _EMPTY  # cycle guard
+        spec = self._specs[name]
+        supers = self.supertypes(name)
+        parent = self.superclass(name)
+        inherited = [self.effective_methods(s) for s in supers if s != parent]
+        if parent in supers:
+            inherited.append(self.effective_methods(parent))
+
+        if not spec.methods and len(inherited) == 1:
+            result = inherited[0]  # nothing new: share the parent's set
+        elif not inherited and not spec.methods:
+            result = _EMPTY
+        else:
+            merged: Dict[MethodKey, InheritedMethod] = {}
+            for base in inherited:
+                merged.update(base)
+            for method in spec.methods:
+                merged[method_key(method)] = InheritedMethod(name, method)
+            result = MappingProxyType(merged)
+
+        self.computed += 1
+        self._effective[name] = result
+        return result
+
+    def inherited_methods(self, name: str) -> List[InheritedMethod]:
+        """Visible methods declared by supertypes (not overridden here)."""
+        return [m for m in self.effective_methods(name).values() if m.owner != name]
+
+    def flattened(self, name: str) -> ApiSpec:
+        """Copy of the class's ApiSpec whose methods are its effective method set."""
+        spec = copy.copy(self._specs[name])
+        spec.methods = [m.method for m in self.effective_methods(name).values()]
+        return spec
+
+    def subclasses(self, name: str) -> List[str]:
+        """Classes whose resolved ancestors include ``name``."""
+        return sorted(other for other in self._specs if name in self.ancestors(other))
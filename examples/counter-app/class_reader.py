@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+CRAFT Class File Reader
+
+Reads compiled .class files (e.g. entries of android.jar) and produces the
+same ApiSpec/MethodSpec records as the Java source parser: simple type
+names, generic signatures, modifiers, parameter names when the class file
+carries them, and the source parser's semantic tags. Only the constant pool
+entries and attributes needed for signatures are decoded.
+"""
+
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from sdk_model import ApiSpec, MethodSpec, ParameterSpec, class_semantic_tags, method_semantic_tags
+
+MAGIC = 0xCAFEBABE
+
+ACC_PUBLIC = 0x0001
+ACC_PRIVATE = 0x0002
+ACC_PROTECTED = 0x0004
+ACC_STATIC = 0x0008
+ACC_FINAL = 0x0010
+ACC_BRIDGE = 0x0040
+ACC_VARARGS = 0x0080
+ACC_INTERFACE = 0x0200
+ACC_ABSTRACT = 0x0400
+ACC_SYNTHETIC = 0x1000
+ACC_ANNOTATION = 0x2000
+ACC_ENUM = 0x4000
+ACC_MODULE = 0x8000
+
+# Modifiers in the order the source parser sees them in conventional Java.
+_MODIFIERS = (
+    (ACC_PUBLIC, 'public'), (ACC_PROTECTED, 'protected'), (ACC_PRIVATE, 'private'),
+    (ACC_ABSTRACT, 'abstract'), (ACC_STATIC, 'static'), (ACC_FINAL, 'final'),
+)
+
+_BASE_TYPES = {
+    'B': 'byte', 'C': 'char', 'D': 'double', 'F': 'float', 'I': 'int',
+    'J': 'long', 'S': 'short', 'Z': 'boolean', 'V': 'void',
+}
+
+# Constant pool tag -> payload size for entries the reader skips.
+_CP_SIZES = {3: 4, 4: 4, 5: 8, 6: 8, 8: 2, 9: 4, 10: 4, 11: 4, 12: 4,
+             15: 3, 16: 2, 17: 4, 18: 4, 19: 2, 20: 2}
+_CP_UTF8, _CP_CLASS = 1, 7
+
+_U2 = struct.Struct('>H')
+_U4 = struct.Struct('>I')
+
+
+def _decode_mutf8(data: bytes) -> str:
+    """Decode the JVM's modified UTF-8 (encoded NUL, surrogate pairs)."""
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        text = data.replace(b'\xc0\x80', b'\x00').decode('utf-8', errors='surrogatepass')
+        return text.encode('utf-16', errors='surrogatepass').decode('utf-16', errors='replace')
+
+
+def simple_name(internal: str) -> str:
+    """android/view/Window$Callback -> Window.Callback"""
+    return internal.rsplit('/', 1)[-1].replace('$', '.')
+
+# ============================================================================
+# Descriptor / signature parsing
+# ============================================================================
+
+def _parse_type(sig: str, i: int) -> Tuple[str, int]:
+    """Parse one field type or generic type signature starting at ``i``."""
+    c = sig[i]
+    if c in _BASE_TYPES:
+        return _BASE_TYPES[c], i + 1
+    if c == '[':
+        inner, i = _parse_type(sig, i + 1)
+        return inner + '[]', i
+    if c == 'T':
+        end = sig.index(';', i)
+        return sig[i + 1:end], end + 1
+    if c != 'L':
+        raise ValueError(f"bad type signature {sig!r} at {i}")
+
+    # L pkg/Outer<args>.Inner<args>;
+    i += 1
+    parts: List[str] = []
+    name_start = i
+    while True:
+        c = sig[i]
+        if c in '<;.':
+            name = sig[name_start:i]
+            parts.append(simple_name(name) if not parts else name.replace('$', '.'))
+            if c == '<':
+                args, i = _parse_type_args(sig, i + 1)
+                parts[-1] += '<' + ', '.join(args) + '>'
+                c = sig[i]
+            if c == ';':
+                return '.'.join(parts), i + 1
+            i += 1  # '.' before an inner class
+            name_start = i
+        else:
+            i += 1
+
+
+def _parse_type_args(sig: str, i: int) -> Tuple[List[str], int]:
+    args = []
+    while sig[i] != '>':
+        c = sig[i]
+        if c == '*':
+            args.append('?')
+            i += 1
+            continue
+        prefix = ''
+        if c == '+':
+            prefix, i = '? extends ', i + 1
+        elif c == '-':
+            prefix, i = '? super ', i + 1
+        arg, i = _parse_type(sig, i)
+        args.append(prefix + arg)
+    return args, i + 1
+
+
+def _skip_type_params(sig: str, i: int) -> int:
+    """Skip <T:Ljava/lang/Object;U::Ljava/lang/Runnable;> before '('."""
+    if sig[i] != '<':
+        return i
+    i += 1
+    while sig[i] != '>':
+        i = sig.index(':', i)
+        while sig[i] == ':':
+            i += 1
+            if sig[i] != ':' and sig[i] != '>':
+                _, i = _parse_type(sig, i)
+    return i + 1
+
+
+def parse_method_signature(sig: str) -> Tuple[List[str], str]:
+    """Method descriptor or generic signature -> ([parameter types], return type)."""
+    i = _skip_type_params(sig, 0)
+    if sig[i] != '(':
+        raise ValueError(f"bad method signature {sig!r}")
+    i += 1
+    params = []
+    while sig[i] != ')':
+        param, i = _parse_type(sig, i)
+        params.append(param)
+    return_type, _ = _parse_type(sig, i + 1)
+    return params, return_type
+
+# ============================================================================
+# Class file parser
+# ============================================================================
+
+class ClassFileParser:
+    """Parses .class bytes into ApiSpec (public/protected members only)."""
+
+    def parse_bytes(self, data: bytes, origin: Optional[str] = None) -> Optional[ApiSpec]:
+        """
+        Read a class file. Returns None for non-public, synthetic or
+        module/package-info classes; raises ValueError for malformed ones.
+        """
+        try:
+            return self._read(memoryview(data), origin)
+        except (struct.error, IndexError) as e:
+            raise ValueError(f"truncated class file {origin or ''}: {e}") from None
+        except KeyError as e:   # unknown constant-pool tag or dangling pool index
+            raise ValueError(f"malformed class file {origin or ''}: bad constant pool entry {e}") from None
+
+    def parse_file(self, path: str) -> Optional[ApiSpec]:
+        with open(path, 'rb') as f:
+            return self.parse_bytes(f.read(), origin=str(path))
+
+    def _read(self, data: memoryview, origin: Optional[str]) -> Optional[ApiSpec]:
+        if len(data) < 10 or _U4.unpack_from(data, 0)[0] != MAGIC:
+            raise ValueError(f"not a class file: {origin or '<bytes>'}")
+
+        # Constant pool: keep Utf8 strings and Class name indexes only.
+        count = _U2.unpack_from(data, 8)[0]
+        utf8: Dict[int, str] = {}
+        classes: Dict[int, int] = {}
+        pos, index = 10, 1
+        while index < count:
+            tag = data[pos]
+            if tag == _CP_UTF8:
+                length = _U2.unpack_from(data, pos + 1)[0]
+                utf8[index] = _decode_mutf8(bytes(data[pos + 3:pos + 3 + length]))
+                pos += 3 + length
+            elif tag == _CP_CLASS:
+                classes[index] = _U2.unpack_from(data, pos + 1)[0]
+                pos += 3
+            else:
+                pos += 1 + _CP_SIZES[tag]
+                if tag in (5, 6):
+                    index += 1  # long/double take two slots
+            index += 1
+
+        access, this_index, super_index, iface_count = struct.unpack_from('>HHHH', data, pos)
+        pos += 8
+        interfaces = [utf8[classes[i]] for i in struct.unpack_from(f'>{iface_count}H', data, pos)]
+        pos += 2 * iface_count
+
+        this_name = utf8[classes[this_index]]
+        if (not access & ACC_PUBLIC or access & (ACC_SYNTHETIC | ACC_MODULE)
+                or this_name.endswith(('/package-info', 'module-info'))):
+            return None
+
+        # Fields are not part of ApiSpec; skip them.
+        field_count = _U2.unpack_from(data, pos)[0]
+        pos += 2
+        for _ in range(field_count):
+            pos = self._skip_attributes(data, pos + 6)
+
+        methods = []
+        method_count = _U2.unpack_from(data, pos)[0]
+        pos += 2
+        for _ in range(method_count):
+            m_access, name_index, desc_index = struct.unpack_from('>HHH', data, pos)
+            attrs, pos = self._method_attributes(data, pos + 6, utf8)
+            name = utf8[name_index]
+            if (name.startswith('<') or not m_access & (ACC_PUBLIC | ACC_PROTECTED)
+                    or m_access & (ACC_SYNTHETIC | ACC_BRIDGE)):
+                continue
+            methods.append(self._method(name, m_access, utf8[desc_index], attrs))
+
+        if access & ACC_ANNOTATION:
+            class_type = 'annotation'
+        elif access & ACC_INTERFACE:
+            class_type = 'interface'
+        elif access & ACC_ENUM:
+            class_type = 'enum'
+        elif access & ACC_ABSTRACT:
+            class_type = 'abstract_class'
+        else:
+            class_type = 'class'
+
+        package, _, _ = this_name.rpartition('/')
+        class_name = simple_name(this_name)
+        super_name = utf8[classes[super_index]] if super_index else None
+        return ApiSpec(
+            platform="Android",
+            package=package.replace('/', '.') or "unknown",
+            class_name=class_name,
+            class_type=class_type,
+            parent_class=simple_name(super_name) if super_name and super_name != 'java/lang/Object' else None,
+            interfaces=[simple_name(i) for i in interfaces],
+            methods=methods,
+            semantic_tags=class_semantic_tags(class_name, class_type),
+            origin=origin,
+        )
+
+    @staticmethod
+    def _skip_attributes(data: memoryview, pos: int) -> int:
+        count = _U2.unpack_from(data, pos)[0]
+        pos += 2
+        for _ in range(count):
+            pos += 6 + _U4.unpack_from(data, pos + 2)[0]
+        return pos
+
+    @staticmethod
+    def _method_attributes(data: memoryview, pos: int, utf8: Dict[int, str]) -> Tuple[Dict[str, object], int]:
+        """Collect Signature, MethodParameters and Code/LocalVariableTable names."""
+        attrs: Dict[str, object] = {}
+        count = _U2.unpack_from(data, pos)[0]
+        pos += 2
+        for _ in range(count):
+            name_index, length = struct.unpack_from('>HI', data, pos)
+            body = pos + 6
+            attr = utf8.get(name_index)
+            if attr == 'Signature':
+                attrs['Signature'] = utf8[_U2.unpack_from(data, body)[0]]
+            elif attr == 'MethodParameters':
+                n = data[body]
+                attrs['MethodParameters'] = [
+                    utf8.get(_U2.unpack_from(data, body + 1 + 4 * k)[0]) for k in range(n)
+                ]
+            elif attr == 'Code':
+                locals_ = ClassFileParser._local_variables(data, body, utf8)
+                if locals_:
+                    attrs['LocalVariableTable'] = locals_
+            pos = body + length
+        return attrs, pos
+
+    @staticmethod
+    def _local_variables(data: memoryview, pos: int, utf8: Dict[int, str]) -> Dict[int, str]:
+        """Slot -> name for variables live at offset 0 (i.e. the parameters)."""
+        code_length = _U4.unpack_from(data, pos + 4)[0]
+        pos += 8 + code_length
+        exceptions = _U2.unpack_from(data, pos)[0]
+        pos += 2 + 8 * exceptions
+        count = _U2.unpack_from(data, pos)[0]
+        pos += 2
+        slots: Dict[int, str] = {}
+        for _ in range(count):
+            name_index, length = struct.unpack_from('>HI', data, pos)
+            body = pos + 6
+            if utf8.get(name_index) == 'LocalVariableTable':
+                n = _U2.unpack_from(data, body)[0]
+                for k in range(n):
+                    start, _, var_name, _, slot = struct.unpack_from('>HHHHH', data, body + 2 + 10 * k)
+                    if start == 0:
+                        slots[slot] = utf8[var_name]
+            pos = body + length
+        return slots
+
+    def _method(self, name: str, access: int, descriptor: str, attrs: Dict[str, object]) -> MethodSpec:
+        param_types, return_type = parse_method_signature(descriptor)
+        signature = attrs.get('Signature')
+        if signature:
+            generic_params, generic_return = parse_method_signature(signature)
+            # Signatures can omit synthetic parameters; only trust matching arity.
+            if len(generic_params) == len(param_types):
+                param_types, return_type = generic_params, generic_return
+        if access & ACC_VARARGS and param_types and param_types[-1].endswith('[]'):
+            param_types[-1] = param_types[-1][:-2] + '...'
+
+        names = attrs.get('MethodParameters') or []
+        if not names and 'LocalVariableTable' in attrs:
+            table = attrs['LocalVariableTable']
+            slot = 0 if access & ACC_STATIC else 1
+            for raw in parse_method_signature(descriptor)[0]:
+                names.append(table.get(slot))
+                slot += 2 if raw in ('long', 'double') else 1
+
+        parameters = [
+            ParameterSpec(names[k] if k < len(names) and names[k] else f'arg{k}', param_type)
+            for k, param_type in enumerate(param_types)
+        ]
+        return MethodSpec(
+            name=name,
+            return_type=return_type,
+            parameters=parameters,
+            modifiers=[word for flag, word in _MODIFIERS if access & flag],
+            semantic_tags=method_semantic_tags(name, return_type),
+            doc_comment=None,
+        )
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+CRAFT Context Retrieval
+
+Picks the target-side methods worth showing the model for each Android
+method, instead of every method of the mapped target class. The needed
+target often lives in another class (``finish`` -> ``UIAbilityContext.
+terminateSelf``), so every method in the TargetIndex is indexed by
+weighted features:
+
+- name tokens (camelCase split), plus the owning class's name tokens
+- semantic tags from ets_scanner.method_tags (category, arity, lifecycle)
+- parameter / return type tokens
+
+A query is built the same way from the Android method, with name tokens
+expanded through a small synonym table, types converted through
+mapping_rules.yaml, and an exact-name feature for the HarmonyOS method the
+rules map it to. Candidates are ranked by shared features weighted by
+inverse document frequency; results are cached per method signature.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ets_scanner import TargetIndex, method_tags
+from generation_scheduler import load_type_conversions
+from sdk_model import LIFECYCLE_MAPPING, TS_TYPE_MAP, ApiSpec, MethodSpec
+
+DEFAULT_TOP_K = 3
+
+# Feature weights
+NAME_WEIGHT = 3.0
+SYNONYM_WEIGHT = 2.0
+CLASS_WEIGHT = 1.0
+TYPE_WEIGHT = 1.0
+TAG_WEIGHT = 0.5
+RULE_WEIGHT = 10.0   # exact name the mapping rules point to
+
+# Android vocabulary -> HarmonyOS vocabulary
+SYNONYMS = {
+    'finish': ('terminate', 'exit'),
+    'activity': ('ability',),
+    'intent': ('want',),
+    'bundle': ('param', 'want'),
+    'extra': ('param',),
+    'put': ('set',),
+    'start': ('foreground', 'launch'),
+    'resume': ('foreground',),
+    'pause': ('background',),
+    'stop': ('background', 'terminate'),
+    'show': ('display', 'open'),
+    'dismiss': ('close', 'hide'),
+    'view': ('component', 'content'),
+    'preferences': ('preferences', 'storage'),
+    'instance': ('storage',),
+}
+
+_WORDS = re.compile(r'[A-Z]+(?=[A-Z][a-z]|\d|\b|_)|[A-Z]?[a-z]+|[A-Z]+|\d+')
+_TYPE_WORDS = re.compile(r'[A-Za-z_]\w*')
+
+
+def name_tokens(name: str) -> List[str]:
+    """``terminateSelf`` -> ['terminate', 'self']; ``getURL`` -> ['get', 'url']."""
+    return [word.lower() for word in _WORDS.findall(name)]
+
+
+def method_signature(method: MethodSpec) -> str:
+    """``onCreate(Bundle)``: tells overloads apart where the name alone does not."""
+    return f"{method.name}({', '.join(p.param_type for p in method.parameters)})"
+
+
+def _type_tokens(type_text: str) -> List[str]:
+    return [token for word in _TYPE_WORDS.findall(type_text) for token in name_tokens(word.rsplit('.', 1)[-1])]
+
+
+def _add(features: Counter, names: Iterable[str], weight: float):
+    for name in names:
+        features[name] = max(features[name], weight)
+
+
+def target_features(spec: ApiSpec, method: MethodSpec) -> Counter:
+    features: Counter = Counter()
+    _add(features, (f'class:{t}' for t in name_tokens(spec.class_name)), CLASS_WEIGHT)
+    _add(features, (f'type:{t}' for p in method.parameters for t in _type_tokens(p.param_type)), TYPE_WEIGHT)
+    _add(features, (f'type:{t}' for t in _type_tokens(method.return_type)), TYPE_WEIGHT)
+    tags = method.semantic_tags or method_tags(method.name, method.return_type, method.parameters)
+    _add(features, (f'tag:{t}' for t in tags if not t.startswith('returns:')), TAG_WEIGHT)
+    _add(features, (f'name:{t}' for t in name_tokens(method.name)), NAME_WEIGHT)
+    features[f'exact:{method.name}'] = RULE_WEIGHT
+    return features
+
+
+@dataclass
+class Candidate:
+    spec: ApiSpec
+    method: MethodSpec
+    score: float
+
+    @property
+    def qualified_name(self) -> str:
+        return f'{self.spec.class_name}.{self.method.name}'
+
+
+class MethodRetriever:
+    """Inverted index over every target-side method, queried per Android method."""
+
+    def __init__(self, targets: TargetIndex, conversions: Optional[Dict[str, str]] = None,
+                 method_rules: Optional[Dict[str, str]] = None):
+        self.conversions = load_type_conversions() if conversions is None else conversions
+        # Android method name -> HarmonyOS method name, from the rules, then the lifecycle table
+        self.method_rules = {name: target[0] for name, target in LIFECYCLE_MAPPING.items()}
+        self.method_rules.update(method_rules or {})
+        self.documents: List[Tuple[ApiSpec, MethodSpec]] = []
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        for spec in targets.specs:
+            for method in spec.methods:
+                doc = len(self.documents)
+                self.documents.append((spec, method))
+                for feature, weight in target_features(spec, method).items():
+                    self.postings.setdefault(feature, []).append((doc, weight))
+        self._cache: Dict[tuple, List[Candidate]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def idf(self, feature: str) -> float:
+        return math.log(1 + len(self.documents) / len(self.postings[feature]))
+
+    def _convert(self, type_text: str) -> str:
+        base = type_text.split('<', 1)[0].strip()
+        return TS_TYPE_MAP.get(base) or self.conversions.get(base) or type_text
+
+    def query_features(self, method: MethodSpec) -> Counter:
+        features: Counter = Counter()
+        tokens = name_tokens(method.name)
+        _add(features, (f'class:{s}' for t in tokens for s in SYNONYMS.get(t, ())), CLASS_WEIGHT)
+        types = [self._convert(p.param_type) for p in method.parameters] + [self._convert(method.return_type)]
+        _add(features, (f'type:{t}' for text in types for t in _type_tokens(text)), TYPE_WEIGHT)
+        tags = method_tags(method.name, method.return_type, method.parameters)
+        _add(features, (f'tag:{t}' for t in tags if not t.startswith('returns:')), TAG_WEIGHT)
+        _add(features, (f'name:{s}' for t in tokens for s in SYNONYMS.get(t, ())), SYNONYM_WEIGHT)
+        _add(features, (f'name:{t}' for t in tokens), NAME_WEIGHT)
+        mapped = self.method_rules.get(method.name)
+        if mapped:
+            features[f'exact:{mapped.rsplit(".", 1)[-1]}'] = RULE_WEIGHT
+        return features
+
+    def top_k(self, method: MethodSpec, k: int = DEFAULT_TOP_K) -> List[Candidate]:
+        """Best ``k`` target methods for ``method``; results are cached per signature."""
+        key = (method.name, method.return_type, tuple(p.param_type for p in method.parameters), k)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        scores: Dict[int, float] = {}
+        named = set()   # name or rule evidence is required; shared tags and types alone are noise
+        for feature, weight in self.query_features(method).items():
+            postings = self.postings.get(feature, ())
+            idf = self.idf(feature) if postings else 0.0
+            for doc, doc_weight in postings:
+                scores[doc] = scores.get(doc, 0.0) + weight * doc_weight * idf
+                if feature.startswith(('name:', 'exact:')):
+                    named.add(doc)
+        ranked = sorted((doc for doc in scores if doc in named), key=lambda doc: (-scores[doc], doc))[:k]
+        result = [Candidate(*self.documents[doc], round(scores[doc], 4)) for doc in ranked]
+        self._cache[key] = result
+        return result
+
+    def retrieve(self, spec: ApiSpec, k: int = DEFAULT_TOP_K) -> Dict[str, List[Candidate]]:
+        """Android method signature (see method_signature) -> candidates, for every method of ``spec``."""
+        return {method_signature(method): self.top_k(method, k) for method in spec.methods}
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+CRAFT Daemon Client
+
+Thin client for craft_daemon.py. It speaks the daemon's small HTTP/1.1
+subset directly over a socket and imports only argparse, json and socket
+(no http.client, which drags in ssl and email), so the client adds a few
+tens of milliseconds to interpreter start-up; the SDK index, mapping rules
+and caches stay loaded in the daemon.
+
+Usage:
+    python3 craft_client.py [--socket PATH | --url URL] parse Foo.java
+    python3 craft_client.py map Foo.java
+    python3 craft_client.py generate Foo.java [-o OUT]
+    python3 craft_client.py status | stop
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+COMMANDS = ('parse', 'map', 'generate', 'status', 'shutdown')
+
+
+def default_socket() -> str:
+    """``$XDG_RUNTIME_DIR/craft-daemon.sock``, else one under a per-user directory in the temp dir.
+
+    The daemon creates the per-user directory with mode 0700 and refuses to
+    serve from it if someone else owns it.
+    """
+    base = os.environ.get('XDG_RUNTIME_DIR')
+    if not base:
+        base = os.path.join(os.environ.get('TMPDIR') or '/tmp', f'craft-{os.getuid()}')
+    return os.path.join(base, 'craft-daemon.sock')
+
+
+DEFAULT_SOCKET = default_socket()
+
+
+class DaemonError(Exception):
+    """The daemon rejected a request or could not be reached."""
+
+
+def _parse_url(url: str) -> Tuple[str, int]:
+    """``http://127.0.0.1:8765`` -> ('127.0.0.1', 8765)"""
+    netloc = url.split('://', 1)[-1].split('/', 1)[0]
+    host, _, port = netloc.rpartition(':')
+    if not host or not port.isdigit():
+        raise DaemonError(f"expected http://HOST:PORT, got {url!r}")
+    return host, int(port)
+
+
+class DaemonClient:
+    """One keep-alive connection to the daemon, over a Unix socket or TCP."""
+
+    def __init__(self, socket_path: Optional[str] = None, url: Optional[str] = None, timeout: float = 30.0):
+        if url:
+            host, port = _parse_url(url)
+            self._family, self._address, self._host = socket.AF_INET, (host, port), f'{host}:{port}'
+        else:
+            self._family, self._address, self._host = socket.AF_UNIX, socket_path or DEFAULT_SOCKET, 'localhost'
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+
+    def _open(self):
+        sock = socket.socket(self._family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self._address)
+        except OSError:
+            sock.close()
+            raise
+        self._sock, self._file = sock, sock.makefile('rb')
+
+    def _response(self) -> Tuple[int, Dict[str, str], bytes]:
+        status_line = self._file.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by daemon")
+        try:
+            status = int(status_line.split(None, 2)[1])
+        except (IndexError, ValueError):
+            raise DaemonError(f"malformed response: {status_line[:80]!r}") from None
+        headers = {}
+        for line in iter(self._file.readline, b'\r\n'):
+            if not line:
+                raise ConnectionResetError("connection closed by daemon")
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get('content-length', 0))
+        body = self._file.read(length)
+        if len(body) < length:
+            raise ConnectionResetError("truncated response")
+        return status, headers, body
+
+    def call(self, command: str, **payload) -> Dict[str, Any]:
+        if command not in COMMANDS:
+            raise DaemonError(f"unknown command: {command}")
+        body = json.dumps(payload).encode('utf-8')
+        request = (f'POST /{command} HTTP/1.1\r\nHost: {self._host}\r\n'
+                   f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n').encode('ascii') + body
+        for attempt in range(2):   # a kept-alive connection may have been closed by the daemon
+            try:
+                if self._sock is None:
+                    self._open()
+                self._sock.sendall(request)
+                status, headers, data = self._response()
+                break
+            except OSError as e:
+                self.close()
+                if attempt or isinstance(e, (FileNotFoundError, ConnectionRefusedError)):
+                    raise DaemonError(f"daemon not reachable: {e}") from e
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        try:
+            result = json.loads(data or b'{}')
+        except ValueError:
+            raise DaemonError(f"HTTP {status}: {data[:200]!r}") from None
+        if status != 200:
+            raise DaemonError(result.get('error', f"HTTP {status}"))
+        return result
+
+    def close(self):
+        if self._sock is not None:
+            self._file.close()
+            self._sock.close()
+            self._sock = self._file = None
+
+    def __enter__(self) -> 'DaemonClient':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _source_payload(path: str) -> Dict[str, str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return {'source': f.read(), 'path': os.path.abspath(path)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Send a request to a running craft_daemon.py")
+    parser.add_argument('--socket', default=None, help=f"Unix socket (default: {DEFAULT_SOCKET})")
+    parser.add_argument('--url', default=None, help="daemon HTTP address, e.g. http://127.0.0.1:8765")
+    parser.add_argument('command', choices=('parse', 'map', 'generate', 'status', 'stop'))
+    parser.add_argument('source', nargs='?', help=".java file (parse / map / generate)")
+    parser.add_argument('-o', '--output', default=None, help="generate: write adapters under this directory")
+    args = parser.parse_args(argv)
+
+    if args.command in ('parse', 'map', 'generate') and not args.source:
+        parser.error(f"{args.command} needs a source file")
+    command = 'shutdown' if args.command == 'stop' else args.command
+    try:
+        payload: Dict[str, Any] = _source_payload(args.source) if args.source else {}
+        if args.output:
+            payload['out_dir'] = os.path.abspath(args.output)
+        with DaemonClient(args.socket, args.url) as client:
+            result = client.call(command, **payload)
+    except (DaemonError, OSError, UnicodeDecodeError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
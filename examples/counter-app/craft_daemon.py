@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+CRAFT Daemon
+
+Long-lived server for editor integrations and commit hooks. The HarmonyOS
+SDK index, mapping rules, model router, prompt renderer and retrieval index
+are loaded once at start-up; requests then only pay for the work on the
+class they name. Parsed sources are kept in an LRU keyed by content hash,
+and retrieval results are cached by the MethodRetriever.
+
+Requests are JSON over HTTP/1.1 (keep-alive), on a Unix socket by default
+or on 127.0.0.1:PORT with --port:
+
+    POST /parse     {"source": "<java>", "path": "..."}  -> ApiSpec
+    POST /map       same                                  -> target, rule, tier, candidates
+    POST /generate  same + optional "out_dir", "prompt"   -> adapter outputs (written if out_dir),
+                                                             rendered AI prompt if "prompt" is true
+    POST /status                                          -> load time, request counts, cache stats
+    POST /shutdown
+
+Bodies must be sent as application/json. ``path`` (when read instead of
+``source``) and ``out_dir`` must lie under the workspace root (--root,
+default: the current directory). With --port the Host header must name the
+daemon's own address, so web pages cannot reach it by DNS rebinding. The
+default socket lives in $XDG_RUNTIME_DIR or a per-user 0700 directory.
+
+craft_client.py is the matching thin client.
+
+Usage:
+    python3 craft_daemon.py [--sdk DIR] [--socket PATH | --port N] [--root DIR] [--rules mapping_rules.yaml]
+"""
+
+import argparse
+import errno
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from context_retrieval import DEFAULT_TOP_K, MethodRetriever
+from craft_client import DEFAULT_SOCKET
+from ets_scanner import TargetIndex, load_target_index
+from generation_scheduler import load_type_conversions
+from model_router import ModelRouter, build_job, complexity_score, load_class_rules
+from pipeline_orchestrator import WorkItem, analyze_item, generate_item, load_class_targets, write_item
+from prompt_renderer import PromptRenderer
+from sdk_model import ApiSpec, JavaParser
+
+PARSE_CACHE_SIZE = 1024
+
+
+class RequestError(ValueError):
+    """Bad request payload; reported to the client as HTTP 400."""
+
+
+class CraftService:
+    """Everything a request needs, loaded once."""
+
+    def __init__(self, sdk_dir: Optional[str] = None, rules_path: Optional[str] = None,
+                 top_k: int = DEFAULT_TOP_K, targets: Optional[TargetIndex] = None,
+                 root: Optional[str] = None):
+        started = time.perf_counter()
+        self.root = os.path.realpath(root or os.getcwd())
+        if targets is None:
+            targets = load_target_index(sdk_dir) if sdk_dir else TargetIndex()
+        self.targets = targets
+        self.class_targets = load_class_targets(rules_path)
+        self.class_rules = load_class_rules(rules_path)
+        self.conversions = load_type_conversions(rules_path)
+        self.retriever = MethodRetriever(self.targets, self.conversions)
+        self.router = ModelRouter.from_config()
+        self.renderer = PromptRenderer(targets=self.targets, rules_path=rules_path,
+                                       retriever=self.retriever, top_k=top_k)
+        self.top_k = top_k
+        self.parser = JavaParser()
+        self._specs: 'OrderedDict[str, ApiSpec]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.parse_hits = 0
+        self.parse_misses = 0
+        self.requests: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        self.load_seconds = time.perf_counter() - started
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            'parse': self.parse, 'map': self.map, 'generate': self.generate, 'status': self.status,
+        }
+
+    def handle(self, command: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        handler = self.handlers.get(command)
+        if handler is None:
+            raise RequestError(f"unknown command: {command}")
+        started = time.perf_counter()
+        try:
+            return handler(payload)
+        finally:
+            with self._lock:
+                self.requests[command] = self.requests.get(command, 0) + 1
+                self.seconds[command] = self.seconds.get(command, 0.0) + time.perf_counter() - started
+
+    def confine(self, path: str, what: str) -> str:
+        """``path`` resolved, if it lies under the workspace root."""
+        resolved = os.path.realpath(path)
+        if os.path.commonpath([resolved, self.root]) != self.root:
+            raise RequestError(f"{what} must be under {self.root}: {path}")
+        return resolved
+
+    def spec(self, payload: Dict[str, Any]) -> ApiSpec:
+        """Parsed class for ``source`` (or the .java file at ``path``), cached by content hash."""
+        source = payload.get('source')
+        path = payload.get('path')
+        if source is None:
+            if not path:
+                raise RequestError("'source' or 'path' is required")
+            if not str(path).endswith('.java'):
+                raise RequestError(f"'path' must be a .java file: {path}")
+            try:
+                with open(self.confine(path, "'path'"), 'r', encoding='utf-8') as f:
+                    source = f.read()
+            except OSError as e:
+                raise RequestError(f"cannot read {path}: {e}") from e
+        key = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is not None:
+                self._specs.move_to_end(key)
+                self.parse_hits += 1
+                return spec
+            self.parse_misses += 1
+        spec = self.parser.parse_source(source, origin=path)
+        if spec is None:
+            raise RequestError("no class declaration found")
+        with self._lock:
+            self._specs[key] = spec
+            while len(self._specs) > PARSE_CACHE_SIZE:
+                self._specs.popitem(last=False)
+        return spec
+
+    def _item(self, payload: Dict[str, Any]) -> WorkItem:
+        item = WorkItem(payload.get('path') or '<request>', spec=self.spec(payload))
+        return analyze_item(item, self.class_targets)
+
+    def parse(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return asdict(self.spec(payload))
+
+    def map(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        item = self._item(payload)
+        job = build_job(item.spec, self.class_rules, self.conversions)
+        candidates = self.retriever.retrieve(item.spec, int(payload.get('top_k', self.top_k)))
+        return {
+            'class': f'{item.spec.package}.{item.spec.class_name}',
+            'target': item.target,
+            'mapping_type': job.mapping_type,
+            'confidence': job.confidence,
+            'unmapped_types': job.unmapped_types,
+            'complexity': round(complexity_score(job, self.router.min_confidence), 4),
+            'tier': self.router.tier_for(job),
+            'candidates': {name: [{'method': c.qualified_name, 'score': c.score} for c in found]
+                           for name, found in candidates.items()},
+        }
+
+    def generate(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        item = self._item(payload)
+        result: Dict[str, Any] = {'target': item.target, 'outputs': {}, 'written': []}
+        if item.target is None:
+            return result
+        out_dir = payload.get('out_dir') and self.confine(payload['out_dir'], "'out_dir'")
+        generate_item(item)
+        if out_dir:
+            write_item(item, out_dir)
+        result.update(outputs=item.outputs, written=item.written)
+        if payload.get('prompt'):
+            result['prompt'] = self.renderer(item.spec)
+        return result
+
+    def status(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'load_seconds': round(self.load_seconds, 4),
+                'target_classes': len(self.targets),
+                'target_methods': len(self.retriever.documents),
+                'requests': dict(self.requests),
+                'mean_ms': {name: round(1000 * self.seconds[name] / count, 3)
+                            for name, count in self.requests.items()},
+                'parse_cache': {'entries': len(self._specs), 'hits': self.parse_hits,
+                                'misses': self.parse_misses},
+                'retrieval_cache': {'hits': self.retriever.hits, 'misses': self.retriever.misses},
+            }
+
+# ============================================================================
+# Server
+# ============================================================================
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def _handler(service: CraftService, stop: Callable[[], None], check_host: bool = False):
+    """Request handler; with ``check_host``, requests naming a Host other than the server's are refused."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            command = self.path.strip('/')
+            if check_host and self.headers.get('host', '').lower() not in self._own_hosts():
+                self._send(403, {'error': 'unexpected Host header'}, close=True)
+                return
+            content_type = self.headers.get('content-type', '').split(';', 1)[0].strip().lower()
+            if content_type != 'application/json':
+                self._send(415, {'error': 'content-type must be application/json'}, close=True)
+                return
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))) or b'{}')
+                if command == 'shutdown':
+                    self._send(200, {'stopping': True})
+                    threading.Thread(target=stop, daemon=True).start()
+                    return
+                self._send(200, service.handle(command, payload))
+            except ValueError as e:   # RequestError and malformed JSON
+                self._send(400, {'error': str(e)})
+            except Exception as e:  # keep serving; report the failure to the caller
+                self._send(500, {'error': f"{type(e).__name__}: {e}"})
+
+        def _own_hosts(self):
+            port = self.server.server_address[1]
+            return {f'127.0.0.1:{port}', f'localhost:{port}'}
+
+        def _send(self, status, payload, close=False):
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(data)))
+            if close:   # the unread body would be taken for the next request
+                self.send_header("connection", "close")
+                self.close_connection = True
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def _private_dir(path: str):
+    """Create ``path`` with mode 0700, or check that an existing one is ours and private."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"{path} must be a directory owned by the current user with mode 0700")
+
+
+def _answers(socket_path: str) -> bool:
+    """True if something is accepting connections on ``socket_path``."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+    return True
+
+
+class CraftDaemon:
+    """Serves a CraftService on a Unix socket (default) or 127.0.0.1:``port``."""
+
+    def __init__(self, service: CraftService, socket_path: Optional[str] = None, port: Optional[int] = None):
+        self.service = service
+        self.socket_path = None
+        if port is not None:
+            self._server = ThreadingHTTPServer(('127.0.0.1', port), _handler(service, self.stop, check_host=True))
+            self._server.daemon_threads = True
+            self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        else:
+            if socket_path is None:
+                socket_path = DEFAULT_SOCKET
+                _private_dir(os.path.dirname(socket_path))
+            if os.path.exists(socket_path):
+                if _answers(socket_path):
+                    raise OSError(errno.EADDRINUSE, f"a daemon is already serving {socket_path}")
+                os.unlink(socket_path)   # stale socket from a previous run
+            self._server = _UnixHTTPServer(socket_path, _handler(service, self.stop))
+            self.socket_path = socket_path
+            os.chmod(socket_path, 0o600)
+            self.url = None
+        self._thread: Optional[threading.Thread] = None
+
+    def serve_forever(self):
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if self.socket_path and os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def start(self) -> 'CraftDaemon':
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def __enter__(self) -> 'CraftDaemon':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve parse / map / generate requests from memory")
+    parser.add_argument('--sdk', default=None, help="HarmonyOS .ets/.d.ts declarations to index")
+    parser.add_argument('--rules', default=None, help="mapping_rules.yaml")
+    parser.add_argument('--socket', default=None, help=f"Unix socket path (default: {DEFAULT_SOCKET})")
+    parser.add_argument('--port', type=int, default=None, help="serve HTTP on 127.0.0.1:PORT instead")
+    parser.add_argument('--root', default=None, help="workspace root that 'path' and 'out_dir' must lie under "
+                                                      "(default: current directory)")
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K)
+    args = parser.parse_args(argv)
+
+    service = CraftService(args.sdk, args.rules, args.top_k, root=args.root)
+    try:
+        daemon = CraftDaemon(service, args.socket, args.port)
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"loaded {len(service.targets)} target classes in {service.load_seconds:.3f}s; "
+          f"listening on {daemon.url or daemon.socket_path}", flush=True)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,9 +14,14 @@ CRAFT Framework - Hello World App Adapter Generator
 import os
 import re
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from android_xml import LayoutNode, load_xml
+from layout_translator import CLICK_HANDLERS, LayoutTranslator, drawable_resolver
+from resource_converter import convert_app
+from syntax_scanner import scan
+
 # ============================================================================
 # 数据模型
 # ============================================================================
@@ -34,6 +39,9 @@ class ClassInfo:
     name: str
     parent: Optional[str]
     methods: List[MethodInfo] = field(default_factory=list)
+    layout: Optional[str] = None  # setContentView(R.layout.xxx)
+    click_actions: Dict[str, str] = field(default_factory=dict)  # 控件 id -> 点击时调用的 API
+    origin: Optional[str] = None  # 源文件路径或归档条目名
 
 # ============================================================================
 # Java 解析器
@@ -46,9 +54,16 @@ class JavaParser:
         self.lifecycle_methods = {'onCreate', 'onDestroy', 'onStart', 'onStop', 'onResume', 'onPause'}
 
     def parse_file(self, filepath: str) -> ClassInfo:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(filepath, 'rb') as f:
+            return self.parse_bytes(f.read(), origin=str(filepath))
+
+    def parse_bytes(self, data: bytes, origin: Optional[str] = None,
+                    encoding: str = 'utf-8-sig') -> ClassInfo:
+        """解析内存中的字节内容 (如归档条目), 不经过磁盘"""
+        return self.parse_source(data.decode(encoding, errors='replace'), origin)
 
+    def parse_source(self, content: str, origin: Optional[str] = None) -> ClassInfo:
+        """解析内存中的 Java 源码文本"""
         # 提取包名
         package_match = re.search(r'package\s+([\w.]+);', content)
         package = package_match.group(1) if package_match else ""
@@ -61,7 +76,12 @@ class JavaParser:
         # 提取方法
         methods = self._extract_methods(content)
 
-        return ClassInfo(package=package, name=class_name, parent=parent_class, methods=methods)
+        # 提取布局与点击事件
+        layout_match = re.search(r'setContentView\(\s*R\.layout\.(\w+)\s*\)', content)
+        layout = layout_match.group(1) if layout_match else None
+
+        return ClassInfo(package=package, name=class_name, parent=parent_class, methods=methods,
+                         layout=layout, click_actions=self._extract_click_actions(content), origin=origin)
 
     def _extract_methods(self, content: str) -> List[MethodInfo]:
         methods = []
@@ -90,6 +110,27 @@ class JavaParser:
 
         return methods
 
+    def _extract_click_actions(self, content: str) -> Dict[str, str]:
+        """找出 findViewById(R.id.x) 绑定的控件在点击监听器中调用的已映射 API"""
+        bindings = dict(re.findall(
+            r'(\w+)\s*=\s*(?:\(\s*\w+\s*\)\s*)?findViewById\(\s*R\.id\.(\w+)\s*\)', content))
+        if not bindings:
+            return {}
+
+        # 监听器参数范围由词法扫描器的括号配对给出 (忽略字符串和注释)
+        paren_close = {start: end for opener, start, end in scan(content, 'java').pairs if opener == '('}
+        actions = {}
+        for match in re.finditer(r'(\w+)\s*\.\s*setOnClickListener\s*(\()', content):
+            view_id = bindings.get(match.group(1))
+            end = paren_close.get(match.start(2))
+            if view_id is None or end is None:
+                continue
+            for call in re.finditer(r'\b(\w+)\s*\(', content[match.start(2):end]):
+                if call.group(1) in API_MAPPING:
+                    actions[view_id] = call.group(1)
+                    break
+        return actions
+
 # ============================================================================
 # API 映射
 # ============================================================================
@@ -120,6 +161,10 @@ API_MAPPING = {
 class HarmonyGenerator:
     """生成 OpenHarmony/HarmonyOS 代码"""
 
+    def __init__(self, translator: Optional[LayoutTranslator] = None):
+        # 布局转换器在多个页面间共享, 重复子树只转换一次
+        self.translator = translator or LayoutTranslator()
+
     def generate_ability(self, class_info: ClassInfo) -> str:
         """生成 UIAbility (OpenHarmony API 风格)"""
         return f'''/**
@@ -193,8 +238,13 @@ export default class EntryAbility extends UIAbility {{
 }}
 '''
 
-    def generate_page(self, class_info: ClassInfo) -> str:
-        """生成 ArkUI 页面 (OpenHarmony API 风格)"""
+    def generate_page(self, class_info: ClassInfo, layout: Optional[LayoutNode] = None) -> str:
+        """生成 ArkUI 页面 (OpenHarmony API 风格)
+
+        传入布局树时由布局数据驱动生成 build(), 否则生成默认的 Hello World 页面。
+        """
+        if layout is not None:
+            return self._generate_layout_page(class_info, layout)
         return '''/**
  * CRAFT 自动生成 - ArkUI 页面
  * 对应 Android: activity_main.xml + MainActivity.java
@@ -288,6 +338,67 @@ struct Index {
         });
     }
 }
+'''
+
+    def _generate_layout_page(self, class_info: ClassInfo, layout: LayoutNode) -> str:
+        """按布局树生成 ArkUI 页面"""
+        build = self.translator.render_build(layout, class_info.click_actions)
+        handlers = sorted({
+            CLICK_HANDLERS[api] for api in class_info.click_actions.values() if api in CLICK_HANDLERS
+        })
+        layout_file = f"{class_info.layout or 'layout'}.xml"
+
+        members = ''
+        methods = ''
+        imports = "import hilog from '@ohos.hilog';"
+        if handlers:
+            imports = "import common from '@ohos.app.ability.common';\n" + imports
+            members = '''
+    /**
+     * 获取 UIAbility 上下文
+     * 用于调用 terminateSelf() 关闭窗口
+     */
+    private context: common.UIAbilityContext = getContext(this) as common.UIAbilityContext;
+'''
+        if 'closeWindow' in handlers:
+            methods = '''
+    /**
+     * 关闭窗口
+     * 对应 Android: Activity.finish()
+     */
+    closeWindow(): void {
+        hilog.info(DOMAIN, TAG, '关闭窗口 - 对应 Activity.finish()');
+
+        // terminateSelf() 对应 Android finish()
+        this.context.terminateSelf((err) => {
+            if (err.code) {
+                hilog.error(DOMAIN, TAG, '关闭失败: %{public}s', JSON.stringify(err));
+                return;
+            }
+            hilog.info(DOMAIN, TAG, '窗口已关闭');
+        });
+    }
+'''
+
+        return f'''/**
+ * CRAFT 自动生成 - ArkUI 页面
+ * 对应 Android: {layout_file} + {class_info.name}.java
+ *
+ * API 风格: OpenHarmony (@ohos.xxx)
+ * 兼容: OpenHarmony 3.2+ / HarmonyOS 3.0+
+ */
+
+{imports}
+
+const TAG: string = 'IndexPage';
+const DOMAIN: number = 0x0000;
+
+@Entry
+@Component
+struct Index {{
+{members}
+{build}
+{methods}}}
 '''
 
     def generate_adapter(self, class_info: ClassInfo) -> str:
@@ -375,7 +486,7 @@ def main():
     harmony_dir = script_dir / "harmony/entry/src/main/ets"
 
     # 解析 Android 源码
-    print("[1/4] 解析 Android 源码...")
+    print("[1/5] 解析 Android 源码...")
     parser = JavaParser()
     class_info = parser.parse_file(str(android_src))
 
@@ -389,10 +500,11 @@ def main():
     print()
 
     # 生成代码
-    generator = HarmonyGenerator()
+    res_dir = script_dir / "android/app/src/main/res"
+    generator = HarmonyGenerator(LayoutTranslator(drawable_resolver=drawable_resolver(str(res_dir))))
 
     # 生成 UIAbility
-    print("[2/4] 生成 UIAbility...")
+    print("[2/5] 生成 UIAbility...")
     ability_code = generator.generate_ability(class_info)
     ability_file = harmony_dir / "EntryAbility.ets"
     ability_file.parent.mkdir(parents=True, exist_ok=True)
@@ -400,9 +512,15 @@ def main():
         f.write(ability_code)
     print(f"      生成: {ability_file.relative_to(script_dir)}")
 
-    # 生成 ArkUI 页面
-    print("[3/4] 生成 ArkUI 页面...")
-    page_code = generator.generate_page(class_info)
+    # 生成 ArkUI 页面 (由 res/layout 布局驱动)
+    print("[3/5] 生成 ArkUI 页面...")
+    layout = None
+    if class_info.layout:
+        layout_file = res_dir / "layout" / f"{class_info.layout}.xml"
+        if layout_file.exists():
+            layout = load_xml(str(layout_file)).root
+            print(f"      布局: {layout_file.relative_to(script_dir)}")
+    page_code = generator.generate_page(class_info, layout)
     pages_dir = harmony_dir / "pages"
     pages_dir.mkdir(parents=True, exist_ok=True)
     page_file = pages_dir / "Index.ets"
@@ -411,7 +529,7 @@ def main():
     print(f"      生成: {page_file.relative_to(script_dir)}")
 
     # 生成适配器
-    print("[4/4] 生成适配器层...")
+    print("[4/5] 生成适配器层...")
     adapter_code = generator.generate_adapter(class_info)
     adapter_dir = harmony_dir / "adapters"
     adapter_dir.mkdir(parents=True, exist_ok=True)
@@ -420,6 +538,13 @@ def main():
         f.write(adapter_code)
     print(f"      生成: {adapter_file.relative_to(script_dir)}")
 
+    # 转换清单与资源
+    print("[5/5] 转换清单与资源...")
+    conversion = convert_app(str(script_dir / "android/app/src/main"), str(harmony_dir.parent))
+    for rel_path in conversion.written:
+        print(f"      生成: {rel_path}")
+    print(f"      未变化: {len(conversion.unchanged)} 个文件")
+
     # 总结
     print()
     print("=" * 70)
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+CRAFT ArkTS Declaration Scanner
+
+Reads HarmonyOS SDK declarations (.ets / .d.ts) into target-platform ApiSpec
+records without parsing function bodies: a single token regex walks the
+declaration level and every method body is skipped by bracket matching.
+Method and class tags follow the Rust ArkTsParser so both toolchains agree.
+
+Usage:
+    python3 ets_scanner.py <sdk dir or file> [--class NAME] [--method NAME]
+"""
+
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sdk_model import ApiSpec, MethodSpec, ParameterSpec
+from syntax_scanner import skip_block, skip_template_literal
+
+PLATFORM = "Harmony"
+DEFAULT_PACKAGE = "ohos"
+SUFFIXES = ('.d.ts', '.d.ets', '.ets')
+
+# Same list as ArkTsParser::generate_method_tags
+LIFECYCLE_METHODS = {
+    "onCreate", "onDestroy", "onWindowStageCreate", "onWindowStageDestroy",
+    "onForeground", "onBackground", "onNewWant", "onAbilityResult",
+    "aboutToAppear", "aboutToDisappear", "onPageShow", "onPageHide",
+    "onBackPress",
+}
+
+_TOKENS = re.compile(
+    r'(?P<doc>/\*\*.*?\*/)'
+    r'|(?P<comment>//[^\n]*|/\*.*?\*/)'
+    r'|(?P<string>"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\')'
+    r'|(?P<template>`)'
+    r'|(?P<open>\{)'
+    r'|(?P<close>\})'
+    r'|(?P<semi>;)',
+    re.DOTALL,
+)
+
+_DECORATOR = re.compile(r'@(\w+)(?:\([^()]*\))?\s*')
+_DECORATOR_LINE = re.compile(r'\s*(?:@\w+(?:\([^()]*\))?\s*)+$')
+_HEADER = re.compile(
+    r'(?:^|\s)(?:export\s+)?(?:default\s+)?(?:declare\s+)?(?P<abstract>abstract\s+)?'
+    r'(?P<kind>class|interface|struct|namespace|module|enum)\s+(?P<name>[\w$.]+)\s*(?:<.*?>)?\s*'
+    r'(?:extends\s+(?P<extends>.+?))?\s*(?:implements\s+(?P<implements>.+?))?\s*$',
+    re.DOTALL,
+)
+_MEMBER = re.compile(
+    r'(?P<mods>(?:(?:export|declare|function|public|private|protected|static|readonly|'
+    r'abstract|async|override|get|set)\s+)*)'
+    r'(?P<name>[A-Za-z_$][\w$]*)\s*\??\s*(?:<[^()]*>)?\s*\(',
+)
+_NESTING = re.compile(r'[(\[{<]')
+_MODIFIERS = ('public', 'protected', 'static', 'async', 'abstract', 'readonly')
+
+# A '{' after one of these is a type literal / initializer, not a body.
+_CONTINUATION = (':', '|', '&', ',', '<', '=', '(', '=>', '?')
+_LEADING_CONTINUATION = ('|', '&', ')', ',', '.', ':', '=>', '?', '>')
+
+# ============================================================================
+# Lexical helpers
+# ============================================================================
+
+def split_top_level(text: str, separator: str) -> List[str]:
+    """Split on ``separator`` outside (), [], {} and <> ('=>' does not close '<')."""
+    if not _NESTING.search(text):
+        return text.split(separator)
+    parts, depth, start, i = [], 0, 0, 0
+    while i < len(text):
+        c = text[i]
+        if c in '([{<':
+            depth += 1
+        elif c in ')]}':
+            depth -= 1
+        elif c == '>' and text[i - 1:i] != '=':
+            depth -= 1
+        elif depth == 0 and text.startswith(separator, i) and not (separator == '=' and text[i + 1:i + 2] == '>'):
+            parts.append(text[start:i])
+            start = i + len(separator)
+            i = start
+            continue
+        i += 1
+    parts.append(text[start:])
+    return parts
+
+
+def _matching_paren(text: str, pos: int) -> int:
+    depth = 0
+    for i in range(pos, len(text)):
+        if text[i] == '(':
+            depth += 1
+        elif text[i] == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def _clean_doc(comment: str) -> str:
+    """Same cleanup as ArkTsParser::clean_doc_comment."""
+    lines = (line.strip().lstrip('*').strip() for line in comment[3:-2].split('\n'))
+    return ' '.join(line for line in lines if line and not line.startswith('@'))
+
+
+def _split_members(text: str) -> List[str]:
+    """Split a run of semicolon-less members on line boundaries."""
+    members: List[str] = []
+    current = ''
+    depth = 0
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if (current and depth == 0 and not current.rstrip().endswith(_CONTINUATION)
+                and not stripped.startswith(_LEADING_CONTINUATION)):
+            members.append(current)
+            current = ''
+        current = f'{current}\n{stripped}' if current else stripped
+        depth += stripped.count('(') - stripped.count(')')
+    if current:
+        members.append(current)
+    return members
+
+# ============================================================================
+# Declaration parsing
+# ============================================================================
+
+def _parse_parameter(text: str) -> Optional[ParameterSpec]:
+    text = split_top_level(text.strip(), '=')[0].strip()
+    if not text:
+        return None
+    name_part, *type_part = split_top_level(text, ':')
+    name = name_part.strip()
+    param_type = ':'.join(type_part).strip() or 'any'
+    nullable = name.endswith('?') or 'null' in param_type or 'undefined' in param_type
+    name = name.rstrip('?').lstrip('.').strip()
+    return ParameterSpec(name, param_type, nullable)
+
+
+def method_tags(name: str, return_type: str, parameters: List[ParameterSpec]) -> List[str]:
+    """Same tags as ArkTsParser::generate_method_tags."""
+    tags = [f"returns:{return_type}", f"params:{len(parameters)}"]
+    lower = name.lower()
+    if lower.startswith(('get', 'is', 'has')):
+        tags.append("category:getter")
+    elif lower.startswith('set'):
+        tags.append("category:setter")
+    elif lower.startswith('on'):
+        tags.append("category:callback")
+    elif lower.startswith(('create', 'build')):
+        tags.append("category:factory")
+    elif lower.startswith(('add', 'remove')):
+        tags.append("category:collection")
+    if name in LIFECYCLE_METHODS:
+        tags.extend(["lifecycle:true", f"lifecycle:{name}"])
+    return tags
+
+
+def class_tags(spec: ApiSpec, decorators: Iterable[str] = ()) -> List[str]:
+    """Same tags as ArkTsParser::generate_semantic_tags (plus decorators)."""
+    tags = [f"type:{spec.class_type}", f"domain:{spec.package.split('.')[0]}"]
+    if spec.parent_class:
+        tags.append(f"extends:{spec.parent_class}")
+    tags.extend(f"implements:{i}" for i in spec.interfaces)
+    lower = spec.class_name.lower()
+    if 'ability' in lower:
+        if 'ui' in lower:
+            tags.append("component:uiability")
+        elif 'extension' in lower:
+            tags.append("component:extensionability")
+        else:
+            tags.append("component:ability")
+    else:
+        for word, tag in (('page', 'page'), ('component', 'arkui_component'), ('service', 'service'),
+                          ('provider', 'provider'), ('manager', 'manager')):
+            if word in lower:
+                tags.append(f"component:{tag}")
+                break
+    tags.extend(f"decorator:{d}" for d in decorators)
+    return tags
+
+
+def parse_member(text: str, doc: Optional[str] = None) -> Optional[MethodSpec]:
+    """One member declaration (without body) -> MethodSpec, or None for fields/private/constructors."""
+    text = _DECORATOR.sub('', text.strip())
+    m = _MEMBER.match(text)
+    if m is None:
+        return None
+    mods = m.group('mods').split()
+    name = m.group('name')
+    if name == 'constructor' or 'private' in mods or 'get' in mods or 'set' in mods:
+        return None
+    close = _matching_paren(text, m.end() - 1)
+    if close < 0:
+        return None
+    rest = text[close + 1:].strip()
+    if rest and not rest.startswith(':'):
+        return None  # e.g. a call expression in an initializer
+    return_type = ' '.join(rest[1:].split()) or 'void'
+    parameters = [p for p in (_parse_parameter(t) for t in split_top_level(text[m.end():close], ','))
+                  if p is not None]
+    return MethodSpec(
+        name=name,
+        return_type=return_type,
+        parameters=parameters,
+        modifiers=[mod for mod in mods if mod in _MODIFIERS],
+        semantic_tags=method_tags(name, return_type, parameters),
+        doc_comment=doc,
+    )
+
+
+def _type_name(text: str) -> str:
+    return text.split('<', 1)[0].strip()
+
+
+def _type_list(text: Optional[str]) -> List[str]:
+    return [_type_name(t) for t in split_top_level(text, ',') if t.strip()] if text else []
+
+
+class _Scanner:
+    def __init__(self, source: str, package: str, origin: Optional[str]):
+        self.source = source
+        self.package = package
+        self.origin = origin
+        self.specs: List[ApiSpec] = []
+        self.default: Optional[ApiSpec] = None
+
+    def container(self, pos: int, prefix: str, members: Optional[List[MethodSpec]]) -> int:
+        """
+        Scan declarations until the closing '}' of a body, or to the end of the
+        file at top level (``members`` is None). Body members are collected
+        into ``members``.
+        """
+        source = self.source
+        stmt: List[str] = []
+        doc: Optional[str] = None
+
+        def flush():
+            nonlocal doc
+            text = ''.join(stmt).strip()
+            stmt.clear()
+            if members is not None and text:
+                parts = _split_members(text)
+                for part in parts[:-1]:
+                    method = parse_member(part)
+                    if method is not None:
+                        members.append(method)
+                method = parse_member(parts[-1], doc)
+                if method is not None:
+                    members.append(method)
+            doc = None
+
+        while True:
+            m = _TOKENS.search(source, pos)
+            if m is None:
+                stmt.append(source[pos:])
+                flush()
+                return len(source)
+            stmt.append(source[pos:m.start()])
+            pos = m.end()
+            kind = m.lastgroup
+
+            if kind == 'doc':
+                if not ''.join(stmt).strip():
+                    doc = _clean_doc(m.group())
+                else:
+                    # Doc comment for the next member of a semicolon-less run.
+                    stmt.append('\n')
+            elif kind == 'comment':
+                stmt.append(' ')
+            elif kind == 'string':
+                stmt.append(m.group())
+            elif kind == 'template':
+                pos = skip_template_literal(source, pos)
+                stmt.append('``')
+            elif kind == 'semi':
+                flush()
+            elif kind == 'close':
+                flush()
+                if members is not None:
+                    return pos
+            else:  # '{'
+                header = ''.join(stmt).strip()
+                lines = header.split('\n')
+                first = len(lines) - 1
+                while first > 0 and _DECORATOR_LINE.match(lines[first - 1]):
+                    first -= 1  # @Entry / @Component on their own lines
+                last_lines = '\n'.join(lines[first:])
+                decorators = _DECORATOR.findall(last_lines)
+                declaration = _HEADER.search(_DECORATOR.sub('', last_lines))
+                if declaration and not header.endswith(_CONTINUATION):
+                    stmt[:] = ['\n'.join(lines[:first])]
+                    flush()
+                    pos = self.declaration(declaration, decorators, doc, pos, prefix)
+                    doc = None
+                elif header.endswith(_CONTINUATION) or header.count('(') > header.count(')'):
+                    end = skip_block(source, pos)
+                    stmt.append(source[pos - 1:end])  # type literal / initializer
+                    pos = end
+                else:
+                    pos = skip_block(source, pos)
+                    flush()
+
+    def declaration(self, header: re.Match, decorators: List[str], doc: Optional[str],
+                    pos: int, prefix: str) -> int:
+        kind = header.group('kind')
+        name = prefix + header.group('name')
+        if kind == 'enum':
+            self._add(ApiSpec(PLATFORM, self.package, name, 'enum', origin=self.origin), decorators, header)
+            return skip_block(self.source, pos)
+
+        methods: List[MethodSpec] = []
+        nested_prefix = name + '.' if kind in ('namespace', 'module') else prefix
+        end = self.container(pos, nested_prefix, methods)
+
+        if kind in ('namespace', 'module'):
+            if not methods:
+                return end
+            class_type, parent, interfaces = 'namespace', None, []
+        elif kind == 'interface':
+            class_type, parent, interfaces = 'interface', None, _type_list(header.group('extends'))
+        else:
+            class_type = 'abstract_class' if header.group('abstract') else kind
+            extends = _type_list(header.group('extends'))
+            parent = extends[0] if extends else None
+            interfaces = _type_list(header.group('implements'))
+
+        spec = ApiSpec(PLATFORM, self.package, name, class_type, parent, interfaces, methods,
+                       origin=self.origin)
+        self._add(spec, decorators, header)
+        return end
+
+    def _add(self, spec: ApiSpec, decorators: List[str], header: re.Match):
+        spec.semantic_tags = class_tags(spec, decorators)
+        self.specs.append(spec)
+        if self.default is None and ' default ' in f' {header.group(0)} ':
+            self.default = spec
+
+
+def package_for(path: str) -> str:
+    """
+    Module name as ArkTsParser derives it: '@ohos.app.ability.UIAbility.d.ts'
+    -> 'ohos.app.ability', otherwise the directories from the innermost
+    'ohos' / '@ohos' / '@ohos.*' path component on ('sdk/ohos/app/X.ets' ->
+    'ohos.app'). Only whole components count, so 'openharmony-sdk' or
+    'ohos_tools' directories do not leak into the package.
+    """
+    name = os.path.basename(path)
+    if name.startswith('@ohos.'):
+        stem = name[1:]
+        for suffix in SUFFIXES:
+            if stem.endswith(suffix):
+                stem = stem[:-len(suffix)]
+                break
+        module, _, last = stem.rpartition('.')
+        return module if last[:1].isupper() else stem
+    parts = os.path.dirname(os.path.abspath(path)).split(os.sep)
+    for i in range(len(parts) - 1, -1, -1):
+        if parts[i] in ('ohos', '@ohos') or parts[i].startswith('@ohos.'):
+            return '.'.join([parts[i][1:] if parts[i].startswith('@') else parts[i]] + parts[i + 1:])
+    return DEFAULT_PACKAGE
+
+
+def scan_source(content: str, package: str = DEFAULT_PACKAGE, origin: Optional[str] = None) -> List[ApiSpec]:
+    """All class/interface/struct/enum/namespace declarations in one file."""
+    scanner = _Scanner(content, package, origin)
+    scanner.container(0, '', None)
+    return scanner.specs
+
+
+class EtsDeclarationParser:
+    """Parser front-end with the same entry points as JavaParser."""
+
+    def __init__(self, package: Optional[str] = None):
+        self.package = package
+
+    def scan_file(self, path: str) -> List[ApiSpec]:
+        with open(path, 'rb') as f:
+            data = f.read()
+        return scan_source(data.decode('utf-8-sig', errors='replace'),
+                           self.package or package_for(path), str(path))
+
+    def parse_source(self, content: str, origin: Optional[str] = None) -> Optional[ApiSpec]:
+        """The default export, or the first declaration."""
+        package = self.package or (package_for(origin) if origin else DEFAULT_PACKAGE)
+        scanner = _Scanner(content, package, origin)
+        scanner.container(0, '', None)
+        return scanner.default or (scanner.specs[0] if scanner.specs else None)
+
+    def parse_bytes(self, data: bytes, origin: Optional[str] = None,
+                    encoding: str = 'utf-8-sig') -> Optional[ApiSpec]:
+        return self.parse_source(data.decode(encoding, errors='replace'), origin)
+
+    def parse_file(self, path: str) -> Optional[ApiSpec]:
+        with open(path, 'rb') as f:
+            return self.parse_bytes(f.read(), origin=str(path))
+
+# ============================================================================
+# Target index
+# ============================================================================
+
+class TargetIndex:
+    """Target-side specs indexed by class name (short, qualified, FQN) and method name."""
+
+    def __init__(self, specs: Iterable[ApiSpec] = ()):
+        self.specs: List[ApiSpec] = []
+        self.classes: Dict[str, ApiSpec] = {}
+        self.methods: Dict[str, List[Tuple[ApiSpec, MethodSpec]]] = {}
+        for spec in specs:
+            self.add(spec)
+
+    def add(self, spec: ApiSpec):
+        self.specs.append(spec)
+        short = spec.class_name.rsplit('.', 1)[-1]
+        for key in (f'{spec.package}.{spec.class_name}', spec.class_name, short):
+            self.classes.setdefault(key, spec)
+        for method in spec.methods:
+            self.methods.setdefault(method.name, []).append((spec, method))
+
+    def get(self, name: str) -> Optional[ApiSpec]:
+        return self.classes.get(name)
+
+    def find_methods(self, name: str, class_name: Optional[str] = None) -> List[Tuple[ApiSpec, MethodSpec]]:
+        """Methods called ``name``, optionally restricted to one class."""
+        matches = self.methods.get(name, [])
+        if class_name is None:
+            return list(matches)
+        spec = self.get(class_name)
+        return [(s, m) for s, m in matches if s is spec]
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+
+def discover_declarations(root: str) -> List[str]:
+    if os.path.isfile(root):
+        return [root]
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in ('node_modules', 'build', 'oh_modules')
+                             and not d.startswith('.'))
+        files.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.endswith(SUFFIXES))
+    return files
+
+
+def _scan_job(job: Tuple[str, Optional[str]]) -> List[ApiSpec]:
+    path, package = job
+    return EtsDeclarationParser(package).scan_file(path)
+
+
+def load_target_index(root: str, package: Optional[str] = None, workers: Optional[int] = None) -> TargetIndex:
+    """Scan every declaration file under ``root`` (in parallel for large SDKs)."""
+    files = discover_declarations(root)
+    jobs = [(path, package) for path in files]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(files) < 2 * workers:
+        results = map(_scan_job, jobs)
+        return TargetIndex(spec for specs in results for spec in specs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_scan_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    return TargetIndex(spec for specs in results for spec in specs)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scan HarmonyOS .ets/.d.ts declarations")
+    parser.add_argument('path')
+    parser.add_argument('--package', default=None)
+    parser.add_argument('--class', dest='class_name', default=None)
+    parser.add_argument('--method', default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    index = load_target_index(args.path, args.package, args.workers)
+    if args.method:
+        for spec, method in index.find_methods(args.method, args.class_name):
+            params = ', '.join(f'{p.name}: {p.param_type}' for p in method.parameters)
+            print(f"{spec.package}.{spec.class_name}.{method.name}({params}): {method.return_type}")
+        return 0
+    specs = [index.get(args.class_name)] if args.class_name else index.specs
+    for spec in specs:
+        if spec is None:
+            print(f"not found: {args.class_name}")
+            return 1
+        print(f"{spec.package}.{spec.class_name} ({spec.class_type}): {len(spec.methods)} methods")
+    print(f"{len(index)} declarations, {len(index.methods)} method names")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
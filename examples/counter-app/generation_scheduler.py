@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+CRAFT Generation Scheduler
+
+Orders adapter generation over an ApiSpec corpus. Each class is a task that
+depends on its parent class's adapter and on the type conversions (Bundle,
+Intent, ...) its method signatures use. Tasks are dispatched to a worker
+pool as soon as their dependencies finish; among ready tasks the one with
+the longest remaining chain (critical path) goes first.
+
+Generation is CPU-bound Python, so the default pool is a ProcessPoolExecutor
+and the task function must be picklable (defined at module level). Pass an
+``executor`` (e.g. a ThreadPoolExecutor) for I/O-bound work such as model
+calls, or for functions that share in-process state.
+"""
+
+import heapq
+import os
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from class_hierarchy import HierarchyIndex, fqn
+from sdk_model import MAPPING_RULES_PATH, ApiSpec
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional; fall back to the built-in table
+    yaml = None
+
+# Subset of mapping_rules.yaml used when the rules file cannot be read
+DEFAULT_CONVERSIONS = {
+    'Intent': 'ohos.app.Want',
+    'Bundle': 'ohos.app.AbilityConstant.LaunchParam',
+    'Context': 'ohos.app.Context',
+}
+
+_RULE_SECTIONS = ('direct_mappings', 'semantic_mappings', 'bridge_mappings')
+
+
+def load_type_conversions(rules_path: Optional[str] = None) -> Dict[str, str]:
+    """Simple Android type name -> HarmonyOS type, from type_mappings and the class-level rules."""
+    path = rules_path or MAPPING_RULES_PATH
+    if yaml is None or not os.path.exists(path):
+        return dict(DEFAULT_CONVERSIONS)
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = yaml.safe_load(f) or {}
+
+    conversions = {}
+    for section in _RULE_SECTIONS:
+        for rule in rules.get(section) or []:
+            conversions[rule['android'].rsplit('.', 1)[-1]] = rule['harmony']
+    for android, harmony in (rules.get('type_mappings') or {}).items():
+        conversions[android.rsplit('.', 1)[-1]] = harmony
+    return conversions or dict(DEFAULT_CONVERSIONS)
+
+
+def referenced_types(spec: ApiSpec) -> Set[str]:
+    """Simple type names used in method signatures (generics and arrays stripped)."""
+    names = set()
+    for method in spec.methods:
+        for type_name in [method.return_type] + [p.param_type for p in method.parameters]:
+            for part in type_name.replace('<', ',').replace('>', ',').split(','):
+                part = part.strip().rstrip('[]. ').split('.')[-1]
+                if part:
+                    names.add(part)
+    return names
+
+# ============================================================================
+# Dependency graph
+# ============================================================================
+
+@dataclass
+class Task:
+    key: str                     # 'class:<fqn>' or 'type:<name>'
+    kind: str                    # 'class' | 'type'
+    name: str
+    cost: float = 1.0
+    payload: Any = None          # ApiSpec for classes, HarmonyOS type for conversions
+    deps: Set[str] = field(default_factory=set)
+
+
+class DependencyGraph:
+    """DAG of generation tasks; an edge means 'must finish before'."""
+
+    def __init__(self):
+        self.tasks: Dict[str, Task] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+
+    def add_task(self, task: Task) -> Task:
+        self.tasks.setdefault(task.key, task)
+        self.dependents.setdefault(task.key, set())
+        return self.tasks[task.key]
+
+    def add_dependency(self, key: str, depends_on: str):
+        self.tasks[key].deps.add(depends_on)
+        self.dependents[depends_on].add(key)
+
+    @classmethod
+    def from_corpus(cls, specs: Iterable[ApiSpec], conversions: Optional[Dict[str, str]] = None,
+                    hierarchy: Optional[HierarchyIndex] = None) -> 'DependencyGraph':
+        """Class tasks depend on the parent class task and on conversions for referenced types."""
+        specs = list(specs)
+        conversions = load_type_conversions() if conversions is None else conversions
+        hierarchy = hierarchy or HierarchyIndex(specs)
+        graph = cls()
+        for spec in specs:
+            graph.add_task(Task(f'class:{fqn(spec)}', 'class', fqn(spec), 1.0 + len(spec.methods), spec))
+
+        for spec in specs:
+            key = f'class:{fqn(spec)}'
+            parent = hierarchy.superclass(fqn(spec))
+            if parent is not None and f'class:{parent}' in graph.tasks:
+                graph.add_dependency(key, f'class:{parent}')
+            for type_name in sorted(referenced_types(spec)):
+                if type_name in conversions:
+                    graph.add_task(Task(f'type:{type_name}', 'type', type_name, 1.0, conversions[type_name]))
+                    graph.add_dependency(key, f'type:{type_name}')
+        return graph
+
+    def topological_order(self) -> List[str]:
+        """Kahn's algorithm; raises ValueError naming the tasks on a cycle."""
+        remaining = {key: len(task.deps) for key, task in self.tasks.items()}
+        ready = sorted(key for key, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            key = ready.pop()
+            order.append(key)
+            for dependent in self.dependents[key]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.tasks):
+            cycle = sorted(key for key, count in remaining.items() if count > 0)
+            raise ValueError(f"dependency cycle among: {', '.join(cycle)}")
+        return order
+
+    def critical_path(self) -> Dict[str, float]:
+        """Cost of the longest chain from each task through everything waiting on it."""
+        lengths: Dict[str, float] = {}
+        for key in reversed(self.topological_order()):
+            downstream = max((lengths[d] for d in self.dependents[key]), default=0.0)
+            lengths[key] = self.tasks[key].cost + downstream
+        return lengths
+
+# ============================================================================
+# Scheduler
+# ============================================================================
+
+class Scheduler:
+    """
+    Dispatches ready tasks to a worker pool, longest critical path first.
+    Idle workers always take the best ready task from the shared heap, so
+    no worker waits behind a busy one. A failed task's dependents are skipped.
+    Without ``executor``, tasks run in a ProcessPoolExecutor of ``workers``.
+    """
+
+    def __init__(self, graph: DependencyGraph, workers: Optional[int] = None,
+                 executor: Optional[Executor] = None):
+        self.graph = graph
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = executor
+        self.priority = graph.critical_path()
+        self.dispatched: List[str] = []
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, BaseException] = {}
+        self.skipped: Set[str] = set()
+
+    def run(self, fn: Callable[[Task], Any]) -> Dict[str, Any]:
+        graph = self.graph
+        remaining = {key: len(task.deps) for key, task in graph.tasks.items()}
+        ready: List = []
+        for key, count in remaining.items():
+            if count == 0:
+                heapq.heappush(ready, (-self.priority[key], key))
+
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.workers)
+        in_flight = {}
+        try:
+            while ready or in_flight:
+                while ready and len(in_flight) < self.workers:
+                    _, key = heapq.heappop(ready)
+                    self.dispatched.append(key)
+                    in_flight[executor.submit(fn, graph.tasks[key])] = key
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = in_flight.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        self.errors[key] = error
+                        self._skip_dependents(key)
+                        continue
+                    self.results[key] = future.result()
+                    for dependent in graph.dependents[key]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0 and dependent not in self.skipped:
+                            heapq.heappush(ready, (-self.priority[dependent], dependent))
+        finally:
+            if self.executor is None:
+                executor.shutdown()
+        return self.results
+
+    def _skip_dependents(self, key: str):
+        stack = list(self.graph.dependents[key])
+        while stack:
+            dependent = stack.pop()
+            if dependent not in self.skipped:
+                self.skipped.add(dependent)
+                stack.extend(self.graph.dependents[dependent])
+
+
+def schedule_generation(specs: Iterable[ApiSpec], fn: Callable[[Task], Any],
+                        workers: Optional[int] = None, executor: Optional[Executor] = None) -> Scheduler:
+    """
+    Build the graph for ``specs`` and run ``fn`` on every task in dependency
+    order, in worker processes unless an ``executor`` is given.
+    """
+    scheduler = Scheduler(DependencyGraph.from_corpus(specs), workers, executor)
+    scheduler.run(fn)
+    return scheduler
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - Android 布局 -> ArkUI 转换器
+
+将 res/layout/*.xml 流式解析为布局树, 再按 mapping_rules.yaml 的组件映射
+渲染 ArkUI build() 方法体:
+- LinearLayout -> Column / Row (按 orientation)
+- View -> Column, TextView -> Text, Button -> Button, ImageView -> Image, EditText -> TextInput
+- 常用属性 (尺寸、边距、颜色、字体、gravity) -> ArkUI 链式属性
+- @android: 系统资源 -> 字面值或 sys. 资源
+
+重复出现的控件子树按结构键缓存 (每个节点只计算一次, 只包含子树自身的点击事件),
+同一应用的上百个布局共享同一个缓存。
+"""
+
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from android_xml import LayoutNode, load_xml
+from sdk_model import MAPPING_RULES_PATH
+
+try:
+    import yaml
+except ImportError:  # PyYAML 可选, 缺失时使用内置映射
+    yaml = None
+
+# ============================================================================
+# 组件映射
+# ============================================================================
+
+# 与 mapping_rules.yaml 中 direct_mappings 的布局/控件部分一致
+DEFAULT_COMPONENTS = {
+    'View': 'Column',
+    'TextView': 'Text',
+    'Button': 'Button',
+    'ImageView': 'Image',
+    'EditText': 'TextInput',
+    'LinearLayout': 'Column/Row',
+    'FrameLayout': 'Stack',
+    'RelativeLayout': 'RelativeContainer',
+}
+
+# ArkUI 基类组件不能直接实例化, 用空容器代替
+_ABSTRACT_COMPONENTS = {
+    'Component': 'Column',
+}
+
+# Android 点击事件中调用的 API -> 页面方法名 (方法体见 CLICK_HANDLER_BODIES)
+CLICK_HANDLERS = {
+    'finish': 'closeWindow',
+}
+
+
+def load_component_mapping(rules_path: Optional[str] = None) -> Dict[str, str]:
+    """从 mapping_rules.yaml 读取 android.view/widget -> ohos.arkui 的组件映射"""
+    path = Path(rules_path) if rules_path else MAPPING_RULES_PATH
+    if yaml is None or not path.exists():
+        return dict(DEFAULT_COMPONENTS)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = yaml.safe_load(f) or {}
+
+    mapping = {}
+    for rule in rules.get('direct_mappings', []):
+        android, harmony = rule.get('android', ''), rule.get('harmony', '')
+        if android.startswith(('android.widget.', 'android.view.')) and harmony.startswith('ohos.arkui.'):
+            component = harmony[len('ohos.arkui.'):]
+            mapping[android.rsplit('.', 1)[1]] = _ABSTRACT_COMPONENTS.get(component, component)
+    return mapping or dict(DEFAULT_COMPONENTS)
+
+# ============================================================================
+# 属性转换
+# ============================================================================
+
+_MARGIN_SIDES = {'Top': 'top', 'Bottom': 'bottom', 'Left': 'left', 'Right': 'right',
+                 'Start': 'left', 'End': 'right'}
+
+# @android: 系统资源 -> ArkUI 字面值; 未列出的映射到同名 sys. 资源
+ANDROID_SYSTEM_RESOURCES = {
+    'color/white': "'#FFFFFF'",
+    'color/black': "'#000000'",
+    'color/transparent': "'#00000000'",
+    'color/darker_gray': "'#AAAAAA'",
+    'string/ok': "'OK'",
+    'string/cancel': "'Cancel'",
+    'string/yes': "'Yes'",
+    'string/no': "'No'",
+}
+
+
+def _quote(text: str) -> str:
+    return "'" + text.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+def _resource(value: str) -> Optional[str]:
+    """@string/x -> $r('app.string.x'), @drawable/x -> $r('app.media.x'), @android:color/white -> '#FFFFFF'"""
+    if not value.startswith('@') or '/' not in value:
+        return None
+    reference = value[1:].lstrip('+')
+    scope = 'app'
+    if reference.startswith('android:'):
+        reference = reference[len('android:'):]
+        if reference in ANDROID_SYSTEM_RESOURCES:
+            return ANDROID_SYSTEM_RESOURCES[reference]
+        scope = 'sys'
+    kind, name = reference.split('/', 1)
+    kind = {'drawable': 'media', 'mipmap': 'media', 'dimen': 'float'}.get(kind, kind)
+    return f"$r('{scope}.{kind}.{name}')"
+
+
+def _text(value: str) -> str:
+    return _resource(value) or _quote(value)
+
+
+def _color(value: str) -> str:
+    return _resource(value) or _quote(value)
+
+
+def _size(value: str) -> Optional[str]:
+    """尺寸: match_parent -> '100%', wrap_content -> 不设置, 48dp/32sp -> 48/32"""
+    if value in ('match_parent', 'fill_parent'):
+        return "'100%'"
+    if value == 'wrap_content':
+        return None
+    for unit in ('dp', 'dip', 'sp'):
+        if value.endswith(unit) and value[:-len(unit)].replace('.', '', 1).lstrip('-').isdigit():
+            number = value[:-len(unit)]
+            return number[:-2] if number.endswith('.0') else number
+    if value.startswith('@'):
+        return _resource(value)
+    return _quote(value)
+
+
+def _gravity_attrs(component: str, gravity: str) -> List[str]:
+    flags = set(gravity.split('|'))
+    attrs = []
+    if component == 'Column':
+        if flags & {'center', 'center_vertical'}:
+            attrs.append('.justifyContent(FlexAlign.Center)')
+        if flags & {'center', 'center_horizontal'}:
+            attrs.append('.alignItems(HorizontalAlign.Center)')
+    elif component == 'Row':
+        if flags & {'center', 'center_horizontal'}:
+            attrs.append('.justifyContent(FlexAlign.Center)')
+        if flags & {'center', 'center_vertical'}:
+            attrs.append('.alignItems(VerticalAlign.Center)')
+    elif flags & {'center', 'center_horizontal'}:
+        attrs.append('.textAlign(TextAlign.Center)')
+    return attrs
+
+
+def _view_id(node: LayoutNode) -> Optional[str]:
+    """@+id/btn_close -> btn_close"""
+    return (node.get('id') or '').split('/', 1)[-1] or None
+
+# ============================================================================
+# 转换器
+# ============================================================================
+
+class LayoutTranslator:
+    """布局树 -> ArkUI 组件代码 (子树结果按结构键缓存)"""
+
+    INDENT = '    '
+
+    def __init__(self, components: Optional[Dict[str, str]] = None,
+                 drawable_resolver: Optional[Callable[[str], Dict[str, str]]] = None):
+        self.components = components if components is not None else load_component_mapping()
+        self.drawable_resolver = drawable_resolver
+        # 结构 -> 键; 子节点以键表示, 每个节点的结构只需浅层哈希
+        self._shapes: Dict[Tuple, int] = {}
+        self._memo: Dict[int, Tuple[str, ...]] = {}
+        self.memo_hits = 0
+
+    def render_build(self, root: LayoutNode, click_actions: Optional[Dict[str, str]] = None,
+                     indent: int = 1) -> str:
+        """渲染完整的 build() 方法"""
+        pad = self.INDENT * indent
+        body = self.render(root, click_actions, indent + 1)
+        return (f"{pad}/**\n{pad} * 构建 UI\n{pad} * 对应 Android: {root.tag} 布局\n{pad} */\n"
+                f"{pad}build() {{\n{body}\n{pad}}}")
+
+    def render(self, node: LayoutNode, click_actions: Optional[Dict[str, str]] = None,
+               indent: int = 0) -> str:
+        """渲染一个节点及其子树"""
+        actions = click_actions or {}
+        keys: Dict[int, int] = {}
+        self._key(node, actions, keys)
+        pad = self.INDENT * indent
+        return '\n'.join(pad + line if line else line for line in self._render(node, actions, keys))
+
+    def _key(self, node: LayoutNode, actions: Dict[str, str], keys: Dict[int, int]) -> int:
+        """子树结构键 (标签、属性、文本、本节点点击事件、子节点键), 自底向上每个节点算一次"""
+        children = tuple(self._key(child, actions, keys) for child in node.children)
+        shape = (node.tag, tuple(sorted(node.attrs.items())), node.text, actions.get(_view_id(node)), children)
+        key = self._shapes.setdefault(shape, len(self._shapes))
+        keys[id(node)] = key
+        return key
+
+    def _render(self, node: LayoutNode, actions: Dict[str, str], keys: Dict[int, int]) -> Tuple[str, ...]:
+        key = keys[id(node)]
+        cached = self._memo.get(key)
+        if cached is not None:
+            self.memo_hits += 1
+            return cached
+
+        lines: List[str] = []
+        component = self._component(node)
+        view_id = _view_id(node)
+        if view_id:
+            lines.append(f'// android:id="@+id/{view_id}"')
+
+        if component is None:
+            lines.append(f'// TODO: 未映射的 Android 组件 <{node.tag}>')
+            for child in node.children:
+                lines.extend(self._render(child, actions, keys))
+            result = tuple(lines)
+            self._memo[key] = result
+            return result
+
+        lines.append(f'// {component} 对应 Android {node.tag}')
+        call = f'{component}({self._args(component, node)})'
+        attrs = self._attrs(component, node)
+        handler = CLICK_HANDLERS.get(actions.get(view_id, ''))
+        if handler:
+            attrs.append(f'.onClick(() => {{\n{self.INDENT}this.{handler}();\n}})')
+
+        if node.children:
+            lines.append(call + ' {')
+            for child in node.children:
+                lines.append('')
+                lines.extend(self.INDENT + l if l else l for l in self._render(child, actions, keys))
+            lines.append('}')
+            for attr in attrs:
+                lines.extend(attr.split('\n'))
+        else:
+            lines.append(call)
+            for attr in attrs:
+                lines.extend(self.INDENT + l for l in attr.split('\n'))
+
+        result = tuple(lines)
+        self._memo[key] = result
+        return result
+
+    def _component(self, node: LayoutNode) -> Optional[str]:
+        tag = node.tag.rsplit('.', 1)[-1]
+        component = self.components.get(tag)
+        if component == 'Column/Row':
+            return 'Column' if node.get('orientation') == 'vertical' else 'Row'
+        return component
+
+    def _args(self, component: str, node: LayoutNode) -> str:
+        if component in ('Text', 'Button') and node.get('text') is not None:
+            return _text(node.get('text'))
+        if component == 'TextInput':
+            options = []
+            if node.get('hint') is not None:
+                options.append(f"placeholder: {_text(node.get('hint'))}")
+            if node.get('text') is not None:
+                options.append(f"text: {_text(node.get('text'))}")
+            return '{ ' + ', '.join(options) + ' }' if options else ''
+        if component == 'Image' and node.get('src'):
+            return _resource(node.get('src')) or _quote(node.get('src'))
+        return ''
+
+    def _attrs(self, component: str, node: LayoutNode) -> List[str]:
+        attrs = []
+        get = node.get
+
+        if get('textSize'):
+            attrs.append(f".fontSize({_size(get('textSize'))})")
+        style = get('textStyle', '')
+        if 'bold' in style:
+            attrs.append('.fontWeight(FontWeight.Bold)')
+        if 'italic' in style:
+            attrs.append('.fontStyle(FontStyle.Italic)')
+        if get('textColor'):
+            attrs.append(f".fontColor({_color(get('textColor'))})")
+
+        for name, method in (('layout_width', 'width'), ('layout_height', 'height')):
+            size = _size(get(name, 'wrap_content'))
+            if size is not None:
+                attrs.append(f'.{method}({size})')
+        if get('layout_weight'):
+            attrs.append(f".layoutWeight({get('layout_weight')})")
+
+        for prefix, method in (('layout_margin', 'margin'), ('padding', 'padding')):
+            attrs.extend(self._box(node, prefix, method))
+
+        background = get('background')
+        if background:
+            attrs.extend(self._background(background))
+
+        if get('gravity'):
+            attrs.extend(_gravity_attrs(component, get('gravity')))
+
+        visibility = {'gone': 'Visibility.None', 'invisible': 'Visibility.Hidden'}.get(get('visibility', ''))
+        if visibility:
+            attrs.append(f'.visibility({visibility})')
+        return attrs
+
+    @staticmethod
+    def _box(node: LayoutNode, prefix: str, method: str) -> List[str]:
+        if node.get(prefix):
+            return [f'.{method}({_size(node.get(prefix))})']
+        sides = [
+            f'{side}: {_size(node.get(prefix + suffix))}'
+            for suffix, side in _MARGIN_SIDES.items()
+            if node.get(prefix + suffix)
+        ]
+        return [f'.{method}({{ {", ".join(sides)} }})'] if sides else []
+
+    def _background(self, value: str) -> List[str]:
+        if value.startswith('@drawable/') and self.drawable_resolver:
+            shape = self.drawable_resolver(value.split('/', 1)[1])
+            attrs = []
+            if shape.get('color'):
+                attrs.append(f".backgroundColor({_color(shape['color'])})")
+            if shape.get('radius'):
+                attrs.append(f".borderRadius({_size(shape['radius'])})")
+            if attrs:
+                return attrs
+        if value.startswith('@drawable/') or value.startswith('@mipmap/'):
+            return [f'.backgroundImage({_resource(value)})']
+        return [f'.backgroundColor({_color(value)})']
+
+
+def drawable_resolver(res_dir: str) -> Callable[[str], Dict[str, str]]:
+    """读取 res/drawable/<name>.xml 中 <shape> 的纯色和圆角"""
+    def resolve(name: str) -> Dict[str, str]:
+        path = os.path.join(res_dir, 'drawable', f'{name}.xml')
+        if not os.path.exists(path):
+            return {}
+        root = load_xml(path).root
+        if root is None or root.tag != 'shape':
+            return {}
+        shape = {}
+        for child in root.children:
+            if child.tag == 'solid' and child.get('color'):
+                shape['color'] = child.get('color')
+            elif child.tag == 'corners' and child.get('radius'):
+                shape['radius'] = child.get('radius')
+        return shape
+    return resolve
+
+
+def translate_layouts(layout_dir: str, translator: Optional[LayoutTranslator] = None) -> Dict[str, str]:
+    """转换目录下全部布局, 返回 {布局名: build() 方法}"""
+    res_dir = os.path.dirname(os.path.abspath(layout_dir))
+    translator = translator or LayoutTranslator(drawable_resolver=drawable_resolver(res_dir))
+    pages = {}
+    for path in sorted(Path(layout_dir).glob('*.xml')):
+        document = load_xml(str(path))
+        if document.root is not None:
+            pages[path.stem] = translator.render_build(document.root)
+    return pages
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+CRAFT Model Router
+
+Chooses between ai.model_light / model_standard / model_advanced per mapping
+job. Each job is scored from the signals that make an adapter hard to get
+right: methods that need real delegation (lifecycle callbacks are cheap),
+low mapping confidence, semantic / bridge / shim mapping types, and
+signature types with no known conversion. The job goes to the cheapest tier
+whose score band it falls in; a result that fails verification is retried
+one tier up.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from ai_client import AiClient, AiConfig
+from generation_scheduler import load_type_conversions, referenced_types
+from sdk_model import CONFIG_PATH, LIFECYCLE_MAPPING, MAPPING_RULES_PATH, TS_TYPE_MAP, ApiSpec
+from syntax_scanner import scan
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional; fall back to the defaults below
+    yaml = None
+
+TIERS = ('light', 'standard', 'advanced')
+
+_SECTION_TYPES = {
+    'direct_mappings': 'direct',
+    'semantic_mappings': 'semantic',
+    'bridge_mappings': 'bridge',
+}
+
+# Score weights
+TYPE_WEIGHT = {'direct': 0.0, 'semantic': 0.5, 'bridge': 1.5, 'shim': 2.0}
+DELEGATE_WEIGHT = 0.05       # per non-lifecycle method
+LIFECYCLE_WEIGHT = 0.01      # per lifecycle method
+CONFIDENCE_WEIGHT = 2.0      # times (1 - confidence)
+UNMAPPED_WEIGHT = 0.3        # per unconverted signature type
+LOW_CONFIDENCE_PENALTY = 1.0
+
+# Types that never need a conversion rule
+_BUILTIN_TYPES = {'byte', 'short', 'char', 'Integer', 'Long', 'Boolean', 'Float', 'Double', 'List', 'Map',
+                  'Set', 'T', 'E', 'K', 'V', '?'}
+
+
+@dataclass
+class MappingJob:
+    spec: ApiSpec
+    mapping_type: str = 'direct'          # direct | semantic | bridge | shim
+    confidence: float = 1.0
+    unmapped_types: List[str] = field(default_factory=list)
+
+
+def load_class_rules(rules_path: Optional[str] = None) -> Dict[str, dict]:
+    """Android FQN -> rule dict with 'mapping_type' added; unsupported classes map to shims."""
+    path = rules_path or MAPPING_RULES_PATH
+    rules = {}
+    if yaml is not None and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            rules = yaml.safe_load(f) or {}
+    classes = {}
+    for section, mapping_type in _SECTION_TYPES.items():
+        for rule in rules.get(section) or []:
+            classes[rule['android']] = dict(rule, mapping_type=mapping_type)
+    for android in rules.get('unsupported') or []:
+        classes[android] = {'android': android, 'mapping_type': 'shim', 'confidence': 0.0}
+    return classes
+
+
+def find_rule(spec: ApiSpec, class_rules: Dict[str, dict]) -> Optional[dict]:
+    """Rule for the class itself or, for app subclasses, its direct parent."""
+    by_name = {android.rsplit('.', 1)[-1]: rule for android, rule in class_rules.items()}
+    parent = (spec.parent_class or '').split('<', 1)[0].strip()
+    return (class_rules.get(f'{spec.package}.{spec.class_name}') or by_name.get(spec.class_name)
+            or by_name.get(parent))
+
+
+def build_job(spec: ApiSpec, class_rules: Dict[str, dict],
+              conversions: Optional[Dict[str, str]] = None) -> MappingJob:
+    """Job for ``spec`` (see find_rule); classes with no rule become shims."""
+    rule = find_rule(spec, class_rules)
+    conversions = load_type_conversions() if conversions is None else conversions
+    known = set(TS_TYPE_MAP) | set(conversions) | _BUILTIN_TYPES
+    unmapped = sorted(t for t in referenced_types(spec) - known if not t.endswith('...'))
+    if rule is None:
+        return MappingJob(spec, 'shim', 0.5, unmapped)
+    return MappingJob(spec, rule['mapping_type'], float(rule.get('confidence', 1.0)), unmapped)
+
+
+def complexity_score(job: MappingJob, min_confidence: float = 0.7) -> float:
+    lifecycle = sum(1 for m in job.spec.methods if m.name in LIFECYCLE_MAPPING)
+    score = (TYPE_WEIGHT.get(job.mapping_type, TYPE_WEIGHT['shim'])
+             + LIFECYCLE_WEIGHT * lifecycle
+             + DELEGATE_WEIGHT * (len(job.spec.methods) - lifecycle)
+             + CONFIDENCE_WEIGHT * (1.0 - job.confidence)
+             + UNMAPPED_WEIGHT * len(job.unmapped_types))
+    if job.confidence < min_confidence:
+        score += LOW_CONFIDENCE_PENALTY
+    return score
+
+
+def balanced_java(code: str) -> bool:
+    """Default verification: a class declaration with balanced brackets."""
+    return 'class ' in code and scan(code, 'java').balanced
+
+
+@dataclass
+class RoutedResult:
+    text: str
+    tier: str
+    passed: bool
+    attempts: List[str] = field(default_factory=list)   # tiers tried, in order
+
+
+class ModelRouter:
+    """Score bands -> tiers; ``light_max`` and ``standard_max`` are the upper bounds."""
+
+    def __init__(self, config: Optional[AiConfig] = None, light_max: float = 0.8,
+                 standard_max: float = 2.0, min_confidence: float = 0.7):
+        self.config = config or AiConfig.load()
+        self.light_max = light_max
+        self.standard_max = standard_max
+        self.min_confidence = min_confidence
+        self.routed: Dict[str, int] = {tier: 0 for tier in TIERS}
+        self.escalations = 0
+
+    @classmethod
+    def from_config(cls, path: Optional[str] = None) -> 'ModelRouter':
+        """Router using the ai section and quality.min_confidence of craft_config.yaml."""
+        path = path or CONFIG_PATH
+        min_confidence = 0.7
+        if yaml is not None and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                quality = (yaml.safe_load(f) or {}).get('quality') or {}
+            min_confidence = quality.get('min_confidence', min_confidence)
+        return cls(AiConfig.load(path), min_confidence=min_confidence)
+
+    def tier_for(self, job: MappingJob) -> str:
+        score = complexity_score(job, self.min_confidence)
+        if score < self.light_max:
+            return 'light'
+        if score < self.standard_max:
+            return 'standard'
+        return 'advanced'
+
+    def model(self, tier: str) -> str:
+        return getattr(self.config, f'model_{tier}')
+
+    @staticmethod
+    def escalate(tier: str) -> Optional[str]:
+        index = TIERS.index(tier)
+        return TIERS[index + 1] if index + 1 < len(TIERS) else None
+
+    def generate(self, client: AiClient, job: MappingJob, prompt: str,
+                 verify: Callable[[str], bool] = balanced_java) -> RoutedResult:
+        """Complete on the routed tier, moving up one tier per failed verification."""
+        tier: Optional[str] = self.tier_for(job)
+        self.routed[tier] += 1
+        attempts = []
+        while True:
+            attempts.append(tier)
+            text = client.complete(prompt, model=self.model(tier)).text
+            if verify(text):
+                return RoutedResult(text, tier, True, attempts)
+            next_tier = self.escalate(tier)
+            if next_tier is None:
+                return RoutedResult(text, tier, False, attempts)
+            self.escalations += 1
+            tier = next_tier
+
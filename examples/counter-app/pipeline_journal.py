@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+CRAFT Pipeline Journal
+
+Append-only JSON-lines checkpoint of completed pipeline work: one line per
+(source, stage) carrying what that stage produced (parsed ApiSpec, chosen
+target, a content hash per generated file, written and verified files).
+Generated code itself is not journaled, so the file stays small. Lines are
+flushed as they are written, so a crash loses at most the item in flight; a
+torn last line is cut off before a resumed run appends to the file.
+
+On resume the journal is replayed: items whose last stage is recorded are
+skipped outright, partially processed items re-enter the pipeline with the
+recorded results restored, and anything whose source file changed since it
+was journaled starts over. Generated files that are missing or differ from
+their recorded hash send the item back to the generate stage.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from typing import Dict, Optional
+
+from sdk_model import ApiSpec, MethodSpec, ParameterSpec
+
+# Stage -> WorkItem attributes that stage produces
+STAGE_FIELDS = {
+    'parse': ('spec',),
+    'analyze': ('target',),
+    'generate': ('outputs',),
+    'write': ('written',),
+    'verify': ('verified',),
+}
+
+# Journaled field -> WorkItem attribute it is restored into. Code is not
+# journaled, so restored generate results are hashes, kept apart from outputs.
+RESTORED_FIELDS = {
+    'outputs': 'output_hashes',
+}
+
+
+def spec_from_dict(data: dict) -> ApiSpec:
+    methods = [MethodSpec(**dict(m, parameters=[ParameterSpec(**p) for p in m['parameters']]))
+               for m in data['methods']]
+    return ApiSpec(**dict(data, methods=methods))
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def source_fingerprint(path: str) -> Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class Journal:
+    """Append-only record of completed (source, stage) units."""
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        # source -> {'fingerprint': ..., 'stages': {stage: data}}
+        self.entries: Dict[str, dict] = {}
+        self.replayed = 0
+        if resume:
+            self._replay()
+            self._cut_torn_tail()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _replay(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn write from an interrupted run
+            entry = self.entries.setdefault(record['source'], {'fingerprint': None, 'stages': {}})
+            if record['stage'] == 'parse':
+                # A re-parse starts the item over
+                entry['fingerprint'] = record.get('fingerprint')
+                entry['stages'] = {}
+            entry['stages'][record['stage']] = record.get('data', {})
+            self.replayed += 1
+
+    def _cut_torn_tail(self):
+        """Drop a partial last line so the next record starts on a line of its own."""
+        try:
+            with open(self.path, 'rb+') as f:
+                data = f.read()
+                if data and not data.endswith(b'\n'):
+                    f.truncate(data.rfind(b'\n') + 1)
+        except OSError:
+            pass
+
+    def record(self, source: str, stage: str, item=None):
+        """Append one completed unit; ``item`` supplies the stage's outputs."""
+        data = {}
+        for name in STAGE_FIELDS.get(stage, ()):
+            value = getattr(item, name, None)
+            if isinstance(value, ApiSpec):
+                value = asdict(value)
+            elif name == 'outputs':
+                value = {path: content_hash(code) for path, code in (value or {}).items()}
+            data[name] = value
+        record = {'source': source, 'stage': stage, 'data': data}
+        entry = self.entries.setdefault(source, {'fingerprint': None, 'stages': {}})
+        if stage == 'parse':
+            record['fingerprint'] = entry['fingerprint'] = source_fingerprint(source)
+            entry['stages'] = {}
+        entry['stages'][stage] = data
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def completed(self, source: str) -> Dict[str, dict]:
+        """Recorded stages for ``source``, or {} if its file changed since."""
+        entry = self.entries.get(source)
+        if not entry or entry['fingerprint'] != source_fingerprint(source):
+            return {}
+        return entry['stages']
+
+    @staticmethod
+    def outputs_intact(outputs: Dict[str, str], out_dir: str) -> bool:
+        """True if every journaled output exists under ``out_dir`` with its recorded hash."""
+        for rel_path, digest in outputs.items():
+            try:
+                with open(os.path.join(out_dir, rel_path), 'r', encoding='utf-8') as f:
+                    if content_hash(f.read()) != digest:
+                        return False
+            except OSError:
+                return False
+        return True
+
+    def restore(self, item, stages, out_dir: Optional[str] = None) -> int:
+        """
+        Apply recorded results to ``item`` for the leading run of ``stages``
+        that completed; returns how many stages were restored. The generate
+        stage (whose code is not journaled) counts only once its outputs were
+        written and, with ``out_dir``, are still on disk unchanged; its
+        content hashes go to ``item.output_hashes``, never ``item.outputs``.
+        """
+        completed = self.completed(item.source)
+        restored = 0
+        for stage in stages:
+            if stage not in completed:
+                break
+            if stage == 'generate':
+                outputs = completed[stage].get('outputs') or {}
+                if 'write' not in completed or (out_dir is not None and not self.outputs_intact(outputs, out_dir)):
+                    break
+            for name, value in completed[stage].items():
+                setattr(item, RESTORED_FIELDS.get(name, name),
+                        spec_from_dict(value) if name == 'spec' and value else value)
+            restored += 1
+        return restored
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> 'Journal':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
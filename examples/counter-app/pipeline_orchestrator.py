@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+CRAFT Pipeline Orchestrator
+
+Python counterpart of the Rust PipelineOrchestrator: parse -> analyze ->
+generate -> write -> verify over a set of Android sources in one process.
+Stages are connected by bounded queues of pipeline.batch_size items, so each
+class flows on as soon as it is ready, a slow stage throttles the ones
+upstream, and memory is bounded by queue capacity rather than corpus size.
+CPU-bound stages run in a process pool, file I/O in threads; each stage
+keeps up to pipeline.parallel_workers items in flight. Every stage call gets
+pipeline.timeout_seconds and, for transient failures (timeouts, connection
+errors, a broken worker pool), up to pipeline.max_retries retries; an item
+that fails is recorded and dropped, not fatal. Sources without a public
+top-level class are skipped at the parse stage. With a Journal, every
+completed stage is checkpointed and --resume skips work already done.
+
+Usage:
+    python3 pipeline_orchestrator.py SRC [SRC ...] [-o OUT] [--config craft_config.yaml] [--resume]
+"""
+
+import argparse
+import asyncio
+import functools
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from change_impact import adapter_outputs
+from class_hierarchy import fqn
+from model_router import load_class_rules
+from pipeline_journal import Journal
+from sdk_model import CONFIG_PATH, AdapterGenerator, ApiSpec, JavaParser
+from verify_code import GENERATED_ADAPTER_TYPES, verify_path
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional; fall back to the defaults below
+    yaml = None
+
+
+@dataclass
+class PipelineConfig:
+    """The ``pipeline`` section of craft_config.yaml."""
+    batch_size: int = 100
+    parallel_workers: int = 10
+    max_retries: int = 3
+    timeout_seconds: float = 300
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'PipelineConfig':
+        path = path or CONFIG_PATH
+        if yaml is None or not os.path.exists(path):
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            section = (yaml.safe_load(f) or {}).get('pipeline') or {}
+        known = {name: section[name] for name in cls.__dataclass_fields__ if name in section}
+        return cls(**known)
+
+
+@dataclass
+class WorkItem:
+    """One source class travelling through the stages."""
+    source: str
+    spec: Optional[ApiSpec] = None
+    target: Optional[str] = None
+    outputs: Dict[str, str] = field(default_factory=dict)   # relative path -> code
+    output_hashes: Dict[str, str] = field(default_factory=dict)   # relative path -> hash, restored from the journal
+    written: List[str] = field(default_factory=list)
+    verified: Dict[str, bool] = field(default_factory=dict)
+    restored: int = 0   # leading stages whose results came from the journal
+
+    @property
+    def output_paths(self) -> List[str]:
+        """Generated files, whether produced in this run or restored from the journal."""
+        return list(self.outputs or self.output_hashes)
+
+    @property
+    def passed(self) -> bool:
+        return bool(self.verified) and all(self.verified.values())
+
+
+@dataclass
+class PipelineStats:
+    total: int = 0
+    successful: int = 0
+    failed: int = 0
+    skipped: int = 0
+    resumed: int = 0                                        # finished in an earlier run
+    retries: int = 0
+    timeouts: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)    # source -> last error
+    stage_seconds: Dict[str, float] = field(default_factory=dict)  # busy time per stage
+    queues: Dict[str, dict] = field(default_factory=dict)   # final queue metrics
+    first_output_seconds: Optional[float] = None            # start -> first file written
+    wall_seconds: float = 0.0
+
+# ============================================================================
+# Stages (module-level so they can be sent to worker processes)
+# ============================================================================
+
+def load_class_targets(rules_path: Optional[str] = None) -> Dict[str, str]:
+    """Android class (FQN and simple name) -> HarmonyOS class simple name."""
+    targets = {}
+    for android, rule in load_class_rules(rules_path).items():
+        if not rule.get('harmony'):
+            continue   # unsupported: no target class
+        harmony = rule['harmony'].rsplit('.', 1)[-1]
+        targets[android] = harmony
+        targets.setdefault(android.rsplit('.', 1)[-1], harmony)
+    return targets
+
+
+# Failures worth another attempt; anything else (a missing file, a parse bug) fails the item at once
+TRANSIENT_ERRORS = (TimeoutError, ConnectionError, BrokenProcessPool)
+
+
+def parse_item(item: WorkItem) -> WorkItem:
+    """spec stays None for files without a public top-level class (package-info.java etc.)."""
+    item.spec = JavaParser().parse_file(item.source)
+    return item
+
+
+def analyze_item(item: WorkItem, targets: Dict[str, str]) -> WorkItem:
+    """Pick the HarmonyOS target from the class itself or its direct parent."""
+    spec = item.spec
+    parent = (spec.parent_class or '').split('<', 1)[0].strip()
+    item.target = targets.get(fqn(spec)) or targets.get(spec.class_name) or targets.get(parent)
+    return item
+
+
+def generate_item(item: WorkItem) -> WorkItem:
+    generator = AdapterGenerator()
+    for rel_path, language in adapter_outputs(item.spec).items():
+        rel_path = os.path.join('adapters', rel_path)
+        if language == 'java':
+            item.outputs[rel_path] = generator.generate_java(item.spec, item.target)
+        else:
+            item.outputs[rel_path] = generator.generate_arkts(item.spec, item.target)
+    return item
+
+
+def write_item(item: WorkItem, out_dir: str) -> WorkItem:
+    """Write outputs, leaving files whose content is unchanged untouched."""
+    for rel_path, code in item.outputs.items():
+        path = os.path.join(out_dir, rel_path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if f.read() == code:
+                    continue
+        except OSError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(code)
+        item.written.append(rel_path)
+    return item
+
+
+def verify_item(item: WorkItem, out_dir: str) -> WorkItem:
+    """Check each written adapter against the generated-adapter check set for its language."""
+    for rel_path in item.output_paths:
+        path = os.path.join(out_dir, rel_path)
+        file_type = GENERATED_ADAPTER_TYPES.get(os.path.splitext(rel_path)[1])
+        if file_type:
+            item.verified[rel_path] = verify_path(path, file_type)["passed"]
+    return item
+
+# ============================================================================
+# Orchestrator
+# ============================================================================
+
+# Queue sentinel: one per downstream worker when a stage has finished
+_DONE = object()
+
+
+class StageQueue:
+    """Bounded hand-off into a stage; put() blocks while full (backpressure)."""
+
+    def __init__(self, name: str, capacity: int):
+        self.name = name
+        self.capacity = capacity
+        self._queue: asyncio.Queue = asyncio.Queue(capacity)
+        self.peak = 0
+        self.items = 0
+        self.blocked_seconds = 0.0  # producers' time spent waiting for space
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    async def put(self, item):
+        if self._queue.full():
+            start = time.perf_counter()
+            await self._queue.put(item)
+            self.blocked_seconds += time.perf_counter() - start
+        else:
+            self._queue.put_nowait(item)
+        if item is not _DONE:
+            self.items += 1
+            self.peak = max(self.peak, self._queue.qsize())
+
+    async def get(self):
+        return await self._queue.get()
+
+    def metrics(self) -> dict:
+        return {"depth": self.depth, "capacity": self.capacity, "peak": self.peak,
+                "items": self.items, "blocked_seconds": round(self.blocked_seconds, 3)}
+
+
+class PipelineOrchestrator:
+    """Streams items through the stages with bounded queues, timeouts and retries."""
+
+    def __init__(self, config: Optional[PipelineConfig] = None, out_dir: str = "output",
+                 executor: Optional[Executor] = None, rules_path: Optional[str] = None,
+                 journal: Optional[Journal] = None):
+        self.config = config or PipelineConfig.load()
+        self.out_dir = out_dir
+        self.executor = executor
+        self.journal = journal
+        self.targets = load_class_targets(rules_path)
+        self.stats = PipelineStats()
+        self.queues: Dict[str, StageQueue] = {}
+        self._start = 0.0
+
+    def stages(self) -> List[Tuple[str, Callable[[WorkItem], WorkItem], bool]]:
+        """(name, fn, cpu-bound) in pipeline order."""
+        return [
+            ('parse', parse_item, True),
+            ('analyze', functools.partial(analyze_item, targets=self.targets), True),
+            ('generate', generate_item, True),
+            ('write', functools.partial(write_item, out_dir=self.out_dir), False),
+            ('verify', functools.partial(verify_item, out_dir=self.out_dir), True),
+        ]
+
+    def metrics(self) -> Dict[str, dict]:
+        """Live queue metrics keyed by the stage each queue feeds."""
+        return {name: queue.metrics() for name, queue in self.queues.items()}
+
+    async def call(self, fn: Callable[[WorkItem], WorkItem], item: WorkItem, cpu: bool = True) -> WorkItem:
+        """
+        Run ``fn(item)`` in the process pool (cpu) or a thread (I/O). A
+        timed-out call is abandoned, not killed: the worker finishes it in
+        the background and its result is discarded.
+        """
+        loop = asyncio.get_running_loop()
+        error: Optional[BaseException] = None
+        for attempt in range(self.config.max_retries + 1):
+            if attempt:
+                self.stats.retries += 1
+            future = loop.run_in_executor(self.executor if cpu else None, fn, item)
+            try:
+                return await asyncio.wait_for(future, self.config.timeout_seconds)
+            except asyncio.TimeoutError:
+                self.stats.timeouts += 1
+                error = TimeoutError(f"{getattr(fn, '__name__', 'stage')} exceeded "
+                                     f"{self.config.timeout_seconds}s")
+            except TRANSIENT_ERRORS as e:
+                error = e
+        raise error
+
+    async def run(self, sources: Iterable[str]) -> PipelineStats:
+        stages = self.stages()
+        capacity = max(1, self.config.batch_size)
+        self.queues = {name: StageQueue(name, capacity) for name, _, _ in stages}
+        inboxes = list(self.queues.values())
+        self._start = time.perf_counter()
+
+        names = [name for name, _, _ in stages]
+        tasks = [asyncio.ensure_future(self._feed(sources, inboxes[0], names))]
+        for index, (name, fn, cpu) in enumerate(stages):
+            outbox = inboxes[index + 1] if index + 1 < len(inboxes) else None
+            tasks.append(asyncio.ensure_future(self._stage(index, name, fn, cpu, inboxes[index], outbox)))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        self.stats.queues = self.metrics()
+        self.stats.wall_seconds = round(time.perf_counter() - self._start, 3)
+        return self.stats
+
+    async def _feed(self, sources: Iterable[str], inbox: StageQueue, names: List[str]):
+        for source in sources:
+            self.stats.total += 1
+            item = WorkItem(str(source))
+            if self.journal is not None:
+                item.restored = self.journal.restore(item, names, self.out_dir)
+                if item.restored == len(names):
+                    self.stats.resumed += 1
+                    for index, name in enumerate(names):
+                        if not self._route(index, name, item):
+                            break
+                    continue
+            await inbox.put(item)
+        for _ in range(self.config.parallel_workers):
+            await inbox.put(_DONE)
+
+    async def _stage(self, index: int, name: str, fn: Callable[[WorkItem], WorkItem], cpu: bool,
+                     inbox: StageQueue, outbox: Optional[StageQueue]):
+        self.stats.stage_seconds.setdefault(name, 0.0)
+
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                if index >= item.restored:
+                    start = time.perf_counter()
+                    try:
+                        item = await self.call(fn, item, cpu)
+                    except Exception as e:
+                        self.stats.failed += 1
+                        self.stats.errors[item.source] = f"{name}: {e}"
+                        continue
+                    finally:
+                        self.stats.stage_seconds[name] += time.perf_counter() - start
+                    if self.journal is not None:
+                        self.journal.record(item.source, name, item)
+                if not self._route(index, name, item):
+                    continue
+                if outbox is not None:
+                    await outbox.put(item)
+
+        await asyncio.gather(*(worker() for _ in range(self.config.parallel_workers)))
+        self.stats.stage_seconds[name] = round(self.stats.stage_seconds[name], 3)
+        if outbox is not None:
+            for _ in range(self.config.parallel_workers):
+                await outbox.put(_DONE)
+
+    def _route(self, index: int, name: str, item: WorkItem) -> bool:
+        """Bookkeeping after a stage (run or restored); False stops the item here."""
+        if (name == 'parse' and item.spec is None) or (name == 'analyze' and not item.target):
+            self.stats.skipped += 1
+            return False
+        if (name == 'write' and item.written and index >= item.restored
+                and self.stats.first_output_seconds is None):
+            self.stats.first_output_seconds = round(time.perf_counter() - self._start, 3)
+        if name == 'verify':
+            if item.passed:
+                self.stats.successful += 1
+            else:
+                self.stats.failed += 1
+                self.stats.errors[item.source] = "verify: " + ", ".join(
+                    path for path, ok in item.verified.items() if not ok)
+        return True
+
+
+def discover_sources(paths: Iterable[str]) -> Iterator[str]:
+    """Expand directories to the .java files below them, lazily, in sorted order."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.endswith('.java'):
+                    yield os.path.join(dirpath, name)
+
+
+JOURNAL_NAME = ".craft-journal.jsonl"
+
+
+def run_pipeline(sources: Iterable[str], out_dir: str, config: Optional[PipelineConfig] = None,
+                 journal_path: Optional[str] = None, resume: bool = False) -> PipelineStats:
+    """
+    Run the whole pipeline with a process pool of ``parallel_workers``,
+    checkpointing to ``journal_path`` (default: OUT/.craft-journal.jsonl).
+    """
+    config = config or PipelineConfig.load()
+    journal_path = journal_path or os.path.join(out_dir, JOURNAL_NAME)
+    with Journal(journal_path, resume) as journal, \
+            ProcessPoolExecutor(max_workers=config.parallel_workers) as pool:
+        orchestrator = PipelineOrchestrator(config, out_dir, pool, journal=journal)
+        return asyncio.run(orchestrator.run(sources))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run parse -> analyze -> generate -> write -> verify")
+    parser.add_argument('sources', nargs='+', help=".java files or directories")
+    parser.add_argument('-o', '--output', default='output')
+    parser.add_argument('--config', default=None, help="craft_config.yaml (pipeline section)")
+    parser.add_argument('--journal', default=None, help=f"checkpoint journal (default: OUT/{JOURNAL_NAME})")
+    parser.add_argument('--resume', action='store_true', help="skip work recorded in the journal")
+    args = parser.parse_args(argv)
+
+    stats = run_pipeline(discover_sources(args.sources), args.output, PipelineConfig.load(args.config),
+                         args.journal, args.resume)
+    for source, error in sorted(stats.errors.items()):
+        print(f"FAIL {source}: {error}")
+    print(f"{stats.total} sources: {stats.successful} ok, {stats.failed} failed, "
+          f"{stats.skipped} unmapped, {stats.resumed} resumed "
+          f"({stats.retries} retries, {stats.timeouts} timeouts)")
+    if stats.first_output_seconds is not None:
+        print(f"first output after {stats.first_output_seconds:.3f}s, total {stats.wall_seconds:.3f}s")
+    for name, seconds in stats.stage_seconds.items():
+        queue = stats.queues.get(name, {})
+        print(f"  {name:<9} busy {seconds:.3f}s  queue peak {queue.get('peak', 0)}/{queue.get('capacity', 0)}"
+              f"  blocked {queue.get('blocked_seconds', 0.0):.3f}s")
+    return 1 if stats.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+CRAFT Prompt Packing
+
+At a fixed requests-per-minute quota, request count is the throughput
+ceiling, and most Android classes have only a handful of methods. This
+module packs several small ApiSpecs into one adapter-generation prompt,
+sized so the expected combined answer fits under ai.max_tokens, asks for
+each adapter between BEGIN/END markers, and splits the response back into
+per-class outputs. Classes missing from (or malformed in) a packed
+response are retried with individual requests.
+
+With a PromptRenderer, single requests use its full template and each
+packed section is built from the same per-class context (target class,
+mapping type, method mappings, target methods), so a class gets the same
+information whether it is packed or not.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ai_client import AiClient, estimate_tokens
+from class_hierarchy import fqn
+from prompt_renderer import PromptRenderer, stamp_generated
+from sdk_model import ApiSpec
+
+# Expected answer size: fixed class scaffolding plus a per-method delegate
+OUTPUT_TOKENS_BASE = 150
+OUTPUT_TOKENS_PER_METHOD = 60
+# Share of ai.max_tokens a packed answer may be expected to use
+OUTPUT_HEADROOM = 0.75
+# Classes above this many methods always get their own request
+MAX_PACKED_METHODS = 12
+
+_BLOCK = re.compile(r'^=== BEGIN (?P<name>[\w.$]+) ===[ \t]*\n(?P<body>.*?)^=== END (?P=name) ===[ \t]*$',
+                    re.MULTILINE | re.DOTALL)
+_FENCE = re.compile(r'^\s*```[\w-]*\s*\n(.*?)\n\s*```\s*$', re.DOTALL)
+
+
+def describe_spec(spec: ApiSpec) -> str:
+    """Plain-text class description used inside prompts."""
+    lines = [f"Class: {spec.class_name}", f"Package: {spec.package}", f"Full Name: {fqn(spec)}"]
+    if spec.parent_class:
+        lines.append(f"Extends: {spec.parent_class}")
+    lines.append("Methods:")
+    for method in spec.methods:
+        params = ", ".join(f"{p.param_type} {p.name}" for p in method.parameters)
+        modifiers = " ".join(method.modifiers)
+        lines.append(f"- {modifiers + ' ' if modifiers else ''}{method.return_type} {method.name}({params})")
+    return "\n".join(lines)
+
+
+def describe_context(context: Dict[str, Any]) -> str:
+    """Class description from a PromptRenderer context, for packed prompts."""
+    lines = [f"Class: {context['android_class']}", f"Package: {context['android_package']}",
+             f"Full Name: {context['android_full_name']}", "Methods:"]
+    lines += [f"- {m['signature']}" for m in context['android_methods']]
+    lines.append(f"Adapter: {context['adapter_package']}.{context['adapter_class']}")
+    if context['harmony_full_name']:
+        lines.append(f"Target: {context['harmony_full_name']}")
+    lines.append(f"Mapping Type: {context['mapping_type']}")
+    if context['method_mappings']:
+        lines.append("Method Mappings:")
+        lines += [f"- {m['android_method']} -> {m['harmony_method']}" for m in context['method_mappings']]
+    if context['harmony_methods']:
+        lines.append("Target Methods:")
+        lines += [f"- {m['signature']}" for m in context['harmony_methods']]
+    return "\n".join(lines)
+
+
+def adapter_prompt(spec: ApiSpec) -> str:
+    """Single-class request."""
+    return ("Generate a Java adapter class that extends the Android class below and "
+            "delegates to its HarmonyOS equivalent. Output only the Java code.\n\n"
+            f"```\n{describe_spec(spec)}\n```\n")
+
+
+def packed_prompt(specs: Sequence[ApiSpec], describe: Callable[[ApiSpec], str] = describe_spec) -> str:
+    """Multi-class request; each adapter must come back between its own markers."""
+    parts = [
+        "Generate one Java adapter class for EACH Android class below. Each adapter "
+        "extends its Android class and delegates to the HarmonyOS equivalent.",
+        "Wrap every adapter exactly like this, one block per class, nothing else:",
+        "=== BEGIN <Full Name> ===\n<java code>\n=== END <Full Name> ===",
+    ]
+    for spec in specs:
+        parts.append(f"```\n{describe(spec)}\n```")
+    return "\n\n".join(parts) + "\n"
+
+
+def expected_output_tokens(spec: ApiSpec) -> int:
+    return OUTPUT_TOKENS_BASE + OUTPUT_TOKENS_PER_METHOD * len(spec.methods)
+
+
+def pack_specs(specs: Sequence[ApiSpec], max_tokens: int, input_budget: Optional[int] = None,
+               describe: Callable[[ApiSpec], str] = describe_spec) -> List[List[ApiSpec]]:
+    """
+    Packs classes in package / name order without mixing packages: a pack is
+    closed when the next class would push its expected answer over
+    ``max_tokens * OUTPUT_HEADROOM`` or, with ``input_budget``, its class
+    descriptions over that many tokens. Membership depends only on a class's
+    neighbours in its own package, so changing one class leaves every other
+    package's packs (and their prompts) untouched. Large classes are packed alone.
+    """
+    output_budget = max_tokens * OUTPUT_HEADROOM
+    packs: List[List[ApiSpec]] = []
+    current: List[ApiSpec] = []
+    used_out = used_in = 0
+    for spec in sorted(specs, key=lambda s: (s.package, fqn(s))):
+        out = expected_output_tokens(spec)
+        if len(spec.methods) > MAX_PACKED_METHODS or out > output_budget:
+            packs.append([spec])
+            continue
+        inp = estimate_tokens(describe(spec))
+        if current and (spec.package != current[0].package or used_out + out > output_budget
+                        or (input_budget is not None and used_in + inp > input_budget)):
+            packs.append(current)
+            current, used_out, used_in = [], 0, 0
+        current.append(spec)
+        used_out += out
+        used_in += inp
+    if current:
+        packs.append(current)
+    packs.sort(key=lambda p: (p[0].package, fqn(p[0])))
+    return packs
+
+
+def split_response(text: str, names: Sequence[str]) -> Dict[str, str]:
+    """Per-class code from a packed response; classes not found are omitted."""
+    wanted = set(names)
+    result = {}
+    for match in _BLOCK.finditer(text):
+        name = match.group('name')
+        body = match.group('body').strip('\n')
+        fenced = _FENCE.match(body)
+        if fenced:
+            body = fenced.group(1)
+        if name in wanted and body.strip() and name not in result:
+            result[name] = body.strip('\n') + '\n'
+    return result
+
+
+@dataclass
+class PackingStats:
+    classes: int = 0
+    requests: int = 0
+    packed_requests: int = 0
+    fallbacks: int = 0
+
+
+class PackedGenerator:
+    """Generates adapters for many classes with as few requests as possible."""
+
+    def __init__(self, client: AiClient, max_tokens: Optional[int] = None,
+                 single_prompt: Optional[Callable[[ApiSpec], str]] = None,
+                 input_budget: Optional[int] = None, renderer: Optional[PromptRenderer] = None):
+        self.client = client
+        self.max_tokens = max_tokens or client.config.max_tokens
+        self.single_prompt = single_prompt or renderer or adapter_prompt
+        self.describe = (lambda spec: describe_context(renderer.context(spec))) if renderer else describe_spec
+        self.input_budget = input_budget
+        self.stats = PackingStats()
+
+    def generate(self, specs: Sequence[ApiSpec]) -> Dict[str, str]:
+        """FQN -> adapter code, with the generation date stamped into its header."""
+        results: Dict[str, str] = {}
+        self.stats.classes += len(specs)
+        for pack in pack_specs(specs, self.max_tokens, self.input_budget, self.describe):
+            if len(pack) == 1:
+                results[fqn(pack[0])] = self._single(pack[0])
+                continue
+            self.stats.requests += 1
+            self.stats.packed_requests += 1
+            response = self.client.complete(packed_prompt(pack, self.describe), max_tokens=self.max_tokens)
+            parts = split_response(response.text, [fqn(spec) for spec in pack])
+            for spec in pack:
+                name = fqn(spec)
+                if name in parts:
+                    results[name] = parts[name]
+                else:
+                    self.stats.fallbacks += 1
+                    results[name] = self._single(spec)
+        return {name: stamp_generated(code) for name, code in results.items()}
+
+    def _single(self, spec: ApiSpec) -> str:
+        self.stats.requests += 1
+        return self.client.complete(self.single_prompt(spec), max_tokens=self.max_tokens).text
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+CRAFT Prompt Renderer
+
+Renders templates/prompts/generate_adapter.md. The template uses a small
+Jinja subset: ``{{ a.b }}``, ``{{ a | join(', ') }}``, ``{% for x in xs %}``
+(with ``loop.index`` / ``loop.first`` / ``loop.last``) and ``{% if [not] a %}``
+/ ``{% else %}``. A template is compiled once into a tree of closures and
+cached per file; a tag alone on its line leaves no blank line behind.
+
+The rendered prompt is measured with ai_client.estimate_tokens. Over
+ai.prompt_budget, context is trimmed in order: doc comments first, then
+target methods no Android method maps to. Android methods are never dropped.
+With a context_retrieval.MethodRetriever, the target section lists only the
+top-k retrieved methods per Android method, from any target class.
+
+The header's ``Generated:`` line is rendered as GENERATED_AT_MARK, never as
+a date, so a prompt depends only on its inputs; stamp_generated() fills the
+date into the code the model returns.
+"""
+
+import datetime
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ai_client import AiConfig, estimate_tokens
+from class_hierarchy import fqn
+from context_retrieval import DEFAULT_TOP_K, MethodRetriever
+from ets_scanner import TargetIndex
+from model_router import find_rule, load_class_rules
+from sdk_model import CONFIG_PATH, LIFECYCLE_MAPPING, MAPPING_RULES_PATH, REPO_ROOT, ApiSpec, MethodSpec
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional; fall back to the defaults below
+    yaml = None
+
+TEMPLATE_PATH = str(REPO_ROOT / "templates" / "prompts" / "generate_adapter.md")
+DEFAULT_VERSION = "1.0.0"
+GENERATED_AT_MARK = "<generated-at>"
+
+_TAG = re.compile(r'{{(?P<expr>.*?)}}|{%(?P<stmt>.*?)%}', re.DOTALL)
+_STANDALONE = re.compile(r'^[ \t]*({%.*?%})[ \t]*\n', re.MULTILINE)
+_PATH = re.compile(r'^[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*$')
+_JOIN = re.compile(r'''^join\(\s*(?:'(?P<single>[^']*)'|"(?P<double>[^"]*)")\s*\)$''')
+_FOR = re.compile(r'^for\s+(?P<var>[A-Za-z_]\w*)\s+in\s+(?P<expr>\S+)$')
+_IF = re.compile(r'^if\s+(?P<negate>not\s+)?(?P<expr>\S+)$')
+
+Render = Callable[[Dict[str, Any], List[str]], None]
+
+# ============================================================================
+# Template compiler
+# ============================================================================
+
+
+class TemplateError(ValueError):
+    """Unsupported or malformed template syntax."""
+
+
+@dataclass
+class _Loop:
+    index0: int
+    length: int
+
+    @property
+    def index(self) -> int:
+        return self.index0 + 1
+
+    @property
+    def first(self) -> bool:
+        return self.index0 == 0
+
+    @property
+    def last(self) -> bool:
+        return self.index0 == self.length - 1
+
+
+def _lookup(path: str) -> Callable[[Dict[str, Any]], Any]:
+    if not _PATH.match(path):
+        raise TemplateError(f"unsupported expression: {path!r}")
+    head, *rest = path.split('.')
+
+    def get(scope: Dict[str, Any]) -> Any:
+        value = scope.get(head)
+        for name in rest:
+            if value is None:
+                return None
+            value = value.get(name) if isinstance(value, dict) else getattr(value, name, None)
+        return value
+    return get
+
+
+def _text(value: Any) -> str:
+    return '' if value is None else str(value)
+
+
+def _compile_expr(expr: str) -> Callable[[Dict[str, Any]], str]:
+    path, *filters = [part.strip() for part in expr.split('|')]
+    get = _lookup(path)
+    if not filters:
+        return lambda scope: _text(get(scope))
+    join = _JOIN.match(filters[0]) if len(filters) == 1 else None
+    if join is None:
+        raise TemplateError(f"unsupported filter in {expr.strip()!r}")
+    sep = join.group('single') if join.group('single') is not None else join.group('double')
+    return lambda scope: sep.join(_text(v) for v in get(scope) or ())
+
+
+class Template:
+    """A template compiled once; render() walks the closure tree."""
+
+    def __init__(self, source: str, name: str = '<template>'):
+        self.name = name
+        self._tokens = self._tokenize(_STANDALONE.sub(r'\1', source))
+        self._pos = 0
+        body, end = self._block(())
+        if end is not None:
+            raise TemplateError(f"{name}: unexpected {{% {end} %}}")
+        self._body = body
+        del self._tokens
+
+    @staticmethod
+    def _tokenize(source: str) -> List[Tuple[str, str]]:
+        tokens, pos = [], 0
+        for match in _TAG.finditer(source):
+            if match.start() > pos:
+                tokens.append(('text', source[pos:match.start()]))
+            if match.group('expr') is not None:
+                tokens.append(('expr', match.group('expr')))
+            else:
+                tokens.append(('stmt', match.group('stmt').strip()))
+            pos = match.end()
+        if pos < len(source):
+            tokens.append(('text', source[pos:]))
+        return tokens
+
+    def _block(self, ends: Sequence[str]) -> Tuple[List[Render], Optional[str]]:
+        """Compile nodes up to one of ``ends``; returns (nodes, end tag or None at EOF)."""
+        nodes: List[Render] = []
+        while self._pos < len(self._tokens):
+            kind, value = self._tokens[self._pos]
+            self._pos += 1
+            if kind == 'text':
+                nodes.append(lambda scope, out, text=value: out.append(text))
+            elif kind == 'expr':
+                nodes.append(lambda scope, out, get=_compile_expr(value): out.append(get(scope)))
+            elif value in ends:
+                return nodes, value
+            elif value.startswith('for '):
+                nodes.append(self._for(value))
+            elif value.startswith('if '):
+                nodes.append(self._if(value))
+            else:
+                raise TemplateError(f"{self.name}: unexpected {{% {value} %}}")
+        if ends:
+            raise TemplateError(f"{self.name}: missing {{% {ends[-1]} %}}")
+        return nodes, None
+
+    def _for(self, stmt: str) -> Render:
+        match = _FOR.match(stmt)
+        if match is None:
+            raise TemplateError(f"{self.name}: malformed {{% {stmt} %}}")
+        var, items = match.group('var'), _lookup(match.group('expr'))
+        body, _ = self._block(('endfor',))
+
+        def render(scope: Dict[str, Any], out: List[str]):
+            values = list(items(scope) or ())
+            inner = dict(scope)
+            for index, value in enumerate(values):
+                inner[var], inner['loop'] = value, _Loop(index, len(values))
+                for node in body:
+                    node(inner, out)
+        return render
+
+    def _if(self, stmt: str) -> Render:
+        match = _IF.match(stmt)
+        if match is None:
+            raise TemplateError(f"{self.name}: malformed {{% {stmt} %}}")
+        negate, test = bool(match.group('negate')), _lookup(match.group('expr'))
+        then, end = self._block(('else', 'endif'))
+        otherwise = self._block(('endif',))[0] if end == 'else' else []
+
+        def render(scope: Dict[str, Any], out: List[str]):
+            for node in (then if bool(test(scope)) != negate else otherwise):
+                node(scope, out)
+        return render
+
+    def render(self, context: Optional[Dict[str, Any]] = None, **values) -> str:
+        scope = dict(context or {}, **values)
+        out: List[str] = []
+        for node in self._body:
+            node(scope, out)
+        return ''.join(out)
+
+
+_TEMPLATES: Dict[str, Tuple[float, Template]] = {}
+
+
+def load_template(path: Optional[str] = None) -> Template:
+    """Compiled template for ``path``; recompiled only when the file changes."""
+    path = os.path.abspath(path or TEMPLATE_PATH)
+    mtime = os.path.getmtime(path)
+    cached = _TEMPLATES.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'r', encoding='utf-8') as f:
+            cached = (mtime, Template(f.read(), name=os.path.basename(path)))
+        _TEMPLATES[path] = cached
+    return cached[1]
+
+# ============================================================================
+# Adapter prompt context
+# ============================================================================
+
+
+def load_method_mappings(rules_path: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+    """Android class FQN -> {Android method: HarmonyOS method}, from method_mappings."""
+    path = rules_path or MAPPING_RULES_PATH
+    if yaml is None or not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = yaml.safe_load(f) or {}
+    return {
+        cls: {name: rule['harmony_method'] for name, rule in (methods or {}).items()
+              if isinstance(rule, dict) and rule.get('harmony_method')}
+        for cls, methods in (rules.get('method_mappings') or {}).items()
+    }
+
+
+def method_context(method: MethodSpec, platform: str = 'Android') -> Dict[str, Any]:
+    params = [{'type': p.param_type, 'name': p.name} for p in method.parameters]
+    if platform == 'Android':
+        modifiers = ' '.join(method.modifiers)
+        args = ', '.join(f"{p['type']} {p['name']}" for p in params)
+        signature = f"{modifiers + ' ' if modifiers else ''}{method.return_type} {method.name}({args})"
+    else:
+        args = ', '.join(f"{p['name']}: {p['type']}" for p in params)
+        signature = f"{method.name}({args}): {method.return_type}"
+    return {'name': method.name, 'signature': signature, 'parameters': params,
+            'return_type': method.return_type, 'throws': [], 'doc': method.doc_comment}
+
+
+def _split_name(name: str) -> Tuple[str, str]:
+    package, _, simple = name.rpartition('.')
+    return package, simple
+
+
+def stamp_generated(code: str, generated_at: Optional[str] = None) -> str:
+    """Replace GENERATED_AT_MARK in generated code with ``generated_at`` (default: today)."""
+    return code.replace(GENERATED_AT_MARK, generated_at or datetime.date.today().isoformat())
+
+
+@dataclass
+class RenderedPrompt:
+    text: str
+    tokens: int
+    budget: int
+    trimmed: List[str] = field(default_factory=list)   # trim steps applied, in order
+
+    @property
+    def fits(self) -> bool:
+        return self.tokens <= self.budget
+
+
+class PromptRenderer:
+    """Adapter prompts for ApiSpecs, kept under a token budget."""
+
+    def __init__(self, template_path: Optional[str] = None, targets: Optional[TargetIndex] = None,
+                 rules_path: Optional[str] = None, budget: Optional[int] = None,
+                 version: Optional[str] = None,
+                 retriever: Optional[MethodRetriever] = None, top_k: int = DEFAULT_TOP_K):
+        self.template = load_template(template_path)
+        self.targets = targets or TargetIndex()
+        self.retriever = retriever
+        self.top_k = top_k
+        self.class_rules = load_class_rules(rules_path)
+        self.method_mappings = load_method_mappings(rules_path)
+        self.budget = budget or AiConfig.load().prompt_budget
+        self.version = version or self._config_version()
+
+    @staticmethod
+    def _config_version() -> str:
+        if yaml is None or not os.path.exists(CONFIG_PATH):
+            return DEFAULT_VERSION
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            return str((yaml.safe_load(f) or {}).get('version') or DEFAULT_VERSION)
+
+    def context(self, spec: ApiSpec) -> Dict[str, Any]:
+        """Template variables for ``spec``, with every doc comment and target method."""
+        rule = find_rule(spec, self.class_rules) or {}
+        harmony_name = rule.get('harmony') or ''
+        target = self.targets.get(harmony_name) or self.targets.get(_split_name(harmony_name)[1])
+        if target is not None:
+            harmony_package, harmony_class = target.package, target.class_name
+            harmony_name = f'{harmony_package}.{harmony_class}'
+        else:
+            harmony_package, harmony_class = _split_name(harmony_name)
+
+        rule_methods = self.method_mappings.get(rule.get('android', ''), {})
+        mappings = []
+        for method in spec.methods:
+            harmony = rule_methods.get(method.name) or LIFECYCLE_MAPPING.get(method.name, (None,))[0]
+            if harmony and all(m['android_method'] != method.name for m in mappings):
+                mappings.append({'android_method': method.name, 'harmony_method': harmony})
+
+        adapter_class = f'{spec.class_name}Adapter'
+        return {
+            'android_class': spec.class_name,
+            'android_package': spec.package,
+            'android_full_name': fqn(spec),
+            'android_methods': [method_context(m) for m in spec.methods],
+            'harmony_class': harmony_class,
+            'harmony_package': harmony_package,
+            'harmony_full_name': harmony_name,
+            'harmony_methods': self._target_methods(spec, target),
+            'mapping_type': rule.get('mapping_type', 'shim'),
+            'confidence': rule.get('confidence', 0.0),
+            'method_mappings': mappings,
+            'requires_imports': [name for name in (fqn(spec), harmony_name) if name],
+            'adapter_package': f'craft.adapters.{spec.package}' if spec.package else 'craft.adapters',
+            'adapter_class': adapter_class,
+            'generator_version': self.version,
+            'generated_at': GENERATED_AT_MARK,
+        }
+
+    def _target_methods(self, spec: ApiSpec, target: Optional[ApiSpec]) -> List[Dict[str, Any]]:
+        """Every method of the target class or, with a retriever, the top-k candidates per Android method."""
+        if self.retriever is None:
+            return [method_context(m, 'Harmony') for m in (target.methods if target else [])]
+        methods, seen = [], set()
+        for candidates in self.retriever.retrieve(spec, self.top_k).values():
+            for candidate in candidates:
+                if id(candidate.method) in seen:
+                    continue
+                seen.add(id(candidate.method))
+                context = method_context(candidate.method, 'Harmony')
+                if candidate.spec is not target:
+                    context['signature'] = f"{candidate.spec.class_name}.{context['signature']}"
+                methods.append(dict(context, retrieved=True))
+        return methods
+
+    @staticmethod
+    def drop_docs(context: Dict[str, Any]) -> Dict[str, Any]:
+        strip = lambda methods: [dict(m, doc=None) for m in methods]
+        return dict(context, android_methods=strip(context['android_methods']),
+                    harmony_methods=strip(context['harmony_methods']))
+
+    @staticmethod
+    def drop_unrelated(context: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only retrieved target methods and those an Android method maps to or shares a name with."""
+        related = {m['name'] for m in context['android_methods']}
+        related.update(m['harmony_method'].rsplit('.', 1)[-1] for m in context['method_mappings'])
+        return dict(context, harmony_methods=[m for m in context['harmony_methods']
+                                              if m.get('retrieved') or m['name'] in related])
+
+    def render(self, spec: ApiSpec, budget: Optional[int] = None) -> RenderedPrompt:
+        """Render, trimming context step by step until the estimate fits ``budget``."""
+        budget = budget or self.budget
+        context = self.context(spec)
+        text = self.template.render(context)
+        prompt = RenderedPrompt(text, estimate_tokens(text), budget)
+        for step, trim in (('docs', self.drop_docs), ('unrelated_targets', self.drop_unrelated)):
+            if prompt.fits:
+                break
+            context = trim(context)
+            text = self.template.render(context)
+            prompt = RenderedPrompt(text, estimate_tokens(text), budget, prompt.trimmed + [step])
+        return prompt
+
+    def __call__(self, spec: ApiSpec) -> str:
+        """Prompt text only, so a renderer can serve as PackedGenerator's single_prompt."""
+        return self.render(spec).text
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - Android 清单与资源转换器
+
+将 AndroidManifest.xml 与 res/values*/*.xml 转换为 HarmonyOS 资源布局:
+1. AndroidManifest.xml -> module.json5 + resources/base/profile/main_pages.json
+2. values/strings.xml 等 -> resources/<限定词>/element/<类型>.json
+3. values-zh-rCN -> zh_CN, values-night -> dark (按限定词合并)
+
+每个输入文件只经 expat 流式解析一次; 全部输出先在内存中合并,
+最后每个文件只写一次 (内容未变化时跳过写入)。
+
+用法:
+    python3 resource_converter.py <android src/main 目录> <harmony entry/src/main 目录>
+"""
+
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from android_xml import LayoutNode, load_xml
+
+# ============================================================================
+# 资源类型映射
+# ============================================================================
+
+# Android values 元素 -> HarmonyOS element 文件 (type 名即文件名)
+VALUE_TYPES = {
+    'string': 'string',
+    'color': 'color',
+    'dimen': 'float',
+    'bool': 'boolean',
+    'integer': 'integer',
+    'string-array': 'strarray',
+    'integer-array': 'intarray',
+    'plurals': 'plural',
+}
+
+# <item type="xxx"> 的类型名
+_ITEM_TYPES = {'string': 'string', 'color': 'color', 'dimen': 'dimen', 'bool': 'bool', 'integer': 'integer'}
+
+_LAUNCHER_ACTION = 'android.intent.action.MAIN'
+_LAUNCHER_CATEGORY = 'android.intent.category.LAUNCHER'
+
+_ANDROID_ESCAPES = re.compile(r'\\(u[0-9a-fA-F]{4}|.)')
+_ESCAPE_CHARS = {'n': '\n', 't': '\t', "'": "'", '"': '"', '\\': '\\', '@': '@', '?': '?'}
+
+
+def unescape_android_string(value: str) -> str:
+    """去掉 Android 字符串的外层引号与转义 (\\' \\" \\n \\uXXXX)"""
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+    if '\\' not in value:
+        return value
+
+    def replace(m):
+        esc = m.group(1)
+        if esc[0] == 'u' and len(esc) == 5:
+            return chr(int(esc[1:], 16))
+        return _ESCAPE_CHARS.get(esc, esc)
+    return _ANDROID_ESCAPES.sub(replace, value)
+
+
+def inner_content(node: LayoutNode) -> str:
+    """
+    元素的完整内容 (文本 + 子元素 + tail): <xliff:g> 只保留占位内容 (如 %d),
+    <b>/<i>/<u> 等样式标记原样保留
+    """
+    parts = [node.leading]
+    for child in node.children:
+        if child.tag == 'xliff:g':
+            parts.append(''.join(child.itertext()))
+        else:
+            attrs = ''.join(f' {name}="{value}"' for name, value in child.attrs.items())
+            parts.append(f'<{child.tag}{attrs}>{inner_content(child)}</{child.tag}>')
+        parts.append(child.tail)
+    return ''.join(parts)
+
+
+def convert_reference(value: str) -> str:
+    """@string/app_name -> $string:app_name, @dimen/x -> $float:x"""
+    if value.startswith('@') and '/' in value and not value.startswith('@android:'):
+        kind, name = value[1:].split('/', 1)
+        kind = {'dimen': 'float', 'bool': 'boolean', 'drawable': 'media', 'mipmap': 'media'}.get(kind, kind)
+        return f'${kind}:{name}'
+    return value
+
+
+def convert_dimen(value: str) -> str:
+    """16dp -> 16vp, 14sp -> 14fp"""
+    for unit, target in (('dip', 'vp'), ('dp', 'vp'), ('sp', 'fp')):
+        if value.endswith(unit):
+            return value[:-len(unit)] + target
+    return convert_reference(value)
+
+
+def qualifier_dir(values_dir: str) -> Optional[str]:
+    """values -> base, values-zh-rCN -> zh_CN, values-night -> dark; 不支持的限定词返回 None"""
+    if values_dir == 'values':
+        return 'base'
+    parts = values_dir.split('-')[1:]
+    language, region, color_mode = None, None, None
+    for part in parts:
+        if part == 'night':
+            color_mode = 'dark'
+        elif re.fullmatch(r'[a-z]{2,3}', part):
+            language = part
+        elif re.fullmatch(r'r[A-Z]{2}', part):
+            region = part[1:]
+        elif part.startswith('b+'):
+            subtags = part[2:].split('+')
+            language = subtags[0]
+            region = next((t for t in subtags[1:] if re.fullmatch(r'[A-Z]{2}', t)), None)
+        else:
+            return None  # 如 v21 / sw600dp / land: HarmonyOS 无直接对应
+    if language is None and region is not None:
+        return None
+    qualifiers = [q for q in ('_'.join(filter(None, (language, region))), color_mode) if q]
+    return '-'.join(qualifiers) if qualifiers else None
+
+# ============================================================================
+# 转换结果
+# ============================================================================
+
+@dataclass
+class ConversionResult:
+    # {相对输出路径: JSON 对象}
+    outputs: Dict[str, object] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    written: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+
+@dataclass
+class AbilityInfo:
+    name: str
+    activity: str
+    label: Optional[str]
+    exported: bool
+    launcher: bool
+    actions: List[str] = field(default_factory=list)
+    entities: List[str] = field(default_factory=list)
+
+# ============================================================================
+# 转换器
+# ============================================================================
+
+class ResourceConverter:
+    """AndroidManifest.xml + res/values* -> HarmonyOS module.json5 与 element 资源"""
+
+    def __init__(self, android_main: str):
+        self.android_main = Path(android_main)
+        # {限定词: {element 类型: {资源名: 值}}}; 按插入顺序输出
+        self.elements: Dict[str, Dict[str, Dict[str, object]]] = {}
+        self.result = ConversionResult()
+
+    def convert(self) -> ConversionResult:
+        """转换清单和全部 values 资源 (每个输入文件解析一次)"""
+        res_dir = self.android_main / 'res'
+        if res_dir.is_dir():
+            for values_dir in sorted(p for p in res_dir.iterdir() if p.is_dir() and p.name.startswith('values')):
+                qualifier = qualifier_dir(values_dir.name)
+                if qualifier is None:
+                    self.result.skipped.append(f"{values_dir.name}: 不支持的限定词")
+                    continue
+                for xml_file in sorted(values_dir.glob('*.xml')):
+                    self._convert_values(xml_file, qualifier)
+
+        manifest = self.android_main / 'AndroidManifest.xml'
+        if manifest.exists():
+            self._convert_manifest(manifest)
+
+        for qualifier, types in self.elements.items():
+            for type_name, entries in types.items():
+                self.result.outputs[f'resources/{qualifier}/element/{type_name}.json'] = {
+                    type_name: [{'name': name, 'value': value} for name, value in entries.items()]
+                }
+        return self.result
+
+    # ------------------------------------------------------------------------
+    # values 资源
+    # ------------------------------------------------------------------------
+
+    def _add(self, qualifier: str, type_name: str, name: str, value: object, overwrite: bool = True):
+        entries = self.elements.setdefault(qualifier, {}).setdefault(type_name, {})
+        if overwrite or name not in entries:
+            entries[name] = value
+
+    def _convert_values(self, path: Path, qualifier: str):
+        document = load_xml(str(path))
+        if document.error or document.root is None or document.root.tag != 'resources':
+            self.result.skipped.append(f"{path.name}: {document.error or '不是 <resources> 文件'}")
+            return
+
+        for node in document.root.children:
+            tag = node.tag
+            if tag == 'item' and node.get('type') in _ITEM_TYPES:
+                tag = _ITEM_TYPES[node.get('type')]
+            type_name = VALUE_TYPES.get(tag)
+            name = node.get('name')
+            if type_name is None or not name:
+                self.result.skipped.append(f"{path.name}: <{node.tag} name=\"{name}\">")
+                continue
+            if node.get('translatable') == 'false' and qualifier != 'base':
+                continue
+            self._add(qualifier, type_name, name, self._value(tag, node))
+
+    def _value(self, tag: str, node: LayoutNode) -> object:
+        if tag == 'string':
+            return convert_reference(unescape_android_string(inner_content(node).strip()))
+        if tag == 'dimen':
+            return convert_dimen(node.text)
+        if tag == 'bool':
+            return node.text == 'true' if node.text in ('true', 'false') else convert_reference(node.text)
+        if tag == 'integer':
+            return int(node.text) if re.fullmatch(r'-?\d+', node.text) else convert_reference(node.text)
+        if tag == 'string-array':
+            return [{'value': convert_reference(unescape_android_string(inner_content(item).strip()))}
+                    for item in node.children]
+        if tag == 'integer-array':
+            return [int(item.text) if re.fullmatch(r'-?\d+', item.text) else convert_reference(item.text)
+                    for item in node.children]
+        if tag == 'plurals':
+            return [{'quantity': item.get('quantity'), 'value': unescape_android_string(inner_content(item).strip())}
+                    for item in node.children]
+        return convert_reference(node.text)
+
+    # ------------------------------------------------------------------------
+    # 清单
+    # ------------------------------------------------------------------------
+
+    def _convert_manifest(self, path: Path):
+        document = load_xml(str(path))
+        if document.error or document.root is None:
+            self.result.skipped.append(f"{path.name}: {document.error}")
+            return
+
+        application = next((c for c in document.root.children if c.tag == 'application'), None)
+        if application is None:
+            self.result.skipped.append(f"{path.name}: 缺少 <application>")
+            return
+
+        app_label = application.get('label')
+        abilities = [self._ability(node) for node in application.children if node.tag == 'activity']
+        abilities.sort(key=lambda a: not a.launcher)  # 启动 Ability 排在首位
+
+        module_label = self._label_text(app_label) or 'entry'
+        self._add('base', 'string', 'module_desc', f'{module_label} - CRAFT Generated', overwrite=False)
+        self._add('base', 'color', 'start_window_background', '#FFFFFF', overwrite=False)
+
+        ability_entries = []
+        pages = []
+        for ability in abilities:
+            label = ability.label or app_label
+            self._add('base', 'string', f'{ability.name}_desc',
+                      f'{self._label_text(label) or ability.name} Entry', overwrite=False)
+            if label and label.startswith('@string/'):
+                label_ref = convert_reference(label)
+            else:
+                label_ref = f'$string:{ability.name}_label'
+                self._add('base', 'string', f'{ability.name}_label', label or ability.name, overwrite=False)
+
+            entry = {
+                'name': ability.name,
+                'srcEntry': f'./ets/{ability.name}.ets',
+                'description': f'$string:{ability.name}_desc',
+                'icon': '$media:icon',
+                'label': label_ref,
+                'startWindowIcon': '$media:startIcon',
+                'startWindowBackground': '$color:start_window_background',
+                'exported': ability.exported,
+            }
+            if ability.actions or ability.entities:
+                entry['skills'] = [{'entities': ability.entities, 'actions': ability.actions}]
+            ability_entries.append(entry)
+            pages.append('pages/Index' if ability.launcher else f'pages/{ability.activity}')
+
+        self.result.outputs['module.json5'] = {
+            'module': {
+                'name': 'entry',
+                'type': 'entry',
+                'description': '$string:module_desc',
+                'mainElement': ability_entries[0]['name'] if ability_entries else '',
+                'deviceTypes': ['phone', 'tablet'],
+                'deliveryWithInstall': True,
+                'installationFree': False,
+                'pages': '$profile:main_pages',
+                'abilities': ability_entries,
+            }
+        }
+        self.result.outputs['resources/base/profile/main_pages.json'] = {'src': pages}
+
+    def _ability(self, node: LayoutNode) -> AbilityInfo:
+        activity = (node.get('name') or '').rsplit('.', 1)[-1]
+        actions, entities = [], []
+        for intent_filter in node.children:
+            if intent_filter.tag != 'intent-filter':
+                continue
+            for child in intent_filter.children:
+                if child.tag == 'action':
+                    actions.append(child.get('name'))
+                elif child.tag == 'category':
+                    entities.append(child.get('name'))
+        launcher = _LAUNCHER_ACTION in actions and _LAUNCHER_CATEGORY in entities
+        if launcher:
+            # MAIN/LAUNCHER -> 桌面入口
+            actions = ['action.system.home' if a == _LAUNCHER_ACTION else a for a in actions]
+            entities = ['entity.system.home' if e == _LAUNCHER_CATEGORY else e for e in entities]
+        name = 'EntryAbility' if launcher else activity.replace('Activity', '') + 'Ability'
+        exported = node.get('exported', 'true' if actions else 'false') == 'true'
+        return AbilityInfo(name, activity, node.get('label'), exported, launcher, actions, entities)
+
+    def _label_text(self, label: Optional[str]) -> Optional[str]:
+        """@string/x 解析为 base 中的字符串值"""
+        if label and label.startswith('@string/'):
+            value = self.elements.get('base', {}).get('string', {}).get(label.split('/', 1)[1])
+            return value if isinstance(value, str) else None
+        return label
+
+# ============================================================================
+# 输出
+# ============================================================================
+
+def write_outputs(result: ConversionResult, harmony_main: str) -> ConversionResult:
+    """每个输出文件序列化一次并写入一次; 内容未变的文件不重写"""
+    for rel_path, data in sorted(result.outputs.items()):
+        path = os.path.join(harmony_main, rel_path)
+        content = json.dumps(data, ensure_ascii=False, indent=2) + '\n'
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if f.read() == content:
+                    result.unchanged.append(rel_path)
+                    continue
+        except OSError:
+            pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        result.written.append(rel_path)
+    return result
+
+
+def convert_app(android_main: str, harmony_main: str) -> ConversionResult:
+    """转换并写出全部清单与资源文件"""
+    return write_outputs(ResourceConverter(android_main).convert(), harmony_main)
+
+# ============================================================================
+# 主函数
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("用法: python3 resource_converter.py <android src/main 目录> <harmony entry/src/main 目录>")
+        return 2
+    result = convert_app(argv[0], argv[1])
+    for rel_path in result.written:
+        print(f"  生成: {rel_path}")
+    print(f"  写入 {len(result.written)} 个文件, {len(result.unchanged)} 个未变化")
+    for item in result.skipped:
+        print(f"  跳过: {item}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
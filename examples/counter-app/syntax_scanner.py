@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+CRAFT Lexical Bracket Scanner
+
+Shared scanner for ArkTS/TypeScript and Java sources. Tracks {}, () and []
+with their positions while skipping comments, string/char literals, Java text
+blocks and TypeScript template literals (including `${...}` substitutions).
+
+Tokenization is a single compiled regex per language; the Python loop only
+runs for brackets, literals and comments, never per character.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+OPENERS = {'{': '}', '(': ')', '[': ']'}
+CLOSERS = {'}': '{', ')': '(', ']': '['}
+
+_COMMENT = r'//[^\n]*|/\*.*?\*/'
+_STRINGS = r'"(?:[^"\\\n]|\\.)*"|' r"'(?:[^'\\\n]|\\.)*'"
+
+TOKEN_PATTERNS = {
+    'arkts': (
+        rf'(?P<comment>{_COMMENT})'
+        rf'|(?P<string>{_STRINGS})'
+        r'|(?P<template>`)'
+        r'|(?P<open>[{(\[])'
+        r'|(?P<close>[})\]])'
+        r'|(?P<bad>/\*|["\'])'
+    ),
+    'java': (
+        rf'(?P<comment>{_COMMENT})'
+        r'|(?P<string>""".*?"""|' + _STRINGS + ')'
+        r'|(?P<open>[{(\[])'
+        r'|(?P<close>[})\]])'
+        r'|(?P<bad>/\*|"""|["\'])'
+    ),
+}
+
+# Template literal body up to the closing backtick or the next `${`
+_TEMPLATE_BODY = re.compile(r'(?:[^`\\$]|\\.|\$(?!\{))*(?P<end>`|\$\{)?', re.DOTALL)
+
+_COMPILED: Dict[str, re.Pattern] = {}
+
+# Marker pushed on the bracket stack for a `${` substitution
+_SUBSTITUTION = '${'
+
+
+def token_regex(language: str = 'arkts') -> re.Pattern:
+    """Compiled token regex for a language ('arkts' or 'java')."""
+    regex = _COMPILED.get(language)
+    if regex is None:
+        regex = re.compile(TOKEN_PATTERNS[language], re.DOTALL)
+        _COMPILED[language] = regex
+    return regex
+
+
+def skip_block(source: str, pos: int) -> int:
+    """Index just past the '}' matching a '{' that ends at ``pos``."""
+    regex = token_regex('arkts')
+    depth = 1
+    while depth:
+        m = regex.search(source, pos)
+        if m is None:
+            return len(source)
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == 'open' and m.group() == '{':
+            depth += 1
+        elif kind == 'close' and m.group() == '}':
+            depth -= 1
+        elif kind == 'template':
+            pos = skip_template_literal(source, pos)
+    return pos
+
+
+def skip_template_literal(source: str, pos: int) -> int:
+    """Index just past the closing backtick of a template literal opened before ``pos``."""
+    while True:
+        m = _TEMPLATE_BODY.match(source, pos)
+        pos = m.end()
+        if m.group('end') != '${':
+            return pos
+        pos = skip_block(source, pos)
+
+
+@dataclass
+class BracketIssue:
+    kind: str  # 'unmatched' | 'mismatch' | 'unclosed' | 'unterminated'
+    char: str
+    offset: int
+    expected: Optional[str] = None
+    line: int = 0
+    column: int = 0
+
+    def __str__(self) -> str:
+        where = f"line {self.line}, column {self.column}"
+        if self.kind == 'mismatch':
+            return f"Expected '{self.expected}' but found '{self.char}' at {where}"
+        if self.kind == 'unclosed':
+            return f"Unclosed '{self.char}' at {where}"
+        if self.kind == 'unterminated':
+            return f"Unterminated {self.char} at {where}"
+        return f"Unmatched closing '{self.char}' at {where}"
+
+
+@dataclass
+class ScanResult:
+    pairs: List[Tuple[str, int, int]] = field(default_factory=list)  # (opener, open, close)
+    issues: List[BracketIssue] = field(default_factory=list)  # in detection order
+
+    @property
+    def balanced(self) -> bool:
+        return not self.issues
+
+    def is_balanced(self, opener: str) -> bool:
+        """Balanced with respect to one bracket kind, e.g. '{'."""
+        closer = OPENERS[opener]
+        return not any(
+            issue.char in (opener, closer) or issue.expected in (opener, closer)
+            for issue in self.issues
+        )
+
+    def count(self, opener: str) -> int:
+        """Number of matched pairs of one bracket kind."""
+        return sum(1 for o, _, _ in self.pairs if o == opener)
+
+    def first_error(self) -> Optional[str]:
+        return str(self.issues[0]) if self.issues else None
+
+
+class BracketScanner:
+    """
+    Incremental bracket tracker fed with matches of token_regex().
+
+    feed() returns a resume offset when it consumed input beyond the match
+    (template literal bodies); the caller restarts its finditer there.
+    This lets CodeVerifier's check engine share the same pass.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.stack: List[Tuple[str, int]] = []
+        self.result = ScanResult()
+
+    def feed(self, m: re.Match) -> Optional[int]:
+        kind = m.lastgroup
+        if kind == 'open':
+            self.stack.append((m.group(), m.start()))
+        elif kind == 'close':
+            return self._close(m.group(), m.start())
+        elif kind == 'template':
+            return self._template(m.end())
+        elif kind == 'bad':
+            text = m.group()
+            what = 'comment' if text == '/*' else 'string'
+            self.result.issues.append(BracketIssue('unterminated', what, m.start()))
+            if text == '/*' or text == '"""':
+                return len(self.content)
+        return None
+
+    def _close(self, char: str, offset: int) -> Optional[int]:
+        stack = self.stack
+        opener = CLOSERS[char]
+        if stack and stack[-1][0] == _SUBSTITUTION and char == '}':
+            stack.pop()
+            return self._template(offset + 1)
+        if stack and stack[-1][0] == opener:
+            self.result.pairs.append((opener, stack.pop()[1], offset))
+            return None
+        # Recover: close up to a matching opener deeper in the stack, if any
+        depth = next((i for i in range(len(stack) - 1, -1, -1) if stack[i][0] == opener), None)
+        if depth is None:
+            self.result.issues.append(BracketIssue('unmatched', char, offset))
+            return None
+        top, top_offset = stack[-1]
+        self.result.issues.append(BracketIssue('mismatch', char, offset, expected=OPENERS.get(top, '}')))
+        for unclosed, unclosed_offset in stack[depth + 1:]:
+            self.result.issues.append(BracketIssue('unclosed', unclosed.replace(_SUBSTITUTION, '{'), unclosed_offset))
+        del stack[depth + 1:]
+        self.result.pairs.append((opener, stack.pop()[1], offset))
+        return None
+
+    def _template(self, pos: int) -> int:
+        m = _TEMPLATE_BODY.match(self.content, pos)
+        end = m.group('end')
+        if end is None:
+            self.result.issues.append(BracketIssue('unterminated', 'template literal', pos - 1))
+            return len(self.content)
+        if end == '${':
+            self.stack.append((_SUBSTITUTION, m.end() - 2))
+        return m.end()
+
+    def finish(self) -> ScanResult:
+        for opener, offset in self.stack:
+            self.result.issues.append(BracketIssue('unclosed', opener.replace(_SUBSTITUTION, '{'), offset))
+        self.stack = []
+        _locate(self.content, sorted(self.result.issues, key=lambda issue: issue.offset))
+        return self.result
+
+
+def _locate(content: str, issues: List[BracketIssue]):
+    """Fill in 1-based line/column for offset-sorted issues."""
+    line, line_start, pos = 1, 0, 0
+    for issue in issues:
+        newlines = content.count('\n', pos, issue.offset)
+        if newlines:
+            line += newlines
+            line_start = content.rfind('\n', pos, issue.offset) + 1
+        pos = issue.offset
+        issue.line = line
+        issue.column = issue.offset - line_start + 1
+
+
+def scan(content: str, language: str = 'arkts') -> ScanResult:
+    """Scan source text and return bracket pairs and issues."""
+    regex = token_regex(language)
+    scanner = BracketScanner(content)
+    pos: Optional[int] = 0
+    while pos is not None:
+        resume = None
+        for m in regex.finditer(content, pos):
+            resume = scanner.feed(m)
+            if resume is not None:
+                break
+        pos = resume if resume is not None and resume < len(content) else None
+    return scanner.finish()
+
+
+def language_for(path: str) -> str:
+    """Pick the scanner language from a file extension."""
+    return 'java' if str(path).endswith('.java') else 'arkts'
@@ -5,6 +5,7 @@ CRAFT Framework - 运行所有测试
 测试套件:
 1. test_craft_generator.py - 生成器逻辑测试
 2. test_openharmony_syntax.py - OpenHarmony 代码语法验证
+3. 工具链测试 - TOOLCHAIN_TEST_MODULES 中列出的模块
 """
 
 import os
@@ -36,6 +37,31 @@ from tests.test_openharmony_syntax import (
     TestApiMappingImplementation,
 )
 
+# 工具链模块测试 (整模块加载)
+TOOLCHAIN_TEST_MODULES = [
+    'tests.test_call_site_rewriter',
+    'tests.test_verify_code',
+    'tests.test_syntax_scanner',
+    'tests.test_android_xml',
+    'tests.test_layout_translator',
+    'tests.test_resource_converter',
+    'tests.test_sdk_archive',
+    'tests.test_class_reader',
+    'tests.test_ets_scanner',
+    'tests.test_class_hierarchy',
+    'tests.test_generation_scheduler',
+    'tests.test_change_impact',
+    'tests.test_pipeline_orchestrator',
+    'tests.test_pipeline_journal',
+    'tests.test_ai_client',
+    'tests.test_ai_cache',
+    'tests.test_prompt_packing',
+    'tests.test_model_router',
+    'tests.test_prompt_renderer',
+    'tests.test_context_retrieval',
+    'tests.test_craft_daemon',
+]
+
 
 def print_header(title: str):
     """打印分隔标题"""
@@ -98,14 +124,23 @@ def run_all_tests():
 
     syntax_result = runner.run(syntax_suite)
 
+    # ========================================
+    # 测试组 3: 工具链测试
+    # ========================================
+    print_header("测试组 3: 工具链测试")
+
+    toolchain_suite = loader.loadTestsFromNames(TOOLCHAIN_TEST_MODULES)
+    toolchain_result = runner.run(toolchain_suite)
+
     # ========================================
     # 总体结果
     # ========================================
     print_header("测试结果总结")
 
-    total_run = generator_result.testsRun + syntax_result.testsRun
-    total_failures = len(generator_result.failures) + len(syntax_result.failures)
-    total_errors = len(generator_result.errors) + len(syntax_result.errors)
+    results = [generator_result, syntax_result, toolchain_result]
+    total_run = sum(r.testsRun for r in results)
+    total_failures = sum(len(r.failures) for r in results)
+    total_errors = sum(len(r.errors) for r in results)
     total_success = total_run - total_failures - total_errors
 
     print(f"生成器测试:")
@@ -122,6 +157,13 @@ def run_all_tests():
     print(f"  错误: {len(syntax_result.errors)}")
     print()
 
+    print(f"工具链测试:")
+    print(f"  运行: {toolchain_result.testsRun}")
+    print(f"  成功: {toolchain_result.testsRun - len(toolchain_result.failures) - len(toolchain_result.errors)}")
+    print(f"  失败: {len(toolchain_result.failures)}")
+    print(f"  错误: {len(toolchain_result.errors)}")
+    print()
+
     print("-" * 40)
     print(f"总计:")
     print(f"  运行: {total_run}")
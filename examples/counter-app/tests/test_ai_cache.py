@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - AI 响应缓存测试
+
+测试覆盖:
+1. 内容寻址 - 键由模型、提示词与生成参数决定
+2. 淘汰 - 按最近最少使用淘汰, 条目数与字节数双重上限; 命中只读不加写锁, 访问记录批量写回
+3. 持久化与并发 - 重新打开后命中, 多进程同时读写
+4. 客户端集成 - 重跑时只为新的提示词调用模型, 命中不占用限流配额
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_cache import ResponseCache, cache_key
+from ai_client import AiClient, AiConfig, Completion, MockBackend, RateLimiter
+
+
+def completion(text):
+    return Completion(text, 'model', 10, len(text), 1.5)
+
+
+def _worker(args):
+    path, worker = args
+    cache = ResponseCache(path)
+    for i in range(40):
+        key = cache_key('model', f'prompt {i % 20}')
+        if cache.get(key) is None:
+            cache.put(key, completion(f'answer {i % 20} from {worker}'))
+    return cache.hits
+
+
+class CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cache', 'ai.sqlite')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+
+class TestResponseCache(CacheTestCase):
+    """测试缓存本身"""
+
+    def test_key(self):
+        """测试键对模型、提示词与参数敏感, 参数顺序无关"""
+        base = cache_key('m', 'p', max_tokens=10, temperature=0.2)
+        self.assertEqual(base, cache_key('m', 'p', temperature=0.2, max_tokens=10))
+        self.assertNotEqual(base, cache_key('m2', 'p', max_tokens=10, temperature=0.2))
+        self.assertNotEqual(base, cache_key('m', 'p ', max_tokens=10, temperature=0.2))
+        self.assertNotEqual(base, cache_key('m', 'p', max_tokens=11, temperature=0.2))
+
+    def test_round_trip(self):
+        """测试写入后读出, 标记为缓存命中"""
+        cache = ResponseCache(self.path)
+        self.assertIsNone(cache.get('k'))
+        cache.put('k', completion('class A {}'))
+        hit = cache.get('k')
+        self.assertEqual((hit.text, hit.input_tokens, hit.cached, hit.latency), ('class A {}', 10, True, 0.0))
+        self.assertEqual(cache.stats()['hit_rate'], 0.5)
+
+    def test_lru_entries(self):
+        """测试超出条目上限时淘汰最久未使用的条目"""
+        cache = ResponseCache(self.path, max_entries=2)
+        cache.put('a', completion('a'))
+        cache.put('b', completion('b'))
+        cache.get('a')
+        cache.put('c', completion('c'))
+        self.assertEqual([k in cache for k in 'abc'], [True, False, True])
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_hit_while_writer_holds_lock(self):
+        """测试另一连接持有写锁时命中仍立即返回, 访问记录随后批量写回"""
+        cache = ResponseCache(self.path)
+        cache.put('k', completion('v'))
+        writer = sqlite3.connect(self.path, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            self.assertEqual(cache.get('k').text, 'v')
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+        self.assertEqual(cache.stats()['total_hits'], 1)
+
+    def test_size_bound(self):
+        """测试存储字节数不超过上限"""
+        cache = ResponseCache(self.path, max_bytes=2000)
+        for i in range(50):
+            cache.put(str(i), completion('x' * 100))
+        stats = cache.stats()
+        self.assertLessEqual(stats['bytes'], 2000)
+        self.assertGreater(stats['entries'], 0)
+        self.assertIn('49', cache)
+        self.assertNotIn('0', cache)
+
+    def test_persistence_and_totals(self):
+        """测试重新打开后命中, 累计命中率跨实例统计"""
+        first = ResponseCache(self.path)
+        first.get('k')
+        first.put('k', completion('v'))
+        first.close()
+        second = ResponseCache(self.path)
+        self.assertEqual(second.get('k').text, 'v')
+        stats = second.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['total_hits'], stats['total_misses']), (1, 0, 1, 1))
+
+    def test_concurrent_processes(self):
+        """测试多个进程同时读写同一缓存"""
+        ResponseCache(self.path)
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            hits = list(pool.map(_worker, [(self.path, n) for n in range(4)]))
+        cache = ResponseCache(self.path)
+        self.assertEqual(len(cache), 20)
+        self.assertGreaterEqual(sum(hits), 4 * 20)
+        self.assertEqual(cache.stats()['bytes'], sum(
+            len(row[0].encode('utf-8')) for row in cache._db().execute("SELECT value FROM entries")))
+
+
+class TestClientIntegration(CacheTestCase):
+    """测试客户端集成"""
+
+    def test_rerun_only_calls_for_new_prompts(self):
+        """测试重跑时只有新提示词调用模型, 命中不消耗限流"""
+        now = [0.0]
+        clock = lambda: now[0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        backend = MockBackend()
+        config = AiConfig(rate_limit_rpm=2)
+
+        def client():
+            return AiClient(config, backend, RateLimiter(2, None, clock, sleep), sleep, cache=ResponseCache(self.path))
+
+        first = client()
+        for prompt in ['Activity', 'Service']:
+            first.complete(prompt)
+        self.assertEqual(len(backend.calls), 2)
+        self.assertEqual(now[0], 0.0)
+
+        second = client()
+        results = [second.complete(p) for p in ['Activity', 'Service', 'Toast']]
+        self.assertEqual(len(backend.calls), 3)
+        self.assertEqual([r.cached for r in results], [True, True, False])
+        self.assertEqual(second.stats.cache_hits, 2)
+        self.assertEqual(second.stats.requests, 1)
+        self.assertAlmostEqual(second.cache.hit_rate, 2 / 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
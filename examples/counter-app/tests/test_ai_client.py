@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - AI 客户端测试
+
+测试覆盖:
+1. 令牌桶 - 突发容量、按速率补充、请求数与 token 数双重限流
+2. 配额 - 限流器与服务端配额一致时吞吐贴近上限且没有 429
+3. 重试 - 抖动指数退避、遵循 Retry-After、不可重试错误直接抛出
+4. 本地替身 - 预置回复与延迟, HTTP 替身服务器复用同一连接
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_client import (
+    AiClient, AiConfig, AiError, HttpBackend, MockBackend, MockServer, RateLimiter, RateLimitError,
+    TokenBucket, estimate_tokens,
+)
+
+
+class FakeClock:
+    """可控时钟: sleep 直接推进时间"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def client(clock, backend, rpm=60, tpm=None, retry_attempts=3):
+    config = AiConfig(rate_limit_rpm=rpm, rate_limit_tpm=tpm, retry_attempts=retry_attempts)
+    return AiClient(config, backend, RateLimiter(rpm, tpm, clock, clock.sleep),
+                    sleep=clock.sleep, rng=lambda: 0.5)
+
+
+class TestTokenBucket(unittest.TestCase):
+    """测试令牌桶"""
+
+    def test_burst_then_rate(self):
+        """测试桶满时立即放行, 之后按速率等待"""
+        clock = FakeClock()
+        bucket = TokenBucket(3, 1.0, clock, clock.sleep)
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.try_acquire(), 1.0)
+        self.assertAlmostEqual(bucket.acquire(), 1.0)
+        self.assertAlmostEqual(clock.now, 1.0)
+
+    def test_token_limit(self):
+        """测试 tokens-per-minute 限制与事后扣除输出 token"""
+        clock = FakeClock()
+        limiter = RateLimiter(1000, 120, clock, clock.sleep)
+        self.assertEqual(limiter.acquire(100), 0.0)
+        limiter.record_output(80)
+        self.assertAlmostEqual(limiter.acquire(20), 40.0)  # 2 token/s, 欠 80
+
+    def test_estimate_tokens(self):
+        """测试 token 估算"""
+        self.assertEqual(estimate_tokens(''), 1)
+        self.assertEqual(estimate_tokens('x' * 400), 100)
+
+
+class TestQuota(unittest.TestCase):
+    """测试配额下的吞吐"""
+
+    def test_limited_client_never_hits_429(self):
+        """测试与服务端同配额时 180 个请求无 429, 用时约两分钟"""
+        clock = FakeClock()
+        backend = MockBackend(quota_rpm=60, clock=clock, sleep=clock.sleep)
+        ai = client(clock, backend, rpm=60)
+        for i in range(180):
+            ai.complete(f"prompt {i}")
+        self.assertEqual(backend.rejected, 0)
+        self.assertEqual(len(backend.calls), 180)
+        self.assertAlmostEqual(clock.now, 120.0, delta=1.0)
+
+    def test_unlimited_client_retries_429(self):
+        """测试超出配额时按 Retry-After 重试并最终成功"""
+        clock = FakeClock()
+        backend = MockBackend(quota_rpm=6, clock=clock, sleep=clock.sleep)
+        ai = client(clock, backend, rpm=10000)
+        for i in range(8):
+            ai.complete(f"prompt {i}")
+        self.assertGreater(ai.stats.rate_limited, 0)
+        self.assertEqual(ai.stats.retries, ai.stats.rate_limited)
+        self.assertEqual(len(backend.calls), 8)
+
+
+class FlakyBackend:
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.attempts = 0
+
+    def complete(self, model, prompt, max_tokens, temperature):
+        self.attempts += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return MockBackend().complete(model, prompt, max_tokens, temperature)
+
+
+class TestRetry(unittest.TestCase):
+    """测试重试与退避"""
+
+    def test_backoff(self):
+        """测试抖动指数退避与上限"""
+        ai = client(FakeClock(), MockBackend())
+        self.assertEqual([ai.backoff(n) for n in range(4)], [0.5, 1.0, 2.0, 4.0])
+        self.assertEqual(ai.backoff(20), 30.0)
+
+    def test_retry_after_honoured(self):
+        """测试 Retry-After 大于退避时间时按 Retry-After 等待"""
+        clock = FakeClock()
+        backend = FlakyBackend([RateLimitError("429", retry_after=7.0)])
+        ai = client(clock, backend)
+        ai.complete("hi")
+        self.assertEqual(backend.attempts, 2)
+        self.assertAlmostEqual(clock.now, 7.0)
+
+    def test_exhausted_and_fatal(self):
+        """测试重试耗尽抛出, 不可重试错误不重试"""
+        clock = FakeClock()
+        with self.assertRaises(RateLimitError):
+            client(clock, FlakyBackend([RateLimitError("429")] * 3), retry_attempts=2).complete("hi")
+        fatal = FlakyBackend([AiError("400")])
+        with self.assertRaises(AiError):
+            client(clock, fatal).complete("hi")
+        self.assertEqual(fatal.attempts, 1)
+
+
+class TestBackends(unittest.TestCase):
+    """测试本地替身"""
+
+    def test_config(self):
+        """测试读取 craft_config.yaml 的 ai 段"""
+        config = AiConfig.load()
+        self.assertEqual((config.rate_limit_rpm, config.retry_attempts, config.max_tokens), (50, 3, 4096))
+
+    def test_canned_responses(self):
+        """测试按提示词选择预置回复并模拟延迟"""
+        clock = FakeClock()
+        backend = MockBackend({'Activity': 'class ActivityAdapter {}', 'Toast': lambda p: p.upper()},
+                              latency=0.25, sleep=clock.sleep)
+        self.assertEqual(backend.complete('m', 'adapt Activity', 100, 0).text, 'class ActivityAdapter {}')
+        self.assertEqual(backend.complete('m', 'Toast', 100, 0).text, 'TOAST')
+        self.assertEqual(backend.complete('m', 'other', 100, 0).text, '// TODO: adapter')
+        self.assertAlmostEqual(clock.now, 0.75)
+
+    def test_http_connection_reuse(self):
+        """测试 HTTP 后端通过替身服务器工作且复用连接"""
+        with MockServer(MockBackend({'Activity': 'adapter code'})) as server:
+            http = HttpBackend(api_key='test', base_url=server.url)
+            ai = AiClient(AiConfig(), http)
+            texts = [ai.complete(f'Activity {i}').text for i in range(5)]
+        self.assertEqual(texts, ['adapter code'] * 5)
+        self.assertEqual((http.connections, server.connections), (1, 1))
+        self.assertGreater(ai.stats.output_tokens, 0)
+
+    def test_http_rate_limit(self):
+        """测试 HTTP 429 转换为 RateLimitError 并携带 Retry-After"""
+        with MockServer(MockBackend(quota_rpm=1)) as server:
+            http = HttpBackend(api_key='test', base_url=server.url)
+            http.complete('m', 'first', 10, 0)
+            with self.assertRaises(RateLimitError) as ctx:
+                http.complete('m', 'second', 10, 0)
+        self.assertGreater(ctx.exception.retry_after, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
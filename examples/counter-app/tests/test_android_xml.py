@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - Android XML 流式解析测试
+
+测试覆盖:
+1. 嵌套校验 - 交错标签在一次解析中被发现
+2. 布局树 - android: 属性压缩, 子节点顺序, 混合内容的 tail 与 itertext
+3. 文件缓存 - 同一文件只解析一次
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from android_xml import load_xml, parse_stream, parse_xml
+from verify_code import check_content
+
+PROJECT_DIR = Path(__file__).parent.parent
+LAYOUT_XML = PROJECT_DIR / "android/app/src/main/res/layout/activity_main.xml"
+
+
+class TestXmlNesting(unittest.TestCase):
+    """测试嵌套校验"""
+
+    def test_crossed_tags_rejected(self):
+        """测试交错标签 (标签计数相同但嵌套错误)"""
+        document = parse_xml('<?xml version="1.0"?><A><B></A></B>')
+        self.assertFalse(document.well_formed)
+        self.assertIn("mismatched tag", document.error)
+
+    def test_unclosed_root(self):
+        """测试未闭合的根元素"""
+        self.assertIsNotNone(parse_xml("<A><B/>").error)
+
+    def test_verifier_reports_nesting(self):
+        """测试 CodeVerifier 报告嵌套错误"""
+        results = {r.name: r for r in check_content('<?xml version="1.0"?><A><B></A></B>', "xml")}
+        self.assertTrue(results["XML declaration"].passed)
+        self.assertFalse(results["Balanced tags"].passed)
+
+
+class TestLayoutTree(unittest.TestCase):
+    """测试布局树构建"""
+
+    def test_activity_main_tree(self):
+        """测试 activity_main.xml 的布局树"""
+        root = load_xml(str(LAYOUT_XML)).root
+        self.assertEqual(root.tag, "LinearLayout")
+        self.assertEqual(root.get("orientation"), "vertical")
+        self.assertEqual([c.tag for c in root.children], ["TextView", "Button"])
+        self.assertEqual(root.children[0].get("text"), "Hello World")
+        self.assertNotIn("xmlns:android", root.attrs)
+
+    def test_text_and_iteration(self):
+        """测试文本内容与深度优先遍历"""
+        root = parse_xml('<resources><string name="a">Hi</string><string name="b"> x </string></resources>').root
+        self.assertEqual([n.tag for n in root.iter()], ["resources", "string", "string"])
+        self.assertEqual(root.children[1].text, "x")
+
+    def test_mixed_content(self):
+        """测试子元素之后的文本记录为 tail, itertext 按文档顺序返回全部文本"""
+        root = parse_xml('<string>Delete <xliff:g id="n">%d</xliff:g> items<b>!</b></string>').root
+        self.assertEqual(root.leading, 'Delete ')
+        self.assertEqual([c.tail for c in root.children], [' items', ''])
+        self.assertEqual(''.join(root.itertext()), 'Delete %d items!')
+
+    def test_chunked_stream(self):
+        """测试分块流式解析与整体解析一致"""
+        content = LAYOUT_XML.read_bytes()
+        self.assertEqual(parse_stream(io.BytesIO(content)).root.signature(),
+                         parse_xml(content).root.signature())
+
+
+class TestLoadCache(unittest.TestCase):
+    """测试文件解析缓存"""
+
+    def test_parsed_once_until_changed(self):
+        """测试未修改的文件复用解析结果"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.xml")
+            Path(path).write_text("<A/>")
+            first = load_xml(path)
+            self.assertIs(load_xml(path), first)
+            Path(path).write_text("<Bb/>")
+            self.assertEqual(load_xml(path).root.tag, "Bb")
+
+
+if __name__ == '__main__':
+    unittest.main()
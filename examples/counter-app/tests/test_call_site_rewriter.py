@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 调用点重写器测试
+
+测试覆盖:
+1. Aho-Corasick 自动机 - 多模式 / 后缀模式匹配
+2. 调用点扫描 - 跳过注释和字符串, 只匹配完整标识符
+3. 源码重写 - 限定名优先, 偏移正确
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from call_site_rewriter import AhoCorasick, CallSiteRewriter, RewritePattern, main
+
+
+class TestAhoCorasick(unittest.TestCase):
+    """测试 token 级 Aho-Corasick 自动机"""
+
+    def _match(self, automaton, tokens):
+        state, found = 0, []
+        for token in tokens:
+            state = automaton.step(state, token)
+            found.extend(value for _, value in automaton.outputs(state))
+        return found
+
+    def test_overlapping_patterns(self):
+        """测试后缀模式通过失败链接被报告"""
+        automaton = AhoCorasick({
+            ('a', '.', 'b'): 'ab',
+            ('b',): 'b',
+            ('.', 'b', '.', 'c'): 'bc',
+        })
+        found = self._match(automaton, ['x', 'a', '.', 'b', '.', 'c'])
+        self.assertEqual(sorted(found), ['ab', 'b', 'bc'])
+
+    def test_no_partial_identifier_match(self):
+        """测试 token 字母表不会匹配标识符的一部分"""
+        automaton = AhoCorasick({('finish',): 'finish'})
+        self.assertEqual(self._match(automaton, ['finishAffinity']), [])
+
+
+class TestCallSiteScan(unittest.TestCase):
+    """测试调用点扫描"""
+
+    def setUp(self):
+        self.rewriter = CallSiteRewriter.from_api_mapping(
+            class_mapping={'Activity': 'UIAbility', 'android.app.Activity': 'UIAbility'}
+        )
+        self.code = '''
+import android.app.Activity;
+
+public class MainActivity extends Activity {
+    // finish() 在注释中
+    /* finish(); */
+    public void onClick(View v) {
+        String s = "finish()";
+        char c = 'f';
+        finishAffinity();
+        finish();
+        this.finish ();
+    }
+}
+'''
+
+    def test_finds_method_calls(self):
+        """测试找到方法调用且忽略注释和字符串"""
+        calls = [s for s in self.rewriter.scan(self.code) if s.pattern == 'finish']
+        self.assertEqual([(s.line, s.kind) for s in calls], [(11, 'call'), (12, 'call')])
+        self.assertEqual(calls[1].column, 14)
+
+    def test_method_name_without_call_ignored(self):
+        """测试未跟 '(' 的方法名不算调用点"""
+        sites = self.rewriter.scan('Runnable r = this::finish; int finish = 1;')
+        self.assertEqual([s for s in sites if s.pattern == 'finish'], [])
+
+    def test_finds_class_references(self):
+        """测试找到类名引用 (含限定名)"""
+        patterns = [s.pattern for s in self.rewriter.scan(self.code) if s.kind == 'reference']
+        self.assertIn('android.app.Activity', patterns)
+        self.assertEqual(patterns.count('Activity'), 2)
+
+    def test_many_patterns(self):
+        """测试数千个模式构建单个自动机"""
+        patterns = [RewritePattern(f'method{i}', f'target{i}', 'method') for i in range(5000)]
+        rewriter = CallSiteRewriter(patterns)
+        sites = rewriter.scan('method42(); method4999 (); method5000();')
+        self.assertEqual([s.replacement for s in sites], ['target42', 'target4999'])
+
+
+class TestCallSiteRewrite(unittest.TestCase):
+    """测试源码重写"""
+
+    def test_rewrite_replaces_calls(self):
+        """测试 finish() -> terminateSelf()"""
+        rewriter = CallSiteRewriter.from_api_mapping()
+        code = 'void f() { finish(); /* finish() */ }'
+        new_code, sites = rewriter.rewrite(code)
+        self.assertEqual(new_code, 'void f() { terminateSelf(); /* finish() */ }')
+        self.assertEqual(len(sites), 1)
+
+    def test_declarations_not_rewritten(self):
+        """测试方法声明 (覆写) 不被重写, 方法体内的调用照常重写"""
+        rewriter = CallSiteRewriter.from_api_mapping()
+        code = ('@Override public void finish() { super.finish(); }\n'
+                'List<String> finish(int a) throws IOException { return finish(); }\n'
+                'abstract void finish();')
+        new_code, sites = rewriter.rewrite(code)
+        self.assertEqual(new_code, (
+            '@Override public void finish() { super.terminateSelf(); }\n'
+            'List<String> finish(int a) throws IOException { return terminateSelf(); }\n'
+            'abstract void finish();'))
+        self.assertEqual(len(sites), 2)
+
+    def test_identity_mappings_skipped(self):
+        """测试恒等映射 (onCreate -> onCreate) 既不报告也不重写"""
+        rewriter = CallSiteRewriter.from_api_mapping()
+        self.assertNotIn('onCreate', [p.pattern for p in rewriter.patterns])
+        self.assertEqual(rewriter.scan('void f() { onCreate(b); onDestroy(); }'), [])
+
+    def test_qualified_name_wins(self):
+        """测试限定名优先于其中包含的简单名"""
+        rewriter = CallSiteRewriter.from_api_mapping(
+            api_mapping={},
+            class_mapping={'Activity': 'UIAbility', 'android.app.Activity': 'ohos.app.UIAbility'},
+        )
+        new_code, _ = rewriter.rewrite('import android.app.Activity; class A extends Activity {}')
+        self.assertEqual(new_code, 'import ohos.app.UIAbility; class A extends UIAbility {}')
+
+    def test_apply_rewrites_tree(self):
+        """测试 --apply 原地重写目录"""
+        with tempfile.TemporaryDirectory() as tmp:
+            src = Path(tmp) / 'A.java'
+            src.write_text('class A { void f() { finish(); } }', encoding='utf-8')
+            main([tmp, '--apply'])
+            self.assertIn('terminateSelf()', src.read_text(encoding='utf-8'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 变更影响图测试
+
+测试覆盖:
+1. 依赖记录 - 命中与未命中的查表都被记录
+2. 影响分析 - 修改生命周期映射 / 类型转换只影响消费了该条目的文件
+3. 定向重生成 - 只重写受影响的适配器, 新增规则、ApiSpec 与目标类变更同样生效, origin 变化不触发
+4. 持久化 - 图保存后重新加载结果一致
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from change_impact import DependencyRecorder, ImpactGraph, fingerprint, impact_sources, regenerate, rule_tables
+from sdk_model import LIFECYCLE_MAPPING, TS_TYPE_MAP, ApiSpec, MethodSpec, ParameterSpec
+
+
+def method(name, *param_types, return_type='void'):
+    params = [ParameterSpec(f'p{i}', t) for i, t in enumerate(param_types)]
+    return MethodSpec(name, return_type, params, ['public'])
+
+
+def corpus():
+    return [
+        ApiSpec('Android', 'android.app', 'Activity',
+                methods=[method('onCreate', 'Bundle'), method('onResume'), method('finish')]),
+        ApiSpec('Android', 'android.app', 'Service', methods=[method('onCreate'), method('stopSelf')]),
+        ApiSpec('Android', 'android.widget', 'Toast', methods=[method('show'), method('getText', return_type='String')]),
+    ]
+
+
+def sources(lifecycle=None, ts_type=None):
+    return {'lifecycle': dict(LIFECYCLE_MAPPING, **(lifecycle or {})),
+            'ts_type': dict(TS_TYPE_MAP, **(ts_type or {}))}
+
+
+class TestRecorder(unittest.TestCase):
+    """测试依赖记录"""
+
+    def test_hits_and_misses(self):
+        """测试命中记录值指纹, 未命中记录缺失标记"""
+        recorder = DependencyRecorder()
+        table = recorder.track('lifecycle', {'onCreate': ('onCreate', '')})
+        self.assertIn('onCreate', table)
+        self.assertIsNone(table.get('onResume'))
+        self.assertEqual(recorder.deps['lifecycle:onCreate'], fingerprint(('onCreate', '')))
+        self.assertEqual(recorder.deps['lifecycle:onResume'], '-')
+
+    def test_rule_tables(self):
+        """测试规则表只包含生成器实际读取的映射"""
+        tables = rule_tables()
+        self.assertIs(tables['lifecycle'], LIFECYCLE_MAPPING)
+        self.assertIs(tables['ts_type'], TS_TYPE_MAP)
+        self.assertEqual(set(tables), {'lifecycle', 'ts_type'})
+
+
+class TestRegenerate(unittest.TestCase):
+    """测试定向重生成"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = self.tmp.name
+        self.graph_path = os.path.join(self.out, '.craft-impact.json')
+        self.graph = ImpactGraph(self.graph_path)
+        self.first = regenerate(corpus(), self.out, self.graph, sources())
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_initial_run_writes_everything(self):
+        """测试首次运行生成全部适配器, 第二次无需重写"""
+        self.assertEqual(len(self.first), 6)
+        self.assertTrue(os.path.exists(os.path.join(self.out, 'android', 'app', 'ActivityAdapter.ets')))
+        self.assertEqual(regenerate(corpus(), self.out, self.graph, sources()), [])
+
+    def test_lifecycle_edit(self):
+        """测试修改 onCreate 映射只影响声明了 onCreate 的类"""
+        changed = sources(lifecycle={'onCreate': ('onWindowStageCreate', 'changed')})
+        affected = self.graph.affected(impact_sources(corpus(), changed))
+        self.assertTrue(all('Toast' not in path for path in affected))
+        written = regenerate(corpus(), self.out, self.graph, changed)
+        self.assertEqual(sorted(os.path.basename(p) for p in written),
+                         ['ActivityAdapter.ets', 'ActivityAdapter.java',
+                          'ServiceAdapter.ets', 'ServiceAdapter.java'])
+
+    def test_added_rule_invalidates_misses(self):
+        """测试新增规则使曾经查找失败的文件失效"""
+        written = regenerate(corpus(), self.out, self.graph, sources(lifecycle={'show': ('onForeground', '')}))
+        self.assertEqual(sorted(os.path.basename(p) for p in written), ['ToastAdapter.ets', 'ToastAdapter.java'])
+
+    def test_type_edit_only_touches_arkts(self):
+        """测试修改 Bundle 类型转换只影响使用 Bundle 的 ArkTS 文件"""
+        written = regenerate(corpus(), self.out, self.graph, sources(ts_type={'Bundle': 'LaunchParam'}))
+        self.assertEqual([os.path.basename(p) for p in written], ['ActivityAdapter.ets'])
+        with open(os.path.join(self.out, written[0]), encoding='utf-8') as f:
+            self.assertIn('LaunchParam', f.read())
+
+    def test_spec_edit(self):
+        """测试 ApiSpec 变更只重生成该类"""
+        specs = corpus()
+        specs[2].methods.append(method('cancel'))
+        written = regenerate(specs, self.out, self.graph, sources())
+        self.assertEqual(sorted(os.path.basename(p) for p in written), ['ToastAdapter.ets', 'ToastAdapter.java'])
+
+    def test_target_class_edit(self):
+        """测试目标类变化使全部适配器重生成"""
+        written = regenerate(corpus(), self.out, self.graph, sources(), target_class="AbilityStage")
+        self.assertEqual(len(written), 6)
+        with open(os.path.join(self.out, written[0]), encoding='utf-8') as f:
+            self.assertIn('AbilityStage', f.read())
+
+    def test_origin_ignored(self):
+        """测试只有 origin 不同的 ApiSpec 不触发重生成"""
+        specs = corpus()
+        for spec in specs:
+            spec.origin = f'/elsewhere/{spec.class_name}.java'
+        self.assertEqual(regenerate(specs, self.out, self.graph, sources()), [])
+
+    def test_persistence(self):
+        """测试图保存后重新加载, 影响分析结果一致"""
+        reloaded = ImpactGraph(self.graph_path)
+        self.assertEqual(reloaded.outputs, self.graph.outputs)
+        changed = impact_sources(corpus(), sources(ts_type={'String': 'str'}))
+        self.assertEqual(reloaded.affected(changed), self.graph.affected(changed))
+        self.assertEqual([os.path.basename(p) for p in reloaded.affected(changed)], ['ToastAdapter.ets'])
+        self.assertEqual(regenerate(corpus(), self.out, reloaded, sources()), [])
+
+    def test_removed_class_forgotten(self):
+        """测试从语料中移除的类不再出现在图中"""
+        regenerate(corpus()[:2], self.out, self.graph, sources())
+        self.assertTrue(all('Toast' not in path for path in self.graph.outputs))
+        self.assertEqual(self.graph.dependents('spec:android.widget.Toast'), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 类层次索引测试
+
+测试覆盖:
+1. 名称解析 - 同包、唯一类名、java.lang、内部类
+2. 继承成员 - 覆盖、接口方法、扁平化 ApiSpec
+3. 记忆化 - 每个类只计算一次, 无新增方法的子类共享父类结果
+4. 增量失效 - 父类变化只影响其子树
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from class_hierarchy import HierarchyIndex
+from sdk_model import REPO_ROOT, ApiSpec, JavaParser, MethodSpec, ParameterSpec
+
+
+def method(name, *param_types, return_type='void'):
+    return MethodSpec(name, return_type, [ParameterSpec(f'p{i}', t) for i, t in enumerate(param_types)])
+
+
+def corpus():
+    return [
+        ApiSpec('Android', 'java.lang', 'Object', methods=[method('toString', return_type='String')]),
+        ApiSpec('Android', 'android.content', 'Context', 'abstract_class', 'Object',
+                methods=[method('getString', 'int', return_type='String'), method('startActivity', 'Intent')]),
+        ApiSpec('Android', 'android.content', 'ContextWrapper', parent_class='Context',
+                methods=[method('startActivity', 'Intent'), method('getBaseContext', return_type='Context')]),
+        ApiSpec('Android', 'android.view', 'ContextThemeWrapper', parent_class='ContextWrapper',
+                methods=[method('setTheme', 'int')]),
+        ApiSpec('Android', 'android.view', 'Window.Callback', 'interface',
+                methods=[method('onWindowFocusChanged', 'boolean')]),
+        ApiSpec('Android', 'android.app', 'Fragment', parent_class='Object',
+                methods=[method('onCreate', 'Bundle')]),
+        ApiSpec('Android', 'android.app', 'ListFragment', parent_class='Fragment'),
+    ]
+
+
+class TestResolution(unittest.TestCase):
+    """测试名称解析"""
+
+    def setUp(self):
+        self.index = HierarchyIndex(corpus())
+        self.index.add(JavaParser().parse_file(str(REPO_ROOT / "tests/fixtures/android/app/Activity.java")))
+
+    def test_resolve_parents(self):
+        """测试父类与接口解析为全限定名"""
+        self.assertEqual(self.index.supertypes('android.app.Activity'),
+                         ('android.view.ContextThemeWrapper',))
+        self.assertEqual(self.index.superclass('android.content.Context'), 'java.lang.Object')
+        self.assertEqual(self.index.ancestors('android.app.Activity'), [
+            'android.view.ContextThemeWrapper', 'android.content.ContextWrapper',
+            'android.content.Context', 'java.lang.Object'])
+
+    def test_unresolved(self):
+        """测试语料中不存在的父类型"""
+        # 源码解析器把 Window.Callback 截断为 Window
+        self.assertEqual(self.index.unresolved('android.app.Activity'), ['Window'])
+        self.assertIsNone(self.index.resolve('Bundle'))
+
+    def test_nested_interface(self):
+        """测试内部接口名"""
+        spec = ApiSpec('Android', 'android.app', 'Dialog', interfaces=['Window.Callback'])
+        self.index.add(spec)
+        self.assertEqual(self.index.supertypes('android.app.Dialog'), ('android.view.Window.Callback',))
+
+
+class TestEffectiveMethods(unittest.TestCase):
+    """测试继承成员"""
+
+    def setUp(self):
+        self.index = HierarchyIndex(corpus())
+        self.index.add(ApiSpec('Android', 'android.app', 'Activity', parent_class='ContextThemeWrapper',
+                               interfaces=['Window.Callback'], methods=[method('onCreate', 'Bundle')]))
+
+    def test_inherited_and_overridden(self):
+        """测试继承方法与覆盖"""
+        effective = self.index.effective_methods('android.app.Activity')
+        owners = {key[0]: m.owner for key, m in effective.items()}
+        self.assertEqual(owners, {
+            'onWindowFocusChanged': 'android.view.Window.Callback',
+            'toString': 'java.lang.Object',
+            'getString': 'android.content.Context',
+            'startActivity': 'android.content.ContextWrapper',
+            'getBaseContext': 'android.content.ContextWrapper',
+            'setTheme': 'android.view.ContextThemeWrapper',
+            'onCreate': 'android.app.Activity',
+        })
+        self.assertEqual(len(self.index.inherited_methods('android.app.Activity')), 6)
+
+    def test_flattened_spec(self):
+        """测试扁平化 ApiSpec 不修改原对象"""
+        flat = self.index.flattened('android.app.Activity')
+        self.assertEqual(len(flat.methods), 7)
+        self.assertEqual(len(self.index.get('android.app.Activity').methods), 1)
+
+    def test_memoized_and_shared(self):
+        """测试每个类只计算一次, 无新增方法时共享父类映射"""
+        self.index.effective_methods('android.app.Activity')
+        computed = self.index.computed
+        self.index.effective_methods('android.app.Activity')
+        self.index.effective_methods('android.content.Context')
+        self.assertEqual(self.index.computed, computed)
+        self.assertIs(self.index.effective_methods('android.app.ListFragment'),
+                      self.index.effective_methods('android.app.Fragment'))
+
+
+class TestInvalidation(unittest.TestCase):
+    """测试增量失效"""
+
+    def setUp(self):
+        self.index = HierarchyIndex(corpus())
+        self.index.add(ApiSpec('Android', 'android.app', 'Activity', parent_class='ContextThemeWrapper'))
+        self.activity = self.index.effective_methods('android.app.Activity')
+        self.fragment = self.index.effective_methods('android.app.Fragment')
+
+    def test_parent_change_reaches_descendants_only(self):
+        """测试父类变化使子类重新计算, 其他分支保持缓存"""
+        wrapper = self.index.get('android.content.ContextWrapper')
+        wrapper.methods = wrapper.methods + [method('getAssets', return_type='AssetManager')]
+        self.index.update(wrapper)
+
+        names = {key[0] for key in self.index.effective_methods('android.app.Activity')}
+        self.assertIn('getAssets', names)
+        self.assertIs(self.index.effective_methods('android.app.Fragment'), self.fragment)
+
+    def test_late_parent_resolves(self):
+        """测试后加入的父类被解析"""
+        self.index.add(ApiSpec('Android', 'android.app', 'DialogFragment', parent_class='AppCompatFragment'))
+        self.assertEqual(self.index.ancestors('android.app.DialogFragment'), [])
+        self.index.add(ApiSpec('Android', 'androidx.fragment', 'AppCompatFragment', parent_class='Fragment',
+                               methods=[method('requireContext', return_type='Context')]))
+        self.assertEqual(self.index.ancestors('android.app.DialogFragment'),
+                         ['androidx.fragment.AppCompatFragment', 'android.app.Fragment', 'java.lang.Object'])
+
+    def test_remove(self):
+        """测试删除父类后子类失去继承成员"""
+        self.index.remove('android.view.ContextThemeWrapper')
+        self.assertEqual(dict(self.index.effective_methods('android.app.Activity')), {})
+        self.assertEqual(self.index.unresolved('android.app.Activity'), ['ContextThemeWrapper'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - Class 文件读取测试
+
+测试覆盖:
+1. 签名解析 - 描述符、泛型、通配符、内部类
+2. ApiSpec 生成 - 与源码解析器输出一致 (类型、修饰符、语义标签)
+3. 参数名 - MethodParameters / LocalVariableTable, 缺失时为 argN
+4. 归档 - 直接从 jar 条目读取, 损坏的条目报解析错误并被跳过
+"""
+
+import struct
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from class_reader import (
+    ACC_ABSTRACT, ACC_BRIDGE, ACC_FINAL, ACC_INTERFACE, ACC_PRIVATE, ACC_PROTECTED,
+    ACC_PUBLIC, ACC_STATIC, ACC_SYNTHETIC, ACC_VARARGS, ClassFileParser, parse_method_signature,
+)
+from sdk_archive import parse_archive
+from sdk_model import JavaParser
+
+
+class ClassFileBuilder:
+    """手工拼装最小 class 文件 (常量池 + 方法表)"""
+
+    def __init__(self, name, super_name='java/lang/Object', interfaces=(), access=ACC_PUBLIC):
+        self.pool = []
+        self.index = {}
+        self.name, self.super_name, self.interfaces, self.access = name, super_name, interfaces, access
+        self.methods = []
+        self.utf8('Code')
+        self.pool.append(b'\x05' + struct.pack('>q', 1))  # long 常量占两个槽位
+        self.pool.append(None)
+
+    def _add(self, key, entry):
+        if key not in self.index:
+            self.pool.append(entry)
+            self.index[key] = len(self.pool)
+        return self.index[key]
+
+    def utf8(self, text):
+        data = text.encode('utf-8')
+        return self._add(('utf8', text), b'\x01' + struct.pack('>H', len(data)) + data)
+
+    def cls(self, name):
+        return self._add(('class', name), b'\x07' + struct.pack('>H', self.utf8(name)))
+
+    def method(self, name, descriptor, access=ACC_PUBLIC, signature=None, params=None, locals_=None):
+        attrs = []
+        if signature:
+            attrs.append(struct.pack('>HIH', self.utf8('Signature'), 2, self.utf8(signature)))
+        if params:
+            body = bytes([len(params)]) + b''.join(struct.pack('>HH', self.utf8(p), 0) for p in params)
+            attrs.append(struct.pack('>HI', self.utf8('MethodParameters'), len(body)) + body)
+        if locals_:
+            table = b''.join(struct.pack('>HHHHH', 0, 1, self.utf8(n), self.utf8('I'), slot)
+                             for slot, n in locals_.items())
+            lvt = struct.pack('>HIH', self.utf8('LocalVariableTable'), 2 + len(table), len(locals_)) + table
+            code = struct.pack('>HHI', 1, 1, 1) + b'\xb1' + struct.pack('>HH', 0, 1) + lvt
+            attrs.append(struct.pack('>HI', self.utf8('Code'), len(code)) + code)
+        self.methods.append(struct.pack('>HHHH', access, self.utf8(name), self.utf8(descriptor), len(attrs))
+                            + b''.join(attrs))
+        return self
+
+    def build(self):
+        this_index, super_index = self.cls(self.name), self.cls(self.super_name)
+        ifaces = [self.cls(i) for i in self.interfaces]
+        pool = b''.join(e for e in self.pool if e is not None)
+        return (struct.pack('>IHHH', 0xCAFEBABE, 0, 52, len(self.pool) + 1) + pool
+                + struct.pack('>HHHH', self.access, this_index, super_index, len(ifaces))
+                + b''.join(struct.pack('>H', i) for i in ifaces)
+                + struct.pack('>HH', 0, len(self.methods)) + b''.join(self.methods)
+                + struct.pack('>H', 0))
+
+
+def activity_class():
+    return (ClassFileBuilder('android/app/Activity', 'android/view/ContextThemeWrapper',
+                             ['android/view/Window$Callback'])
+            .method('<init>', '()V')
+            .method('onCreate', '(Landroid/os/Bundle;)V', ACC_PROTECTED, params=['savedInstanceState'])
+            .method('getTitle', '()Ljava/lang/CharSequence;')
+            .method('setResult', '(ILandroid/content/Intent;)V', ACC_PUBLIC | ACC_FINAL,
+                    locals_={0: 'this', 1: 'resultCode', 2: 'data'})
+            .method('getNames', '()Ljava/util/List;', signature='()Ljava/util/List<Ljava/lang/String;>;')
+            .method('isFinishing', '()Z')
+            .method('mHidden', '()V', ACC_PRIVATE)
+            .method('access$000', '()V', ACC_STATIC | ACC_SYNTHETIC)
+            .method('bridge', '()Ljava/lang/Object;', ACC_PUBLIC | ACC_BRIDGE | ACC_SYNTHETIC)
+            .build())
+
+
+ACTIVITY_SOURCE = '''
+package android.app;
+
+public class Activity extends ContextThemeWrapper implements Window.Callback {
+    /** Create. */
+    protected void onCreate(Bundle savedInstanceState) {}
+    /** Title. */
+    public CharSequence getTitle() { return null; }
+    /** Result. */
+    public final void setResult(int resultCode, Intent data) {}
+    /** Names. */
+    public List<String> getNames() { return null; }
+    /** Finishing. */
+    public boolean isFinishing() { return false; }
+}
+'''
+
+
+class TestSignatures(unittest.TestCase):
+    """测试描述符与泛型签名解析"""
+
+    def test_descriptor(self):
+        """测试基本类型、数组与类类型"""
+        self.assertEqual(parse_method_signature('(I[JLjava/lang/String;[[Landroid/os/Bundle;)V'),
+                         (['int', 'long[]', 'String', 'Bundle[][]'], 'void'))
+
+    def test_generics(self):
+        """测试泛型、通配符、类型变量与内部类"""
+        params, ret = parse_method_signature(
+            '<T:Ljava/lang/Object;U::Ljava/lang/Runnable;>'
+            '(Ljava/util/Map<Ljava/lang/String;+Ljava/util/List<*>;>;TT;TU;)'
+            'Ljava/util/Map$Entry<TT;[I>;')
+        self.assertEqual(params, ['Map<String, ? extends List<?>>', 'T', 'U'])
+        self.assertEqual(ret, 'Map.Entry<T, int[]>')
+
+
+class TestClassFileParser(unittest.TestCase):
+    """测试 class 文件 -> ApiSpec"""
+
+    def setUp(self):
+        self.spec = ClassFileParser().parse_bytes(activity_class(), origin='android.jar!/Activity.class')
+
+    def test_class_header(self):
+        """测试包名、父类与接口"""
+        self.assertEqual(self.spec.package, 'android.app')
+        self.assertEqual(self.spec.class_name, 'Activity')
+        self.assertEqual(self.spec.parent_class, 'ContextThemeWrapper')
+        self.assertEqual(self.spec.interfaces, ['Window.Callback'])
+        self.assertEqual(self.spec.semantic_tags, ['type:class', 'component:activity'])
+
+    def test_matches_source_parser(self):
+        """测试方法签名、修饰符与标签和源码解析器一致 (源码解析器额外有文档注释)"""
+        source = JavaParser().parse_source(ACTIVITY_SOURCE)
+        for method in source.methods:
+            method.doc_comment = None
+        self.assertEqual(self.spec.methods, source.methods)
+        self.assertEqual(self.spec.parent_class, source.parent_class)
+
+    def test_hidden_members_skipped(self):
+        """测试构造函数、私有、合成与桥接方法被跳过"""
+        names = [m.name for m in self.spec.methods]
+        self.assertEqual(names, ['onCreate', 'getTitle', 'setResult', 'getNames', 'isFinishing'])
+
+    def test_varargs_and_missing_names(self):
+        """测试可变参数与缺失的参数名"""
+        data = (ClassFileBuilder('android/util/Log', access=ACC_PUBLIC | ACC_FINAL)
+                .method('format', '(Ljava/lang/String;[Ljava/lang/Object;)Ljava/lang/String;',
+                        ACC_PUBLIC | ACC_STATIC | ACC_VARARGS)
+                .build())
+        method = ClassFileParser().parse_bytes(data).methods[0]
+        self.assertEqual([(p.name, p.param_type) for p in method.parameters],
+                         [('arg0', 'String'), ('arg1', 'Object...')])
+        self.assertEqual(method.modifiers, ['public', 'static'])
+
+    def test_class_types(self):
+        """测试接口与抽象类"""
+        parser = ClassFileParser()
+        iface = ClassFileBuilder('a/Callback', access=ACC_PUBLIC | ACC_INTERFACE | ACC_ABSTRACT).build()
+        abstract = ClassFileBuilder('a/Base', access=ACC_PUBLIC | ACC_ABSTRACT).build()
+        self.assertEqual(parser.parse_bytes(iface).class_type, 'interface')
+        self.assertEqual(parser.parse_bytes(abstract).class_type, 'abstract_class')
+        self.assertIsNone(parser.parse_bytes(ClassFileBuilder('a/Hidden', access=0).build()))
+
+    def test_standalone_parser(self):
+        """测试 ClassFileParser 不是 JavaParser 子类, 可从文件读取"""
+        self.assertFalse(issubclass(ClassFileParser, JavaParser))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "Activity.class"
+            path.write_bytes(activity_class())
+            spec = ClassFileParser().parse_file(str(path))
+        self.assertEqual(spec.methods, self.spec.methods)
+        self.assertEqual(spec.origin, str(path))
+
+    def test_invalid_bytes(self):
+        """测试非 class 内容与截断文件"""
+        parser = ClassFileParser()
+        with self.assertRaises(ValueError):
+            parser.parse_bytes(b'package a;')
+        with self.assertRaises(ValueError):
+            parser.parse_bytes(activity_class()[:200])
+
+    def test_bad_constant_pool(self):
+        """测试未知常量池标记与悬空索引报解析错误, 归档中跳过该文件"""
+        parser = ClassFileParser()
+        data = bytearray(activity_class())
+        data[10] = 2   # 第一个常量池条目改为未定义的标记
+        with self.assertRaises(ValueError):
+            parser.parse_bytes(bytes(data))
+        dangling = ClassFileBuilder('a/Dangling')
+        dangling.methods.append(struct.pack('>HHHH', ACC_PUBLIC, 999, 999, 0))   # 名称索引越界
+        with self.assertRaises(ValueError):
+            parser.parse_bytes(dangling.build())
+        with tempfile.TemporaryDirectory() as tmp:
+            jar = str(Path(tmp) / "android.jar")
+            with zipfile.ZipFile(jar, 'w') as zf:
+                zf.writestr("android/app/Activity.class", activity_class())
+                zf.writestr("android/app/Broken.class", bytes(data))
+            specs = parse_archive(jar)
+        self.assertEqual([s.class_name for s in specs], ['Activity'])
+
+    def test_from_jar(self):
+        """测试从 jar 条目直接读取"""
+        with tempfile.TemporaryDirectory() as tmp:
+            jar = str(Path(tmp) / "android.jar")
+            with zipfile.ZipFile(jar, 'w') as zf:
+                zf.writestr("android/app/Activity.class", activity_class())
+                zf.writestr("android/app/package-info.class",
+                            ClassFileBuilder('android/app/package-info',
+                                             access=ACC_INTERFACE | ACC_ABSTRACT | ACC_SYNTHETIC).build())
+            specs = parse_archive(jar)
+        self.assertEqual([s.class_name for s in specs], ['Activity'])
+        self.assertEqual(specs[0].methods, self.spec.methods)
+
+
+if __name__ == '__main__':
+    unittest.main()
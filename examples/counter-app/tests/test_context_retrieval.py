@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 检索式提示词上下文测试
+
+测试覆盖:
+1. 名称切分 - 驼峰/缩写拆分为名称词元
+2. 候选检索 - 跨类找到目标方法 (finish -> UIAbilityContext.terminateSelf), 规则映射优先, 结果按签名缓存, 重载方法分别检索
+3. 提示词集成 - 目标方法段只列出检索到的候选, 裁剪时保留候选
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from context_retrieval import MethodRetriever, name_tokens
+from ets_scanner import TargetIndex, scan_source
+from prompt_renderer import PromptRenderer
+from sdk_model import ApiSpec, MethodSpec, ParameterSpec
+
+TARGET_SDK = {
+    'ohos.app': '''export default class UIAbility {
+  onCreate(want: Want, launchParam: AbilityConstant.LaunchParam): void {}
+  onWindowStageCreate(windowStage: WindowStage): void {}
+  onForeground(): void {}
+  onBackground(): void {}
+  onDestroy(): void {}
+}''',
+    'ohos.app.ability': '''export default class UIAbilityContext {
+  /** Stops the ability itself. */
+  terminateSelf(): Promise<void> {}
+  startAbility(want: Want): Promise<void> {}
+  getApplicationContext(): ApplicationContext {}
+}''',
+    'ohos.app.want': '''export default class Want {
+  setParam(key: string, value: Object): void {}
+  getParam(key: string): Object {}
+  setAction(action: string): void {}
+}''',
+    'ohos.window': '''export default class Window {
+  setUIContent(path: string): Promise<void> {}
+  setWindowBackgroundColor(color: string): void {}
+  getWindowProperties(): WindowProperties {}
+}''',
+}
+
+
+def target_index():
+    return TargetIndex([spec for package, source in TARGET_SDK.items() for spec in scan_source(source, package)])
+
+
+def method(name, *params, return_type='void'):
+    return MethodSpec(name, return_type, [ParameterSpec(f'p{i}', t) for i, t in enumerate(params)], ['public'])
+
+
+class TestRetrieval(unittest.TestCase):
+    """测试候选检索"""
+
+    def setUp(self):
+        self.retriever = MethodRetriever(target_index())
+
+    def top(self, m, k=3):
+        return [c.qualified_name for c in self.retriever.top_k(m, k)]
+
+    def test_name_tokens(self):
+        """测试名称切分"""
+        self.assertEqual(name_tokens('terminateSelf'), ['terminate', 'self'])
+        self.assertEqual(name_tokens('setUIContent'), ['set', 'ui', 'content'])
+        self.assertEqual(name_tokens('getURL'), ['get', 'url'])
+
+    def test_cross_class_candidates(self):
+        """测试目标方法位于其他类时仍能检索到"""
+        self.assertEqual(self.top(method('finish'))[0], 'UIAbilityContext.terminateSelf')
+        self.assertEqual(self.top(method('startActivity', 'Intent'))[0], 'UIAbilityContext.startAbility')
+        self.assertEqual(self.top(method('putExtra', 'String', 'String', return_type='Intent'))[0],
+                         'Want.setParam')
+        self.assertEqual(self.top(method('setContentView', 'int'))[0], 'Window.setUIContent')
+
+    def test_rule_mapping_first(self):
+        """测试生命周期映射指向的方法排在首位"""
+        self.assertEqual(self.top(method('onResume'))[0], 'UIAbility.onForeground')
+        retriever = MethodRetriever(target_index(), method_rules={'onCreate': 'onWindowStageCreate'})
+        self.assertEqual(retriever.top_k(method('onCreate', 'Bundle'))[0].qualified_name,
+                         'UIAbility.onWindowStageCreate')
+
+    def test_top_k_and_no_evidence(self):
+        """测试返回数量上限, 没有名称证据时不返回候选"""
+        self.assertLessEqual(len(self.top(method('getApplicationContext', return_type='Context'), k=2)), 2)
+        self.assertEqual(self.top(method('frobnicate', 'int')), [])
+
+    def test_cached(self):
+        """测试相同签名的检索结果被缓存"""
+        first = self.retriever.top_k(method('finish'))
+        self.assertIs(self.retriever.top_k(method('finish')), first)
+        self.assertEqual((self.retriever.hits, self.retriever.misses), (1, 1))
+
+    def test_overloads_kept_apart(self):
+        """测试重载方法按签名分别返回候选, 不互相覆盖"""
+        spec = ApiSpec('Android', 'android.app', 'Activity',
+                       methods=[method('startActivity', 'Intent'), method('startActivity', 'Intent', 'Bundle')])
+        found = self.retriever.retrieve(spec)
+        self.assertEqual(sorted(found), ['startActivity(Intent)', 'startActivity(Intent, Bundle)'])
+        self.assertTrue(all(found.values()))
+
+
+class TestPromptContext(unittest.TestCase):
+    """测试提示词集成"""
+
+    def setUp(self):
+        targets = target_index()
+        self.spec = ApiSpec('Android', 'com.example', 'MainActivity', parent_class='Activity',
+                            methods=[method('onResume'), method('finish')])
+        self.renderer = PromptRenderer(targets=targets, retriever=MethodRetriever(targets), top_k=1)
+
+    def test_retrieved_methods_only(self):
+        """测试目标方法段只列出检索到的候选, 其他类的方法带类名"""
+        prompt = self.renderer.render(self.spec, budget=100000)
+        section = prompt.text.split('### HarmonyOS API Specification', 1)[1].split('### Mapping Rules', 1)[0]
+        self.assertIn('- onForeground(): void', section)
+        self.assertIn('- UIAbilityContext.terminateSelf(): Promise<void>', section)
+        self.assertNotIn('onBackground', section)
+        self.assertNotIn('setParam', section)
+
+    def test_trim_keeps_candidates(self):
+        """测试裁剪无关方法时保留检索到的候选"""
+        prompt = self.renderer.render(self.spec, budget=10)
+        self.assertEqual(prompt.trimmed, ['docs', 'unrelated_targets'])
+        self.assertIn('UIAbilityContext.terminateSelf', prompt.text)
+        self.assertNotIn('Stops the ability itself.', prompt.text)
+
+
+if __name__ == '__main__':
+    unittest.main()
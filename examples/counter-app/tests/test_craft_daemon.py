@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 常驻服务测试
+
+测试覆盖:
+1. 服务状态 - 解析结果按内容哈希缓存, map 返回目标类/分档/候选, generate 生成并写出适配器,
+   path / out_dir 限制在工作区根目录下
+2. Unix 套接字 - 客户端长连接往返, 错误请求返回 400, 单次请求低于 100ms, shutdown 后删除套接字,
+   已有服务时拒绝启动, 默认套接字位于私有目录
+3. HTTP 端口 - 127.0.0.1 上的同一套接口, 非 JSON 请求与陌生 Host 被拒绝
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from craft_client import DaemonClient, DaemonError, default_socket, main as client_main
+from craft_daemon import CraftDaemon, CraftService, RequestError, _private_dir
+from ets_scanner import TargetIndex, scan_source
+
+ACTIVITY = '''package com.example;
+
+public class MainActivity extends Activity {
+    /** Create. */
+    protected void onCreate(Bundle savedInstanceState) {}
+    /** Destroy. */
+    protected void onDestroy() {}
+}
+'''
+
+UNMAPPED = '''package com.example;
+
+public class Helper {
+    public void run() {}
+}
+'''
+
+UI_ABILITY = '''export default class UIAbility {
+  onCreate(want: Want): void {}
+  onWindowStageCreate(windowStage: WindowStage): void {}
+  onDestroy(): void {}
+}
+'''
+
+
+def make_service(root=None):
+    return CraftService(targets=TargetIndex(scan_source(UI_ABILITY, 'ohos.app.ability')), root=root)
+
+
+def raw_request(address, head: bytes) -> bytes:
+    """发送原始 HTTP 请求, 返回响应状态行"""
+    with socket.create_connection(address, timeout=5) as sock:
+        sock.sendall(head)
+        return sock.makefile('rb').readline()
+
+
+class TestService(unittest.TestCase):
+    """测试服务状态与请求处理"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.service = make_service()
+
+    def test_parse_cached(self):
+        """测试相同内容只解析一次"""
+        first = self.service.spec({'source': ACTIVITY})
+        hits = self.service.parse_hits
+        self.assertIs(self.service.spec({'source': ACTIVITY}), first)
+        self.assertEqual(self.service.parse_hits, hits + 1)
+        self.assertEqual(self.service.handle('parse', {'source': ACTIVITY})['class_name'], 'MainActivity')
+
+    def test_map(self):
+        """测试 map 返回目标类、分档与检索候选"""
+        result = self.service.handle('map', {'source': ACTIVITY})
+        self.assertEqual((result['target'], result['mapping_type'], result['tier']), ('UIAbility', 'direct', 'light'))
+        self.assertEqual(result['candidates']['onCreate(Bundle)'][0]['method'], 'UIAbility.onCreate')
+
+    def test_generate(self):
+        """测试 generate 生成并写出适配器, 无规则的类不生成"""
+        with tempfile.TemporaryDirectory() as out:
+            result = make_service(root=out).handle('generate', {'source': ACTIVITY, 'out_dir': out, 'prompt': True})
+            self.assertIn('adapters/com/example/MainActivityAdapter.java', result['outputs'])
+            self.assertEqual(sorted(result['written']), sorted(result['outputs']))
+            self.assertTrue(os.path.exists(os.path.join(out, 'adapters/com/example/MainActivityAdapter.ets')))
+        self.assertIn('Class name: `MainActivityAdapter`', result['prompt'])
+        self.assertEqual(self.service.handle('generate', {'source': UNMAPPED})['outputs'], {})
+
+    def test_paths_confined_to_root(self):
+        """测试 path 与 out_dir 必须位于工作区根目录下"""
+        with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as elsewhere:
+            service = make_service(root=os.path.join(root, 'ws'))
+            os.makedirs(service.root)
+            inside = os.path.join(service.root, 'MainActivity.java')
+            outside = os.path.join(elsewhere, 'MainActivity.java')
+            for path in (inside, outside):
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(ACTIVITY)
+            self.assertEqual(service.handle('parse', {'path': inside})['class_name'], 'MainActivity')
+            for payload in ({'path': outside}, {'path': os.path.join(service.root, '..', 'ws', '..', 'x.java')},
+                            {'path': '/etc/passwd'}, {'source': ACTIVITY, 'out_dir': elsewhere}):
+                with self.assertRaises(RequestError):
+                    service.handle('generate', payload)
+            self.assertEqual(os.listdir(elsewhere), ['MainActivity.java'])
+
+    def test_bad_requests(self):
+        """测试缺少源码或未知命令时报错"""
+        for command, payload in (('parse', {}), ('parse', {'source': 'int x;'}), ('compile', {})):
+            with self.assertRaises(RequestError):
+                self.service.handle(command, payload)
+
+
+class TestUnixSocket(unittest.TestCase):
+    """测试 Unix 套接字服务"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.socket_path = os.path.join(cls.tmp.name, 'craft.sock')
+        cls.daemon = CraftDaemon(make_service(), socket_path=cls.socket_path).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.daemon.stop()
+        cls.tmp.cleanup()
+
+    def test_round_trip(self):
+        """测试同一连接上的多次请求"""
+        with DaemonClient(self.socket_path) as client:
+            self.assertEqual(client.call('parse', source=ACTIVITY)['class_name'], 'MainActivity')
+            self.assertEqual(client.call('map', source=ACTIVITY)['target'], 'UIAbility')
+            self.assertGreaterEqual(client.call('status')['requests']['map'], 1)
+
+    def test_error_status(self):
+        """测试错误请求返回 400 且服务继续可用"""
+        with DaemonClient(self.socket_path) as client:
+            with self.assertRaises(DaemonError):
+                client.call('parse', source='no class here')
+            self.assertEqual(client.call('parse', source=ACTIVITY)['package'], 'com.example')
+
+    def test_latency(self):
+        """测试常驻状态下单次请求低于 100ms"""
+        with DaemonClient(self.socket_path) as client:
+            client.call('generate', source=ACTIVITY)
+            started = time.perf_counter()
+            for _ in range(20):
+                client.call('generate', source=ACTIVITY)
+            self.assertLess((time.perf_counter() - started) / 20, 0.1)
+
+
+class TestLifecycle(unittest.TestCase):
+    """测试 HTTP 端口与关闭"""
+
+    def test_http_port(self):
+        """测试 127.0.0.1 端口上的服务"""
+        with CraftDaemon(make_service(), port=0) as daemon, DaemonClient(url=daemon.url) as client:
+            self.assertEqual(client.call('map', source=ACTIVITY)['tier'], 'light')
+
+    def test_http_rejects_foreign_requests(self):
+        """测试非 JSON 请求和陌生 Host (DNS rebinding) 被拒绝"""
+        body = b'{"source": ""}'
+        with CraftDaemon(make_service(), port=0) as daemon:
+            address = daemon._server.server_address
+            form = (f'POST /status HTTP/1.1\r\nHost: 127.0.0.1:{address[1]}\r\n'
+                    f'Content-Type: text/plain\r\nContent-Length: {len(body)}\r\n\r\n').encode() + body
+            self.assertIn(b' 415 ', raw_request(address, form))
+            rebound = (f'POST /status HTTP/1.1\r\nHost: evil.example:{address[1]}\r\n'
+                       f'Content-Type: application/json\r\nContent-Length: 2\r\n\r\n{{}}').encode()
+            self.assertIn(b' 403 ', raw_request(address, rebound))
+
+    def test_running_daemon_not_replaced(self):
+        """测试套接字上已有服务时拒绝启动, 残留套接字被替换"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'craft.sock')
+            with CraftDaemon(make_service(), socket_path=path):
+                with self.assertRaises(OSError):
+                    CraftDaemon(make_service(), socket_path=path)
+                self.assertTrue(os.path.exists(path))
+            stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale.bind(path)
+            stale.close()
+            with CraftDaemon(make_service(), socket_path=path), DaemonClient(path) as client:
+                self.assertIn('pid', client.call('status'))
+
+    def test_default_socket_private(self):
+        """测试默认套接字位于 $XDG_RUNTIME_DIR 或按用户的私有目录"""
+        saved = dict(os.environ)
+        try:
+            os.environ['XDG_RUNTIME_DIR'] = '/run/user/1000'
+            self.assertEqual(default_socket(), '/run/user/1000/craft-daemon.sock')
+            del os.environ['XDG_RUNTIME_DIR']
+            with tempfile.TemporaryDirectory() as tmp:
+                os.environ['TMPDIR'] = tmp
+                path = default_socket()
+                self.assertEqual(os.path.dirname(path), os.path.join(tmp, f'craft-{os.getuid()}'))
+                _private_dir(os.path.dirname(path))
+                self.assertEqual(os.stat(os.path.dirname(path)).st_mode & 0o777, 0o700)
+                os.chmod(os.path.dirname(path), 0o755)
+                with self.assertRaises(PermissionError):
+                    _private_dir(os.path.dirname(path))
+        finally:
+            os.environ.clear()
+            os.environ.update(saved)
+
+    def test_client_missing_source(self):
+        """测试客户端读取源文件失败时报错退出而不是抛出异常"""
+        self.assertEqual(client_main(['parse', '/nonexistent/Foo.java']), 1)
+
+    def test_shutdown(self):
+        """测试 shutdown 请求停止服务并删除套接字"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'craft.sock')
+            daemon = CraftDaemon(make_service(), socket_path=path).start()
+            with DaemonClient(path) as client:
+                self.assertTrue(client.call('shutdown')['stopping'])
+            daemon._thread.join(timeout=5)
+            self.assertFalse(os.path.exists(path))
+            with self.assertRaises(DaemonError):
+                DaemonClient(path).call('status')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,10 +9,8 @@ CRAFT Framework - 生成器测试套件
 4. OpenHarmony API 风格 - 验证使用 @ohos.xxx 导入
 """
 
-import os
 import sys
 import unittest
-import tempfile
 from pathlib import Path
 
 # 添加父目录到路径
@@ -53,69 +51,53 @@ public class MainActivity extends Activity {
 
     def test_parse_package_name(self):
         """测试包名解析"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.java', delete=False) as f:
-            f.write(self.test_java_code)
-            f.flush()
-
-            class_info = self.parser.parse_file(f.name)
-            self.assertEqual(class_info.package, 'com.example.counter')
-
-            os.unlink(f.name)
+        class_info = self.parser.parse_source(self.test_java_code)
+        self.assertEqual(class_info.package, 'com.example.counter')
 
     def test_parse_class_name(self):
         """测试类名解析"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.java', delete=False) as f:
-            f.write(self.test_java_code)
-            f.flush()
-
-            class_info = self.parser.parse_file(f.name)
-            self.assertEqual(class_info.name, 'MainActivity')
-
-            os.unlink(f.name)
+        class_info = self.parser.parse_source(self.test_java_code)
+        self.assertEqual(class_info.name, 'MainActivity')
 
     def test_parse_parent_class(self):
         """测试父类解析"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.java', delete=False) as f:
-            f.write(self.test_java_code)
-            f.flush()
-
-            class_info = self.parser.parse_file(f.name)
-            self.assertEqual(class_info.parent, 'Activity')
-
-            os.unlink(f.name)
+        class_info = self.parser.parse_source(self.test_java_code)
+        self.assertEqual(class_info.parent, 'Activity')
 
     def test_parse_methods(self):
         """测试方法解析"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.java', delete=False) as f:
-            f.write(self.test_java_code)
-            f.flush()
+        class_info = self.parser.parse_source(self.test_java_code)
+        method_names = [m.name for m in class_info.methods]
 
-            class_info = self.parser.parse_file(f.name)
-            method_names = [m.name for m in class_info.methods]
-
-            self.assertIn('onCreate', method_names)
-            self.assertIn('onClick', method_names)
-            self.assertIn('onDestroy', method_names)
-
-            os.unlink(f.name)
+        self.assertIn('onCreate', method_names)
+        self.assertIn('onClick', method_names)
+        self.assertIn('onDestroy', method_names)
 
     def test_identify_lifecycle_methods(self):
         """测试生命周期方法识别"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.java', delete=False) as f:
-            f.write(self.test_java_code)
-            f.flush()
-
-            class_info = self.parser.parse_file(f.name)
-
-            for method in class_info.methods:
-                if method.name == 'onCreate':
-                    self.assertTrue(method.is_lifecycle)
-                elif method.name == 'onDestroy':
-                    self.assertTrue(method.is_lifecycle)
-                elif method.name == 'onClick':
-                    self.assertFalse(method.is_lifecycle)
-
-            os.unlink(f.name)
+        class_info = self.parser.parse_source(self.test_java_code)
+
+        for method in class_info.methods:
+            if method.name == 'onCreate':
+                self.assertTrue(method.is_lifecycle)
+            elif method.name == 'onDestroy':
+                self.assertTrue(method.is_lifecycle)
+            elif method.name == 'onClick':
+                self.assertFalse(method.is_lifecycle)
+
+    def test_parse_bytes(self):
+        """测试字节内容解析 (含 BOM) 并记录来源"""
+        data = b'\xef\xbb\xbf' + self.test_java_code.encode('utf-8')
+        class_info = self.parser.parse_bytes(data, origin='sources.jar!/MainActivity.java')
+        self.assertEqual(class_info.package, 'com.example.counter')
+        self.assertEqual(class_info.origin, 'sources.jar!/MainActivity.java')
+
+    def test_parse_file_matches_source(self):
+        """测试 parse_file 与 parse_source 结果一致"""
+        path = Path(__file__).parent.parent / "android/app/src/main/java/com/example/counter/MainActivity.java"
+        from_file = self.parser.parse_file(str(path))
+        from_source = self.parser.parse_source(path.read_text(encoding='utf-8'), origin=str(path))
+        self.assertEqual(from_file, from_source)
 
 
 class TestApiMapping(unittest.TestCase):
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - ArkTS 声明扫描测试
+
+测试覆盖:
+1. 目标 SDK 夹具 - UIAbility.ets 的方法、参数、文档与语义标签
+2. 声明语法 - .d.ts 命名空间、接口、类型字面量、可选/剩余参数
+3. 方法体跳过 - 模板字符串、对象字面量中的括号不影响声明
+4. 目标索引 - 按类名和方法名查找
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ets_scanner import EtsDeclarationParser, load_target_index, package_for, scan_source
+from sdk_model import REPO_ROOT
+
+UI_ABILITY = REPO_ROOT / "tests/fixtures/harmony/ability/UIAbility.ets"
+
+DECLARATIONS = '''
+/**
+ * The context of an ability.
+ */
+declare namespace common {
+    /** Ability context. */
+    export interface UIAbilityContext extends Context, EventHub {
+        /** Terminate the ability. */
+        terminateSelf(): Promise<void>;
+        terminateSelf(callback: AsyncCallback<void>): void;
+        startAbility(want: Want, options?: StartOptions): Promise<void>;
+        readonly abilityInfo: AbilityInfo;
+        on(type: 'abilityLifecycle', callback: { onCreate: (a: number) => void }): number;
+    }
+    function createModuleContext(context: Context, moduleName: string): Context;
+}
+export default common;
+'''
+
+COMPONENT = '''
+@Entry
+@Component
+struct Index {
+  @State message: string = 'Hello'
+  private timer: number = 0
+  private format = (n: number) => { return `${n}}` }
+
+  aboutToAppear() {
+    const text = `}} ${ { a: '{' }.a } {`;
+    if (text) { console.log('{'); }
+  }
+
+  build() {
+    Column() { Text(this.message) }
+  }
+
+  log(...args: string[]): void {}
+}
+'''
+
+
+class TestTargetFixture(unittest.TestCase):
+    """测试目标 SDK 夹具"""
+
+    def setUp(self):
+        self.specs = EtsDeclarationParser('ohos.app.ability').scan_file(str(UI_ABILITY))
+        self.ability = self.specs[0]
+        self.methods = {m.name: m for m in self.ability.methods}
+
+    def test_declarations(self):
+        """测试类与接口声明"""
+        self.assertEqual([(s.class_name, s.class_type) for s in self.specs],
+                         [('UIAbility', 'class'), ('AbilityResult', 'interface'), ('Context', 'interface')])
+        self.assertEqual(self.ability.platform, 'Harmony')
+        self.assertEqual(self.ability.package, 'ohos.app.ability')
+        self.assertIn('component:uiability', self.ability.semantic_tags)
+
+    def test_methods(self):
+        """测试方法签名, 跳过私有字段"""
+        self.assertEqual(len(self.ability.methods), 13)
+        on_create = self.methods['onCreate']
+        self.assertEqual([(p.name, p.param_type) for p in on_create.parameters],
+                         [('want', 'Want'), ('launchParam', 'AbilityConstant.LaunchParam')])
+        self.assertEqual(on_create.return_type, 'void')
+        self.assertIn('lifecycle:onCreate', on_create.semantic_tags)
+        self.assertEqual(self.methods['getWindowStage'].return_type, 'window.WindowStage | null')
+        self.assertEqual(self.methods['terminateSelf'].doc_comment, 'Terminate this ability.')
+        self.assertEqual(self.methods['startAbilityForResult'].return_type, 'Promise<AbilityResult>')
+
+    def test_default_export(self):
+        """测试 parse_file 返回默认导出类"""
+        spec = EtsDeclarationParser('ohos.app.ability').parse_file(str(UI_ABILITY))
+        self.assertEqual(spec.class_name, 'UIAbility')
+
+
+class TestDeclarationSyntax(unittest.TestCase):
+    """测试声明语法"""
+
+    def test_namespace_and_interface(self):
+        """测试命名空间中的接口、重载、可选参数与类型字面量"""
+        specs = {s.class_name: s for s in scan_source(DECLARATIONS, 'ohos.app.ability.common')}
+        context = specs['common.UIAbilityContext']
+        self.assertEqual(context.interfaces, ['Context', 'EventHub'])
+        self.assertEqual([m.name for m in context.methods],
+                         ['terminateSelf', 'terminateSelf', 'startAbility', 'on'])
+        options = context.methods[2].parameters[1]
+        self.assertEqual((options.name, options.param_type, options.nullable), ('options', 'StartOptions', True))
+        self.assertEqual(context.methods[3].parameters[1].param_type, '{ onCreate: (a: number) => void }')
+        self.assertEqual(context.methods[0].doc_comment, 'Terminate the ability.')
+
+        namespace = specs['common']
+        self.assertEqual(namespace.class_type, 'namespace')
+        self.assertEqual([m.name for m in namespace.methods], ['createModuleContext'])
+
+    def test_bodies_skipped(self):
+        """测试方法体、模板字符串与箭头函数属性被跳过"""
+        spec = scan_source(COMPONENT)[0]
+        self.assertEqual((spec.class_name, spec.class_type), ('Index', 'struct'))
+        self.assertIn('decorator:Entry', spec.semantic_tags)
+        self.assertEqual([m.name for m in spec.methods], ['aboutToAppear', 'build', 'log'])
+        rest = spec.methods[2].parameters[0]
+        self.assertEqual((rest.name, rest.param_type), ('args', 'string[]'))
+
+    def test_package_from_module_name(self):
+        """测试 @ohos 模块文件名推导包名"""
+        self.assertEqual(package_for('/sdk/api/@ohos.app.ability.UIAbility.d.ts'), 'ohos.app.ability')
+        self.assertEqual(package_for('/sdk/api/@ohos.app.ability.common.d.ts'), 'ohos.app.ability.common')
+
+    def test_package_from_directories(self):
+        """测试目录推导包名只认完整路径段"""
+        self.assertEqual(package_for('/work/openharmony-sdk/ets/ohos/app/Button.ets'), 'ohos.app')
+        self.assertEqual(package_for('/home/ohos_tools/sdk/@ohos.arkui/Button.d.ets'), 'ohos.arkui')
+        self.assertEqual(package_for('/work/harmonyohos/Button.ets'), 'ohos')
+
+    def test_generic_supertypes(self):
+        """测试泛型父类与接口只保留类型名"""
+        spec = scan_source('export class Store extends Base<string, Map<string, number>> '
+                           'implements Listener<Event>, Closeable {}')[0]
+        self.assertEqual((spec.parent_class, spec.interfaces), ('Base', ['Listener', 'Closeable']))
+
+
+class TestTargetIndex(unittest.TestCase):
+    """测试目标索引"""
+
+    def test_lookup(self):
+        """测试按类名与方法名查找"""
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "@ohos.app.ability.UIAbility.d.ts").write_text(UI_ABILITY.read_text(encoding='utf-8'))
+            (Path(tmp) / "@ohos.app.ability.common.d.ts").write_text(DECLARATIONS)
+            index = load_target_index(tmp, workers=1)
+
+        self.assertIs(index.get('ohos.app.ability.UIAbility'), index.get('UIAbility'))
+        self.assertIs(index.get('UIAbilityContext'), index.get('common.UIAbilityContext'))
+        owners = {s.class_name for s, _ in index.find_methods('terminateSelf')}
+        self.assertEqual(owners, {'UIAbility', 'common.UIAbilityContext'})
+        self.assertEqual(len(index.find_methods('terminateSelf', 'UIAbilityContext')), 2)
+        self.assertEqual(index.find_methods('missing'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 生成调度器测试
+
+测试覆盖:
+1. 依赖图 - 父类与参数类型转换 (Bundle / Intent) 构成 DAG
+2. 关键路径 - 最长链优先派发
+3. 并行执行 - 依赖满足即派发, 多个 worker 同时工作, 默认在工作进程中运行
+4. 失败处理 - 失败任务的下游被跳过, 环路报错
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from generation_scheduler import (
+    DependencyGraph, Scheduler, Task, load_type_conversions, referenced_types, schedule_generation,
+)
+from sdk_model import ApiSpec, MethodSpec, ParameterSpec
+
+
+def spec(package, name, parent=None, param_types=()):
+    methods = [MethodSpec(f'm{i}', 'void', [ParameterSpec('p', t)]) for i, t in enumerate(param_types)]
+    return ApiSpec('Android', package, name, parent_class=parent, methods=methods)
+
+
+CORPUS = [
+    spec('android.content', 'Context'),
+    spec('android.content', 'ContextWrapper', 'Context'),
+    spec('android.view', 'ContextThemeWrapper', 'ContextWrapper'),
+    spec('android.app', 'Activity', 'ContextThemeWrapper', ['Bundle', 'Intent']),
+    spec('android.app', 'Fragment', None, ['Bundle']),
+    spec('android.widget', 'Toast'),
+]
+
+
+class TestDependencyGraph(unittest.TestCase):
+    """测试依赖图构建"""
+
+    def setUp(self):
+        self.graph = DependencyGraph.from_corpus(CORPUS)
+
+    def test_edges(self):
+        """测试父类与类型转换依赖"""
+        self.assertEqual(self.graph.tasks['class:android.app.Activity'].deps,
+                         {'class:android.view.ContextThemeWrapper', 'type:Bundle', 'type:Intent'})
+        self.assertEqual(self.graph.tasks['type:Intent'].payload, 'ohos.app.Want')
+        self.assertEqual(self.graph.tasks['class:android.app.Fragment'].deps, {'type:Bundle'})
+
+    def test_topological_order(self):
+        """测试拓扑顺序满足全部依赖"""
+        order = self.graph.topological_order()
+        position = {key: i for i, key in enumerate(order)}
+        for key, task in self.graph.tasks.items():
+            for dep in task.deps:
+                self.assertLess(position[dep], position[key])
+
+    def test_critical_path(self):
+        """测试关键路径长度"""
+        lengths = self.graph.critical_path()
+        self.assertEqual(lengths['class:android.content.Context'], 1 + 1 + 1 + 3)
+        self.assertGreater(lengths['class:android.content.Context'], lengths['class:android.widget.Toast'])
+
+    def test_cycle(self):
+        """测试环路"""
+        graph = DependencyGraph()
+        for key in ('a', 'b'):
+            graph.add_task(Task(key, 'class', key))
+        graph.add_dependency('a', 'b')
+        graph.add_dependency('b', 'a')
+        with self.assertRaisesRegex(ValueError, 'a, b'):
+            graph.topological_order()
+
+    def test_type_rules(self):
+        """测试从 mapping_rules.yaml 读取类型转换"""
+        conversions = load_type_conversions()
+        self.assertEqual(conversions['Bundle'], 'ohos.app.AbilityConstant.LaunchParam')
+        self.assertEqual(conversions['Bitmap'], 'ohos.image.PixelMap')
+        self.assertEqual(referenced_types(spec('a', 'B', param_types=['Map<String, Bitmap[]>'])),
+                         {'void', 'Map', 'String', 'Bitmap'})
+
+
+def task_name(task):
+    return task.name
+
+
+def task_pid(task):
+    return os.getpid()
+
+
+def fail_context_wrapper(task):
+    """在工作进程中运行, 因此定义在模块级"""
+    if task.name == 'android.content.ContextWrapper':
+        raise RuntimeError('boom')
+    return task.name
+
+
+class TestScheduler(unittest.TestCase):
+    """测试调度执行"""
+
+    def test_critical_path_first(self):
+        """测试单 worker 时最长链的起点最先派发, 独立的短任务最后"""
+        scheduler = schedule_generation(CORPUS, task_name, workers=1)
+        self.assertEqual(scheduler.dispatched[0], 'class:android.content.Context')
+        self.assertEqual(scheduler.dispatched[-1], 'class:android.widget.Toast')
+        self.assertEqual(len(scheduler.results), 8)
+
+    def test_parallel_respects_dependencies(self):
+        """测试并行执行时依赖先完成, 且有多个任务同时运行"""
+        finished, lock = set(), threading.Lock()
+        active, peak = [0], [0]
+        graph = DependencyGraph.from_corpus(CORPUS)
+
+        def work(task):
+            with lock:
+                for dep in task.deps:
+                    self.assertIn(dep, finished)
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+                finished.add(task.key)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:   # work() shares state with the test
+            Scheduler(graph, workers=4, executor=pool).run(work)
+        self.assertEqual(len(finished), len(graph.tasks))
+        self.assertGreater(peak[0], 1)
+
+    def test_default_pool_uses_processes(self):
+        """测试默认执行器是进程池 (CPU 密集的生成不受 GIL 限制)"""
+        scheduler = schedule_generation(CORPUS, task_pid, workers=2)
+        self.assertNotIn(os.getpid(), scheduler.results.values())
+
+    def test_failure_skips_dependents(self):
+        """测试失败任务的下游被跳过, 其他分支继续"""
+        scheduler = schedule_generation(CORPUS, fail_context_wrapper, workers=2)
+        self.assertIn('class:android.content.ContextWrapper', scheduler.errors)
+        self.assertEqual(scheduler.skipped, {'class:android.view.ContextThemeWrapper', 'class:android.app.Activity'})
+        self.assertIn('class:android.app.Fragment', scheduler.results)
+
+
+if __name__ == '__main__':
+    unittest.main()
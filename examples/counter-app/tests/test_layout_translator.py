@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 布局转换器测试
+
+测试覆盖:
+1. 组件映射 - 来自 mapping_rules.yaml, LinearLayout 按方向映射, View 映射为 Column
+2. 属性转换 - 尺寸、边距、颜色、字体、@android: 系统资源
+3. 子树缓存 - 重复控件只转换一次, 缓存键只包含子树自身的点击事件
+4. 页面生成 - generate_page 由布局驱动
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from android_xml import load_xml, parse_xml
+from craft_generate import ClassInfo, HarmonyGenerator, JavaParser
+from layout_translator import LayoutTranslator, load_component_mapping, translate_layouts
+
+PROJECT_DIR = Path(__file__).parent.parent
+RES_DIR = PROJECT_DIR / "android/app/src/main/res"
+MAIN_ACTIVITY = PROJECT_DIR / "android/app/src/main/java/com/example/counter/MainActivity.java"
+
+
+class TestComponentMapping(unittest.TestCase):
+    """测试组件映射"""
+
+    def test_mapping_from_rules(self):
+        """测试从 mapping_rules.yaml 读取映射"""
+        mapping = load_component_mapping()
+        self.assertEqual(mapping['TextView'], 'Text')
+        self.assertEqual(mapping['Button'], 'Button')
+        self.assertEqual(mapping['LinearLayout'], 'Column/Row')
+
+    def test_linear_layout_orientation(self):
+        """测试 LinearLayout 按 orientation 映射到 Column/Row"""
+        translator = LayoutTranslator()
+        vertical = parse_xml('<LinearLayout android:orientation="vertical"/>').root
+        horizontal = parse_xml('<LinearLayout/>').root
+        self.assertIn('Column()', translator.render(vertical))
+        self.assertIn('Row()', translator.render(horizontal))
+
+    def test_view_is_container(self):
+        """测试 View 映射为空容器 Column 而非不可实例化的 Component"""
+        self.assertEqual(load_component_mapping()['View'], 'Column')
+        code = LayoutTranslator().render(parse_xml('<View android:layout_height="1dp"/>').root)
+        self.assertIn('Column()', code)
+        self.assertNotIn('Component', code)
+
+    def test_unmapped_component(self):
+        """测试未映射的组件输出 TODO 并保留子节点"""
+        root = parse_xml('<com.x.Custom><TextView android:text="a"/></com.x.Custom>').root
+        code = LayoutTranslator().render(root)
+        self.assertIn('TODO', code)
+        self.assertIn("Text('a')", code)
+
+
+class TestAttributes(unittest.TestCase):
+    """测试属性转换"""
+
+    def setUp(self):
+        self.translator = LayoutTranslator()
+
+    def test_sizes_and_text(self):
+        """测试尺寸、字体与文本"""
+        node = parse_xml(
+            '<TextView android:text="It\'s" android:textSize="32sp" android:textStyle="bold" '
+            'android:layout_width="match_parent" android:layout_height="48dp" '
+            'android:layout_marginBottom="8dp" android:layout_marginTop="4dp"/>').root
+        code = self.translator.render(node)
+        self.assertIn("Text('It\\'s')", code)
+        self.assertIn('.fontSize(32)', code)
+        self.assertIn('.fontWeight(FontWeight.Bold)', code)
+        self.assertIn(".width('100%')", code)
+        self.assertIn('.height(48)', code)
+        self.assertIn('.margin({ top: 4, bottom: 8 })', code)
+
+    def test_resources(self):
+        """测试 @string / @color 资源引用"""
+        node = parse_xml('<Button android:text="@string/ok" android:textColor="@color/white"/>').root
+        code = self.translator.render(node)
+        self.assertIn("Button($r('app.string.ok'))", code)
+        self.assertIn(".fontColor($r('app.color.white'))", code)
+
+    def test_android_system_resources(self):
+        """测试 @android: 系统资源映射为字面值或 sys. 资源"""
+        node = parse_xml('<TextView android:text="@android:string/ok" android:textColor="@android:color/white" '
+                         'android:background="@android:drawable/btn_default"/>').root
+        code = self.translator.render(node)
+        self.assertIn("Text('OK')", code)
+        self.assertIn(".fontColor('#FFFFFF')", code)
+        self.assertIn("$r('sys.media.btn_default')", code)
+        self.assertNotIn('app.android', code)
+
+    def test_click_action(self):
+        """测试点击事件映射到页面方法"""
+        node = parse_xml('<Button android:id="@+id/btn_close" android:text="x"/>').root
+        code = self.translator.render(node, {'btn_close': 'finish'})
+        self.assertIn('.onClick(() => {', code)
+        self.assertIn('this.closeWindow();', code)
+
+
+class TestSubtreeMemo(unittest.TestCase):
+    """测试重复子树缓存"""
+
+    def test_repeated_subtree_rendered_once(self):
+        """测试相同结构的子树命中缓存"""
+        item = '<LinearLayout><TextView android:text="x"/><Button android:text="y"/></LinearLayout>'
+        root = parse_xml(f'<LinearLayout android:orientation="vertical">{item * 5}</LinearLayout>').root
+        translator = LayoutTranslator()
+        code = translator.render(root)
+        self.assertEqual(code.count('Row()'), 5)
+        self.assertEqual(translator.memo_hits, 4)
+
+    def test_memo_ignores_other_click_actions(self):
+        """测试页面其他控件的点击事件不影响子树缓存"""
+        item = '<LinearLayout><TextView android:text="x"/></LinearLayout>'
+        translator = LayoutTranslator()
+        first = translator.render(parse_xml(item).root, {'btn_close': 'finish'})
+        second = translator.render(parse_xml(item).root, {'btn_other': 'finish'})
+        self.assertEqual(first, second)
+        self.assertEqual(translator.memo_hits, 1)
+
+    def test_memo_keeps_own_click_actions(self):
+        """测试子树内控件的点击事件仍区分缓存"""
+        button = '<Button android:id="@+id/btn_close" android:text="x"/>'
+        translator = LayoutTranslator()
+        plain = translator.render(parse_xml(button).root)
+        clicked = translator.render(parse_xml(button).root, {'btn_close': 'finish'})
+        self.assertNotIn('onClick', plain)
+        self.assertIn('this.closeWindow();', clicked)
+
+    def test_translate_layout_dir(self):
+        """测试整个 layout 目录转换"""
+        pages = translate_layouts(str(RES_DIR / "layout"))
+        self.assertIn('activity_main', pages)
+        self.assertIn(".backgroundColor('#FF3B30')", pages['activity_main'])
+
+
+class TestLayoutDrivenPage(unittest.TestCase):
+    """测试由布局驱动的页面生成"""
+
+    def setUp(self):
+        self.class_info = JavaParser().parse_file(str(MAIN_ACTIVITY))
+        self.layout = load_xml(str(RES_DIR / "layout" / "activity_main.xml")).root
+
+    def test_parser_extracts_layout_and_clicks(self):
+        """测试解析 setContentView 与点击事件"""
+        self.assertEqual(self.class_info.layout, 'activity_main')
+        self.assertEqual(self.class_info.click_actions, {'btn_close': 'finish'})
+
+    def test_page_from_layout(self):
+        """测试页面内容来自布局"""
+        code = HarmonyGenerator().generate_page(self.class_info, self.layout)
+        self.assertIn('@Entry', code)
+        self.assertIn("Text('Hello World')", code)
+        self.assertIn("Button('关闭窗口')", code)
+        self.assertIn('closeWindow(): void', code)
+        self.assertIn('terminateSelf', code)
+
+    def test_page_without_clicks_has_no_context(self):
+        """测试没有点击事件时不生成 context 和 closeWindow"""
+        info = ClassInfo('a', 'A', 'Activity', layout='main')
+        code = HarmonyGenerator().generate_page(info, self.layout)
+        self.assertNotIn('closeWindow', code)
+        self.assertNotIn('@ohos.app.ability.common', code)
+
+
+if __name__ == '__main__':
+    unittest.main()
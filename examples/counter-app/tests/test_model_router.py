@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 模型路由测试
+
+测试覆盖:
+1. 任务构建 - 从 mapping_rules.yaml 取映射类型与置信度, 子类沿用父类规则, 统计无转换的类型
+2. 评分与分档 - 生命周期/委托类走轻量模型, 语义映射走标准模型, 桥接/垫片/低置信度走高级模型
+3. 升级 - 校验失败逐级升级, 最高档仍失败时返回失败结果
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_client import AiClient, AiConfig, Completion
+from model_router import ModelRouter, build_job, complexity_score, load_class_rules
+from sdk_model import ApiSpec, MethodSpec, ParameterSpec
+
+
+def method(name, *param_types):
+    return MethodSpec(name, 'void', [ParameterSpec(f'p{i}', t) for i, t in enumerate(param_types)], ['public'])
+
+
+def spec(package, name, parent=None, methods=()):
+    return ApiSpec('Android', package, name, parent_class=parent, methods=list(methods))
+
+
+MAIN_ACTIVITY = spec('com.example', 'MainActivity', 'Activity',
+                     [method('onCreate', 'Bundle'), method('onResume'), method('onDestroy'), method('finish')])
+
+
+class ModelBackend:
+    """按模型返回不同结果的后端"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.models = []
+
+    def complete(self, model, prompt, max_tokens, temperature):
+        self.models.append(model)
+        return Completion(self.answers.get(model, 'class Ok {}'), model)
+
+
+class TestJobs(unittest.TestCase):
+    """测试任务构建"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rules = load_class_rules()
+
+    def test_rule_types(self):
+        """测试规则分区决定映射类型, unsupported 列表为垫片"""
+        self.assertEqual(self.rules['android.app.Activity']['mapping_type'], 'direct')
+        self.assertEqual(self.rules['android.widget.Toast']['mapping_type'], 'semantic')
+        self.assertEqual(self.rules['android.webkit.WebView']['mapping_type'], 'bridge')
+        self.assertEqual(self.rules['android.app.AppWidgetProvider']['mapping_type'], 'shim')
+
+    def test_subclass_uses_parent_rule(self):
+        """测试应用子类沿用父类的规则"""
+        job = build_job(MAIN_ACTIVITY, self.rules)
+        self.assertEqual((job.mapping_type, job.confidence, job.unmapped_types), ('direct', 0.95, []))
+
+    def test_unmapped_types(self):
+        """测试没有转换规则的签名类型被统计, 无规则的类为垫片"""
+        job = build_job(spec('com.example', 'Sensor', None, [method('register', 'SensorListener', 'int')]),
+                        self.rules)
+        self.assertEqual((job.mapping_type, job.unmapped_types), ('shim', ['SensorListener']))
+
+
+class TestRouting(unittest.TestCase):
+    """测试评分与分档"""
+
+    def setUp(self):
+        self.rules = load_class_rules()
+        self.router = ModelRouter(AiConfig())
+
+    def tier(self, spec_):
+        return self.router.tier_for(build_job(spec_, self.rules))
+
+    def test_tiers(self):
+        """测试各类任务的分档"""
+        self.assertEqual(self.tier(MAIN_ACTIVITY), 'light')
+        self.assertEqual(self.tier(spec('android.widget', 'Toast', None, [method('show')])), 'standard')
+        self.assertEqual(self.tier(spec('android.database.sqlite', 'SQLiteDatabase', None,
+                                        [method('execSQL', 'String')])), 'advanced')
+        self.assertEqual(self.tier(spec('android.app', 'AppWidgetProvider')), 'advanced')
+
+    def test_signals_raise_score(self):
+        """测试方法数与无转换类型提高评分"""
+        base = build_job(MAIN_ACTIVITY, self.rules)
+        busy = build_job(spec('com.example', 'MainActivity', 'Activity',
+                              MAIN_ACTIVITY.methods + [method(f'helper{i}', f'Custom{i}') for i in range(3)]),
+                         self.rules)
+        self.assertGreater(complexity_score(busy), complexity_score(base))
+        self.assertEqual(self.router.tier_for(busy), 'standard')
+
+    def test_models_from_config(self):
+        """测试分档对应 craft_config.yaml 中的模型"""
+        router = ModelRouter.from_config()
+        config = AiConfig.load()
+        self.assertEqual([router.model(t) for t in ('light', 'standard', 'advanced')],
+                         [config.model_light, config.model_standard, config.model_advanced])
+        self.assertEqual(router.min_confidence, 0.7)
+
+
+class TestEscalation(unittest.TestCase):
+    """测试校验失败时升级"""
+
+    def setUp(self):
+        self.config = AiConfig(rate_limit_rpm=100000)
+        self.router = ModelRouter(self.config)
+        self.job = build_job(MAIN_ACTIVITY, load_class_rules())
+
+    def test_escalate_one_tier(self):
+        """测试轻量模型结果校验失败后改用标准模型"""
+        backend = ModelBackend({self.config.model_light: 'class Broken {'})
+        result = self.router.generate(AiClient(self.config, backend), self.job, 'prompt')
+        self.assertTrue(result.passed)
+        self.assertEqual((result.tier, result.attempts), ('standard', ['light', 'standard']))
+        self.assertEqual(backend.models, [self.config.model_light, self.config.model_standard])
+        self.assertEqual((self.router.routed['light'], self.router.escalations), (1, 1))
+
+    def test_all_tiers_fail(self):
+        """测试最高档仍失败时返回失败结果"""
+        backend = ModelBackend({m: 'no code' for m in (self.config.model_light, self.config.model_standard,
+                                                       self.config.model_advanced)})
+        result = self.router.generate(AiClient(self.config, backend), self.job, 'prompt')
+        self.assertFalse(result.passed)
+        self.assertEqual(result.attempts, ['light', 'standard', 'advanced'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,13 +12,31 @@ import os
 import re
 import sys
 import unittest
+from functools import lru_cache
 from pathlib import Path
 
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from syntax_scanner import scan
+
 # 项目根目录
 PROJECT_DIR = Path(__file__).parent.parent
 HARMONY_DIR = PROJECT_DIR / "harmony/entry/src/main/ets"
 
 
+@lru_cache(maxsize=None)
+def read_source(path: Path) -> str:
+    """每个文件只读取一次, 供所有测试类共享"""
+    return path.read_text()
+
+
+@lru_cache(maxsize=None)
+def scan_source(path: Path):
+    """每个文件只做一次词法括号扫描"""
+    return scan(read_source(path))
+
+
 class TestEtsFilesExist(unittest.TestCase):
     """测试 .ets 文件存在"""
 
@@ -42,9 +60,9 @@ class TestOpenHarmonyImports(unittest.TestCase):
     """测试 OpenHarmony 导入语法"""
 
     def setUp(self):
-        self.ability_code = (HARMONY_DIR / "EntryAbility.ets").read_text()
-        self.page_code = (HARMONY_DIR / "pages/Index.ets").read_text()
-        self.adapter_code = (HARMONY_DIR / "adapters/MainActivityAdapter.ets").read_text()
+        self.ability_code = read_source(HARMONY_DIR / "EntryAbility.ets")
+        self.page_code = read_source(HARMONY_DIR / "pages/Index.ets")
+        self.adapter_code = read_source(HARMONY_DIR / "adapters/MainActivityAdapter.ets")
 
     def test_ability_imports_valid(self):
         """测试 UIAbility 导入语法有效"""
@@ -91,9 +109,9 @@ class TestArkTSSyntax(unittest.TestCase):
     """测试 ArkTS 语法正确性"""
 
     def setUp(self):
-        self.ability_code = (HARMONY_DIR / "EntryAbility.ets").read_text()
-        self.page_code = (HARMONY_DIR / "pages/Index.ets").read_text()
-        self.adapter_code = (HARMONY_DIR / "adapters/MainActivityAdapter.ets").read_text()
+        self.ability_code = read_source(HARMONY_DIR / "EntryAbility.ets")
+        self.page_code = read_source(HARMONY_DIR / "pages/Index.ets")
+        self.adapter_code = read_source(HARMONY_DIR / "adapters/MainActivityAdapter.ets")
 
     def test_class_declaration_syntax(self):
         """测试类声明语法"""
@@ -180,42 +198,31 @@ class TestBracketBalance(unittest.TestCase):
             HARMONY_DIR / "adapters/MainActivityAdapter.ets",
         ]
 
-    def _check_balance(self, code, open_char, close_char):
-        """检查括号平衡"""
-        count = 0
-        for char in code:
-            if char == open_char:
-                count += 1
-            elif char == close_char:
-                count -= 1
-            if count < 0:
-                return False
-        return count == 0
+    def _check_balance(self, file_path, open_char):
+        """检查括号平衡 (忽略字符串、模板字符串和注释中的括号)"""
+        return scan_source(file_path).is_balanced(open_char)
 
     def test_curly_braces_balanced(self):
         """测试花括号平衡"""
         for file_path in self.files:
-            code = file_path.read_text()
             self.assertTrue(
-                self._check_balance(code, '{', '}'),
+                self._check_balance(file_path, '{'),
                 f"{file_path.name}: 花括号不平衡"
             )
 
     def test_parentheses_balanced(self):
         """测试圆括号平衡"""
         for file_path in self.files:
-            code = file_path.read_text()
             self.assertTrue(
-                self._check_balance(code, '(', ')'),
+                self._check_balance(file_path, '('),
                 f"{file_path.name}: 圆括号不平衡"
             )
 
     def test_square_brackets_balanced(self):
         """测试方括号平衡"""
         for file_path in self.files:
-            code = file_path.read_text()
             self.assertTrue(
-                self._check_balance(code, '[', ']'),
+                self._check_balance(file_path, '['),
                 f"{file_path.name}: 方括号不平衡"
             )
 
@@ -224,7 +231,7 @@ class TestUIAbilityLifecycle(unittest.TestCase):
     """测试 UIAbility 生命周期方法"""
 
     def setUp(self):
-        self.ability_code = (HARMONY_DIR / "EntryAbility.ets").read_text()
+        self.ability_code = read_source(HARMONY_DIR / "EntryAbility.ets")
 
     def test_has_all_lifecycle_methods(self):
         """测试包含所有生命周期方法"""
@@ -262,7 +269,7 @@ class TestArkUIComponents(unittest.TestCase):
     """测试 ArkUI 组件"""
 
     def setUp(self):
-        self.page_code = (HARMONY_DIR / "pages/Index.ets").read_text()
+        self.page_code = read_source(HARMONY_DIR / "pages/Index.ets")
 
     def test_has_column_layout(self):
         """测试有 Column 布局"""
@@ -297,8 +304,8 @@ class TestApiMappingImplementation(unittest.TestCase):
     """测试 API 映射实现"""
 
     def setUp(self):
-        self.page_code = (HARMONY_DIR / "pages/Index.ets").read_text()
-        self.adapter_code = (HARMONY_DIR / "adapters/MainActivityAdapter.ets").read_text()
+        self.page_code = read_source(HARMONY_DIR / "pages/Index.ets")
+        self.adapter_code = read_source(HARMONY_DIR / "adapters/MainActivityAdapter.ets")
 
     def test_finish_mapped_to_terminateself(self):
         """测试 finish() 映射到 terminateSelf()"""
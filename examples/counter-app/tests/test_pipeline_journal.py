@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 流水线检查点日志测试
+
+测试覆盖:
+1. 日志记录 - 追加写入, 重放还原 ApiSpec 等阶段结果, 截掉残缺的最后一行, 生成代码只记录哈希 (还原到 output_hashes, 不占用 outputs)
+2. 源文件变更 - 源文件内容变化后记录失效
+3. 断点续跑 - 已完成的项整体跳过, 部分完成的项只执行剩余阶段, 输出文件缺失时重新生成
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline_journal import Journal
+from pipeline_orchestrator import PipelineConfig, PipelineOrchestrator, WorkItem
+from sdk_model import JavaParser
+
+ACTIVITY = '''package com.example;
+
+public class {name} extends Activity {{
+    /** Create. */
+    protected void onCreate(Bundle savedInstanceState) {{}}
+    /** Destroy. */
+    protected void onDestroy() {{}}
+}}
+'''
+
+STAGES = ['parse', 'analyze', 'generate', 'write', 'verify']
+
+
+class CountingOrchestrator(PipelineOrchestrator):
+    """统计每个阶段实际执行的次数"""
+
+    def __init__(self, out_dir, journal):
+        super().__init__(PipelineConfig(batch_size=4, parallel_workers=2, max_retries=0, timeout_seconds=10),
+                         out_dir, ThreadPoolExecutor(max_workers=2), journal=journal)
+        self.calls = Counter()
+
+    def stages(self):
+        def counted(name, fn):
+            def run(item):
+                self.calls[name] += 1
+                return fn(item)
+            return run
+        return [(name, counted(name, fn), cpu) for name, fn, cpu in super().stages()]
+
+
+class JournalTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.tmp.name, 'out')
+        self.journal_path = os.path.join(self.out, '.craft-journal.jsonl')
+        self.sources = []
+        for name in ('FirstActivity', 'SecondActivity'):
+            path = os.path.join(self.tmp.name, f'{name}.java')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(ACTIVITY.format(name=name))
+            self.sources.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_pipeline(self, resume):
+        with Journal(self.journal_path, resume) as journal:
+            orchestrator = CountingOrchestrator(self.out, journal)
+            return orchestrator, asyncio.run(orchestrator.run(self.sources))
+
+
+class TestJournal(JournalTestCase):
+    """测试日志记录与重放"""
+
+    def test_round_trip(self):
+        """测试重放后还原解析结果与目标类"""
+        spec = JavaParser().parse_file(self.sources[0])
+        with Journal(self.journal_path) as journal:
+            journal.record(self.sources[0], 'parse', WorkItem(self.sources[0], spec=spec))
+            journal.record(self.sources[0], 'analyze', WorkItem(self.sources[0], target='UIAbility'))
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"source": "' + self.sources[0] + '", "stage": "gen')  # 中断时写了一半
+
+        with Journal(self.journal_path, resume=True) as journal:
+            item = WorkItem(self.sources[0])
+            self.assertEqual(journal.restore(item, STAGES), 2)
+            self.assertEqual(journal.replayed, 2)
+        self.assertEqual(item.spec, spec)
+        self.assertEqual(item.target, 'UIAbility')
+
+    def test_resume_twice_after_torn_write(self):
+        """测试残缺行被截掉, 续跑追加的记录在再次续跑时仍然有效"""
+        with Journal(self.journal_path) as journal:
+            journal.record(self.sources[0], 'parse', WorkItem(self.sources[0]))
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"source": "' + self.sources[0] + '", "stage": "ana')
+        with Journal(self.journal_path, resume=True) as journal:
+            journal.record(self.sources[1], 'parse', WorkItem(self.sources[1]))
+        with Journal(self.journal_path, resume=True) as journal:
+            self.assertEqual(journal.replayed, 2)
+            self.assertIn('parse', journal.completed(self.sources[1]))
+
+    def test_code_not_journaled(self):
+        """测试生成阶段只记录输出文件的内容哈希"""
+        self.run_pipeline(resume=False)
+        with open(self.journal_path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        outputs = next(r for r in records if r['stage'] == 'generate')['data']['outputs']
+        self.assertTrue(outputs)
+        self.assertTrue(all(len(digest) == 40 for digest in outputs.values()))
+
+    def test_hashes_restored_apart_from_code(self):
+        """测试还原的生成结果是哈希, 放在 output_hashes 中, outputs 仍只存代码"""
+        self.run_pipeline(resume=False)
+        with Journal(self.journal_path, resume=True) as journal:
+            item = WorkItem(self.sources[0])
+            self.assertEqual(journal.restore(item, STAGES, self.out), len(STAGES))
+        self.assertEqual(item.outputs, {})
+        self.assertTrue(item.output_hashes)
+        self.assertEqual(item.output_paths, list(item.output_hashes))
+
+    def test_changed_source_invalidates(self):
+        """测试源文件变化后不再复用记录"""
+        with Journal(self.journal_path) as journal:
+            journal.record(self.sources[0], 'parse', WorkItem(self.sources[0]))
+            self.assertIn('parse', journal.completed(self.sources[0]))
+            with open(self.sources[0], 'a', encoding='utf-8') as f:
+                f.write('\n// edited\n')
+            self.assertEqual(journal.completed(self.sources[0]), {})
+
+    def test_fresh_run_truncates(self):
+        """测试不带 resume 时重新开始记录"""
+        self.run_pipeline(resume=False)
+        self.run_pipeline(resume=False)
+        with open(self.journal_path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 2 * len(STAGES))
+
+
+class TestResume(JournalTestCase):
+    """测试断点续跑"""
+
+    def setUp(self):
+        super().setUp()
+        self.first, self.stats = self.run_pipeline(resume=False)
+
+    def test_completed_items_skipped(self):
+        """测试全部完成后续跑不执行任何阶段"""
+        self.assertEqual(self.first.calls, Counter({name: 2 for name in STAGES}))
+        orchestrator, stats = self.run_pipeline(resume=True)
+        self.assertEqual(sum(orchestrator.calls.values()), 0)
+        self.assertEqual((stats.resumed, stats.successful, stats.failed), (2, 2, 0))
+
+    def test_partial_item_runs_remaining_stages(self):
+        """测试中途崩溃的项只执行未完成的阶段"""
+        with open(self.journal_path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        kept = [r for r in lines if r['source'] == self.sources[0] or r['stage'] in ('parse', 'analyze')]
+        with open(self.journal_path, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(r) + '\n' for r in kept)
+
+        orchestrator, stats = self.run_pipeline(resume=True)
+        self.assertEqual(orchestrator.calls, Counter({'generate': 1, 'write': 1, 'verify': 1}))
+        self.assertEqual((stats.resumed, stats.successful), (1, 2))
+
+    def test_verify_after_restored_generate(self):
+        """测试生成与写入已还原、只剩校验的项按还原的文件列表校验"""
+        with open(self.journal_path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        kept = [r for r in lines if r['stage'] != 'verify']
+        with open(self.journal_path, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(r) + '\n' for r in kept)
+
+        orchestrator, stats = self.run_pipeline(resume=True)
+        self.assertEqual(orchestrator.calls, Counter({'verify': 2}))
+        self.assertEqual((stats.successful, stats.failed), (2, 0))
+
+    def test_missing_output_regenerated(self):
+        """测试续跑时输出文件被删除的项从生成阶段重新执行"""
+        with open(self.journal_path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        rel_path = next(iter(next(r for r in records if r['source'] == self.sources[0]
+                                  and r['stage'] == 'generate')['data']['outputs']))
+        os.remove(os.path.join(self.out, rel_path))
+        orchestrator, stats = self.run_pipeline(resume=True)
+        self.assertEqual(orchestrator.calls, Counter({'generate': 1, 'write': 1, 'verify': 1}))
+        self.assertTrue(os.path.exists(os.path.join(self.out, rel_path)))
+        self.assertEqual((stats.resumed, stats.successful), (1, 2))
+
+    def test_edited_source_reprocessed(self):
+        """测试续跑时源文件已修改的项重新处理"""
+        with open(self.sources[1], 'a', encoding='utf-8') as f:
+            f.write('\n// edited\n')
+        orchestrator, stats = self.run_pipeline(resume=True)
+        self.assertEqual(orchestrator.calls, Counter({name: 1 for name in STAGES}))
+        self.assertEqual(stats.resumed, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
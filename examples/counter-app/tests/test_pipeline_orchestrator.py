@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 流水线编排器测试
+
+测试覆盖:
+1. 配置 - 从 craft_config.yaml 的 pipeline 段读取, 缺失时使用默认值
+2. 端到端 - 解析 -> 分析 -> 生成 -> 写入 -> 校验 (按生成适配器的检查集), 未映射的类与没有公开类的文件被跳过
+3. 超时与重试 - 每项超时、暂时性错误重试、确定性错误不重试
+4. 流式执行 - 有界队列连接各阶段, 慢速下游产生背压, 同时执行的项数不超过 parallel_workers
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline_orchestrator import (
+    PipelineConfig, PipelineOrchestrator, WorkItem, discover_sources, run_pipeline,
+)
+
+ACTIVITY = '''package com.example;
+
+public class MainActivity extends Activity {
+    /** Create. */
+    protected void onCreate(Bundle savedInstanceState) {}
+    /** Destroy. */
+    protected void onDestroy() {}
+}
+'''
+
+HELPER = '''package com.example;
+
+public class Helper {
+    /** Run. */
+    public void run() {}
+}
+'''
+
+INTENT = '''package android.content;
+
+public class Intent {
+    /** Action. */
+    public String getAction() { return null; }
+}
+'''
+
+
+class TestConfig(unittest.TestCase):
+    """测试配置读取"""
+
+    def test_repo_config(self):
+        """测试仓库自带的 craft_config.yaml"""
+        config = PipelineConfig.load()
+        self.assertEqual((config.batch_size, config.parallel_workers, config.max_retries, config.timeout_seconds),
+                         (100, 10, 3, 300))
+
+    def test_custom_and_missing(self):
+        """测试自定义文件只覆盖给出的字段, 文件缺失时为默认值"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'craft.yaml')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("pipeline:\n  parallel_workers: 2\n  enable_incremental: true\n")
+            config = PipelineConfig.load(path)
+            self.assertEqual(config.parallel_workers, 2)
+            self.assertEqual(config.max_retries, 3)
+            self.assertEqual(PipelineConfig.load(os.path.join(tmp, 'missing.yaml')), PipelineConfig())
+
+
+class TestPipeline(unittest.TestCase):
+    """测试端到端运行"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, 'src')
+        self.out = os.path.join(self.tmp.name, 'out')
+        os.makedirs(self.src)
+        for name, content in (('MainActivity.java', ACTIVITY), ('Helper.java', HELPER)):
+            with open(os.path.join(self.src, name), 'w', encoding='utf-8') as f:
+                f.write(content)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_threads(self, sources, config=None):
+        config = config or PipelineConfig(batch_size=2, parallel_workers=2, max_retries=1, timeout_seconds=10)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            orchestrator = PipelineOrchestrator(config, self.out, pool)
+            return asyncio.run(orchestrator.run(sources))
+
+    def test_end_to_end(self):
+        """测试 Activity 子类生成并通过校验, 无映射的类被跳过"""
+        stats = self.run_threads(discover_sources([self.src]))
+        self.assertEqual((stats.total, stats.successful, stats.failed, stats.skipped), (2, 1, 0, 1))
+        adapter = os.path.join(self.out, 'adapters', 'com', 'example', 'MainActivityAdapter.ets')
+        with open(adapter, encoding='utf-8') as f:
+            self.assertIn('UIAbility', f.read())
+        self.assertEqual(set(stats.stage_seconds), {'parse', 'analyze', 'generate', 'write', 'verify'})
+        self.assertEqual(set(stats.queues), set(stats.stage_seconds))
+        self.assertIsNotNone(stats.first_output_seconds)
+
+    def test_non_lifecycle_class_verified(self):
+        """测试没有生命周期方法的映射类生成的适配器也通过校验"""
+        intent = os.path.join(self.src, 'Intent.java')
+        with open(intent, 'w', encoding='utf-8') as f:
+            f.write(INTENT)
+        stats = self.run_threads([intent])
+        self.assertEqual((stats.successful, stats.failed), (1, 0), stats.errors)
+        self.assertTrue(os.path.exists(os.path.join(self.out, 'adapters', 'android', 'content', 'IntentAdapter.java')))
+
+    def test_missing_source_fails_without_retry(self):
+        """测试无法读取的源文件直接记录错误 (不重试), 不影响其他项"""
+        missing = os.path.join(self.src, 'Missing.java')
+        stats = self.run_threads([missing, os.path.join(self.src, 'MainActivity.java')])
+        self.assertEqual((stats.successful, stats.failed, stats.retries), (1, 1, 0))
+        self.assertTrue(stats.errors[missing].startswith('parse:'))
+
+    def test_no_public_class_skipped(self):
+        """测试只有包级私有类的文件在解析阶段被跳过"""
+        hidden = os.path.join(self.src, 'Hidden.java')
+        with open(hidden, 'w', encoding='utf-8') as f:
+            f.write('package a;\n\nclass Hidden {}\n')
+        stats = self.run_threads([hidden])
+        self.assertEqual((stats.skipped, stats.failed, stats.retries), (1, 0, 0))
+        self.assertEqual(stats.errors, {})
+
+    def test_process_pool(self):
+        """测试使用进程池运行"""
+        config = PipelineConfig(batch_size=10, parallel_workers=2, max_retries=0, timeout_seconds=60)
+        stats = run_pipeline(discover_sources([self.src]), self.out, config)
+        self.assertEqual(stats.successful, 1)
+
+
+class TestCall(unittest.TestCase):
+    """测试单项调用的超时与重试"""
+
+    def orchestrator(self, **overrides):
+        config = PipelineConfig(**dict(dict(batch_size=10, parallel_workers=2, max_retries=2,
+                                            timeout_seconds=5), **overrides))
+        return PipelineOrchestrator(config, executor=ThreadPoolExecutor(max_workers=8))
+
+    def test_retry_then_succeed(self):
+        """测试失败后重试成功"""
+        attempts = []
+
+        def flaky(item):
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("transient")
+            return item
+
+        orchestrator = self.orchestrator()
+        item = asyncio.run(orchestrator.call(flaky, WorkItem('a')))
+        self.assertEqual(item.source, 'a')
+        self.assertEqual(orchestrator.stats.retries, 2)
+
+    def test_deterministic_error_not_retried(self):
+        """测试确定性错误只执行一次"""
+        attempts = []
+
+        def broken(item):
+            attempts.append(1)
+            raise AttributeError("bug")
+
+        orchestrator = self.orchestrator()
+        with self.assertRaises(AttributeError):
+            asyncio.run(orchestrator.call(broken, WorkItem('a')))
+        self.assertEqual((len(attempts), orchestrator.stats.retries), (1, 0))
+
+    def test_timeout(self):
+        """测试超时计数并在重试耗尽后抛出 TimeoutError"""
+        orchestrator = self.orchestrator(max_retries=1, timeout_seconds=0.05)
+        with self.assertRaises(TimeoutError):
+            asyncio.run(orchestrator.call(lambda item: time.sleep(0.3), WorkItem('slow')))
+        self.assertEqual(orchestrator.stats.timeouts, 2)
+
+
+class StubOrchestrator(PipelineOrchestrator):
+    """用自定义阶段替换真实阶段"""
+
+    def __init__(self, stages, **config):
+        super().__init__(PipelineConfig(**dict(dict(batch_size=10, parallel_workers=2, max_retries=0,
+                                                    timeout_seconds=5), **config)),
+                         executor=ThreadPoolExecutor(max_workers=8))
+        self._stages = stages
+
+    def stages(self):
+        return self._stages
+
+
+def sources(count):
+    return [str(i) for i in range(count)]
+
+
+class TestStreaming(unittest.TestCase):
+    """测试有界队列流式执行与背压"""
+
+    def test_parallel_limit(self):
+        """测试同一阶段同时执行的项数受 parallel_workers 限制"""
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def work(item):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return item
+
+        orchestrator = StubOrchestrator([('work', work, True)])
+        stats = asyncio.run(orchestrator.run(sources(10)))
+        self.assertEqual(stats.total, 10)
+        self.assertEqual(stats.queues['work']['items'], 10)
+        self.assertEqual(peak[0], 2)
+
+    def test_items_flow_through(self):
+        """测试首项在最后一项进入第一阶段之前已走完全部阶段"""
+        events = []
+
+        def stage(name):
+            def run(item):
+                events.append((name, item.source))
+                return item
+            return run
+
+        orchestrator = StubOrchestrator([(n, stage(n), True) for n in ('first', 'middle', 'last')],
+                                        batch_size=1, parallel_workers=1)
+        asyncio.run(orchestrator.run(sources(10)))
+        self.assertLess(events.index(('last', '0')), events.index(('first', '9')))
+
+    def test_backpressure(self):
+        """测试慢速下游使上游阻塞, 队列深度不超过容量"""
+        def slow(item):
+            time.sleep(0.01)
+            return item
+
+        orchestrator = StubOrchestrator([('fast', lambda item: item, True), ('slow', slow, True)],
+                                        batch_size=2, parallel_workers=1)
+        stats = asyncio.run(orchestrator.run(sources(12)))
+        self.assertLessEqual(stats.queues['slow']['peak'], 2)
+        self.assertGreater(stats.queues['slow']['blocked_seconds'], 0)
+        self.assertEqual(stats.queues['slow']['items'], 12)
+        self.assertEqual(orchestrator.metrics()['slow']['depth'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 提示词打包测试
+
+测试覆盖:
+1. 打包 - 小类合并到同一请求, 预估输出不超过 max_tokens 预算, 大类单独请求,
+   按包分组且顺序稳定, 修改一个类不影响其他包的分组
+2. 拆分 - 按 BEGIN/END 标记拆回各类代码, 兼容代码围栏
+3. 回退 - 响应缺失或无法解析的类改为单独请求, 打包段落与单类提示词使用同一上下文
+4. 日期 - 生成日期在模型返回后填入代码头部
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_client import AiClient, AiConfig, MockBackend
+from ets_scanner import TargetIndex, scan_source
+from class_hierarchy import fqn
+from prompt_packing import (
+    OUTPUT_HEADROOM, PackedGenerator, expected_output_tokens, pack_specs, packed_prompt, split_response,
+)
+from prompt_renderer import GENERATED_AT_MARK, PromptRenderer
+from sdk_model import ApiSpec, MethodSpec
+
+UI_ABILITY = '''export default class UIAbility {
+  onWindowStageCreate(windowStage: WindowStage): void {}
+  onForeground(): void {}
+}
+'''
+
+
+def spec(name, methods, package='android.app'):
+    return ApiSpec('Android', package, name,
+                   methods=[MethodSpec(f'm{i}', 'void', [], ['public']) for i in range(methods)])
+
+
+def answer_all(prompt):
+    """模拟模型: 为提示词中的每个类返回一个代码块"""
+    names = [line.split(': ', 1)[1] for line in prompt.splitlines() if line.startswith('Full Name: ')]
+    return '\n'.join(f'=== BEGIN {n} ===\n```java\nclass {n.rsplit(".", 1)[1]}Adapter {{}}\n```\n=== END {n} ==='
+                     for n in names)
+
+
+def client(backend):
+    return AiClient(AiConfig(rate_limit_rpm=100000, max_tokens=1000), backend)
+
+
+class TestPacking(unittest.TestCase):
+    """测试打包"""
+
+    def test_budget_respected(self):
+        """测试每个包的预估输出不超过预算, 且每个类恰好出现一次"""
+        specs = [spec(f'C{i}', i % 5) for i in range(20)]
+        packs = pack_specs(specs, 1000)
+        for pack in packs:
+            if len(pack) > 1:
+                self.assertLessEqual(sum(expected_output_tokens(s) for s in pack), 1000 * OUTPUT_HEADROOM)
+        self.assertEqual(sorted(s.class_name for p in packs for s in p), sorted(s.class_name for s in specs))
+        self.assertLess(len(packs), len(specs) / 2)
+
+    def test_large_class_alone(self):
+        """测试大类与超出预算的类单独成包"""
+        big, small = spec('Big', 30), [spec('A', 1), spec('B', 1)]
+        packs = pack_specs([small[0], big, small[1]], 4096)
+        self.assertEqual([[s.class_name for s in p] for p in packs], [['A', 'B'], ['Big']])
+
+    def test_stable_membership(self):
+        """测试包不跨 Java 包, 修改一个类不改变其他包的分组"""
+        specs = [spec(f'C{i}', 2, package) for package in ('com.b', 'com.a') for i in range(8)]
+        before = [[fqn(s) for s in p] for p in pack_specs(specs, 1000)]
+        self.assertTrue(all(len({name.rsplit('.', 1)[0] for name in p}) == 1 for p in before))
+        specs[0] = spec('C0', 4, 'com.b')
+        after = [[fqn(s) for s in p] for p in pack_specs(list(reversed(specs)), 1000)]
+        self.assertEqual([p for p in after if p[0].startswith('com.a.')],
+                         [p for p in before if p[0].startswith('com.a.')])
+
+    def test_input_budget(self):
+        """测试输入 token 预算限制包的大小"""
+        specs = [spec(f'C{i}', 1) for i in range(6)]
+        self.assertEqual(len(pack_specs(specs, 100000, input_budget=40)), 6)
+
+
+class TestSplit(unittest.TestCase):
+    """测试响应拆分"""
+
+    def test_split(self):
+        """测试按标记拆分, 去掉代码围栏, 忽略未请求的类"""
+        text = ('intro\n=== BEGIN a.A ===\n```java\nclass AAdapter {}\n```\n=== END a.A ===\n'
+                '=== BEGIN a.B ===\nclass BAdapter {}\n=== END a.B ===\n'
+                '=== BEGIN a.X ===\nclass X {}\n=== END a.X ===\n')
+        self.assertEqual(split_response(text, ['a.A', 'a.B']),
+                         {'a.A': 'class AAdapter {}\n', 'a.B': 'class BAdapter {}\n'})
+
+    def test_unterminated_block_dropped(self):
+        """测试缺少 END 标记与空代码块不被接受"""
+        text = '=== BEGIN a.A ===\nclass A {\n=== BEGIN a.B ===\n\n=== END a.B ===\n'
+        self.assertEqual(split_response(text, ['a.A', 'a.B']), {})
+
+
+class TestGenerator(unittest.TestCase):
+    """测试打包生成与回退"""
+
+    def test_packed_requests(self):
+        """测试 10 个小类合并为一个请求"""
+        backend = MockBackend(default=answer_all)
+        generator = PackedGenerator(client(backend), max_tokens=4096)
+        specs = [spec(f'C{i}', 2) for i in range(10)]
+        results = generator.generate(specs)
+        self.assertEqual(set(results), {f'android.app.C{i}' for i in range(10)})
+        self.assertEqual(results['android.app.C3'], 'class C3Adapter {}\n')
+        self.assertEqual(generator.stats.requests, len(backend.calls))
+        self.assertEqual(generator.stats.requests, 1)
+        self.assertEqual(generator.stats.fallbacks, 0)
+
+    def test_fallback_for_missing_classes(self):
+        """测试打包响应缺失某个类时单独请求该类"""
+        def drop_second(prompt):
+            if '=== BEGIN' in prompt:
+                return answer_all(prompt).replace('=== END android.app.B ===', '')
+            return 'class SingleAdapter {}'
+
+        backend = MockBackend(default=drop_second)
+        generator = PackedGenerator(client(backend))
+        results = generator.generate([spec('A', 1), spec('B', 1), spec('C', 1)])
+        self.assertEqual(results['android.app.B'], 'class SingleAdapter {}')
+        self.assertEqual(results['android.app.C'], 'class CAdapter {}\n')
+        self.assertEqual((generator.stats.packed_requests, generator.stats.fallbacks, generator.stats.requests),
+                         (1, 1, 2))
+
+    def test_renderer_context_in_packed_sections(self):
+        """测试使用渲染器时打包段落包含目标类、映射类型与方法映射"""
+        renderer = PromptRenderer(targets=TargetIndex(scan_source(UI_ABILITY, 'ohos.app')))
+        activity = ApiSpec('Android', 'com.example', 'MainActivity', parent_class='Activity',
+                           methods=[MethodSpec('onResume', 'void', [], ['protected'])])
+        backend = MockBackend(default=answer_all)
+        generator = PackedGenerator(client(backend), max_tokens=4096, renderer=renderer)
+        generator.generate([activity, spec('Helper', 1, 'com.example')])
+        prompt = backend.calls[0][1]
+        self.assertIn('Target: ohos.app.UIAbility', prompt)
+        self.assertIn('Mapping Type: direct', prompt)
+        self.assertIn('- onResume -> onForeground', prompt)
+        self.assertIn('- onWindowStageCreate(windowStage: WindowStage): void', prompt)
+        self.assertIs(generator.single_prompt, renderer)
+
+    def test_generation_date_stamped(self):
+        """测试模型照抄的日期占位符在返回后被替换为当天日期"""
+        backend = MockBackend(default=lambda prompt: f'/** Generated: {GENERATED_AT_MARK} */ class AAdapter {{}}')
+        code = PackedGenerator(client(backend)).generate([spec('A', 1)])['android.app.A']
+        self.assertNotIn(GENERATED_AT_MARK, code)
+        self.assertRegex(code, r'Generated: \d{4}-\d{2}-\d{2} ')
+
+    def test_prompt_lists_every_class(self):
+        """测试打包提示词包含每个类的描述与输出格式说明"""
+        prompt = packed_prompt([spec('A', 1), spec('B', 2)])
+        self.assertIn('Full Name: android.app.A', prompt)
+        self.assertIn('- public void m1()', prompt)
+        self.assertIn('=== BEGIN <Full Name> ===', prompt)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 提示词渲染测试
+
+测试覆盖:
+1. 模板编译 - 变量/属性、join 过滤器、for 循环与 loop.last、if/else、独占一行的标签不留空行
+2. 模板缓存 - 同一文件只编译一次, 文件修改后重新编译
+3. 适配器提示词 - generate_adapter.md 渲染完整, 超出预算时先删文档注释、再删无关的目标方法
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ets_scanner import TargetIndex, scan_source
+from prompt_renderer import GENERATED_AT_MARK, PromptRenderer, Template, TemplateError, load_template, stamp_generated
+from sdk_model import ApiSpec, MethodSpec, ParameterSpec
+
+UI_ABILITY = '''export default class UIAbility {
+  /** Called when the window stage is created. */
+  onWindowStageCreate(windowStage: WindowStage): void {}
+  onForeground(): void {}
+  /** Returns the ability context. */
+  getContext(): Context {}
+}
+'''
+
+
+def main_activity():
+    return ApiSpec('Android', 'com.example', 'MainActivity', parent_class='Activity', methods=[
+        MethodSpec('onCreate', 'void', [ParameterSpec('savedInstanceState', 'Bundle')], ['protected'],
+                   doc_comment='Creates the main screen.'),
+        MethodSpec('onResume', 'void', [], ['protected']),
+    ])
+
+
+class TestTemplate(unittest.TestCase):
+    """测试模板编译"""
+
+    def test_expressions(self):
+        """测试变量、属性与 join 过滤器"""
+        template = Template("{{name}}: {{method.signature}} throws {{method.throws | join(', ')}}")
+        text = template.render(name='A', method={'signature': 'void f()', 'throws': ['X', 'Y']})
+        self.assertEqual(text, 'A: void f() throws X, Y')
+
+    def test_loops_and_conditions(self):
+        """测试 for 循环、loop.last 与 if/else"""
+        template = Template("{% for p in params %}{{p.type}} {{p.name}}{% if not loop.last %}, {% endif %}"
+                            "{% endfor %}|{% if empty %}yes{% else %}no{% endif %}")
+        params = [{'type': 'int', 'name': 'a'}, {'type': 'String', 'name': 'b'}]
+        self.assertEqual(template.render(params=params, empty=[]), 'int a, String b|no')
+
+    def test_standalone_tags(self):
+        """测试独占一行的标签不产生空行"""
+        template = Template("Methods:\n{% for m in methods %}\n- {{m}}\n{% endfor %}\nEnd\n")
+        self.assertEqual(template.render(methods=['a', 'b']), 'Methods:\n- a\n- b\nEnd\n')
+
+    def test_errors(self):
+        """测试不支持的语法在编译时报错"""
+        for source in ("{{x | upper}}", "{% for x in xs %}", "{% endif %}", "{% while x %}"):
+            with self.assertRaises(TemplateError):
+                Template(source)
+
+    def test_compiled_once(self):
+        """测试模板按文件缓存, 修改后重新编译"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'prompt.md')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('v1 {{x}}')
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('v2 {{x}}')
+            os.utime(path, (os.path.getatime(path), os.path.getmtime(path) + 1))
+            self.assertEqual(load_template(path).render(x=1), 'v2 1')
+
+
+class TestAdapterPrompt(unittest.TestCase):
+    """测试适配器提示词渲染与裁剪"""
+
+    def setUp(self):
+        self.renderer = PromptRenderer(targets=TargetIndex(scan_source(UI_ABILITY, 'ohos.app')))
+        self.full = self.renderer.render(main_activity(), budget=100000)
+
+    def test_render(self):
+        """测试渲染结果包含映射信息且没有残留的模板语法"""
+        text = self.full.text
+        self.assertNotIn('{{', text)
+        self.assertNotIn('{%', text)
+        self.assertIn('- protected void onCreate(Bundle savedInstanceState)\n  - Doc: Creates the main screen.', text)
+        self.assertIn('Full Name: ohos.app.UIAbility', text)
+        self.assertIn('- onCreate -> onWindowStageCreate\n- onResume -> onForeground', text)
+        self.assertIn('Class name: `MainActivityAdapter`', text)
+        self.assertIn('Auto-generated by CRAFT v1.0.0', text)
+        self.assertEqual(self.full.trimmed, [])
+
+    def test_prompt_has_no_date(self):
+        """测试提示词不含生成日期 (跨天仍可命中缓存), 日期在生成后填入"""
+        self.assertIn(f'Generated: {GENERATED_AT_MARK}', self.full.text)
+        self.assertNotRegex(self.full.text, r'\d{4}-\d{2}-\d{2}')
+        code = f'/**\n * Generated: {GENERATED_AT_MARK}\n */\nclass A {{}}'
+        self.assertEqual(stamp_generated(code, '2026-01-01'), '/**\n * Generated: 2026-01-01\n */\nclass A {}')
+
+    def test_trim_docs_first(self):
+        """测试略超预算时只删除文档注释"""
+        prompt = self.renderer.render(main_activity(), budget=self.full.tokens - 1)
+        self.assertEqual(prompt.trimmed, ['docs'])
+        self.assertTrue(prompt.fits)
+        self.assertNotIn('Doc:', prompt.text)
+        self.assertIn('getContext(): Context', prompt.text)
+
+    def test_trim_unrelated_targets(self):
+        """测试仍超预算时删除无关的目标方法, 保留映射到的方法"""
+        prompt = self.renderer.render(main_activity(), budget=10)
+        self.assertEqual(prompt.trimmed, ['docs', 'unrelated_targets'])
+        self.assertFalse(prompt.fits)
+        self.assertNotIn('getContext', prompt.text)
+        self.assertIn('onWindowStageCreate(windowStage: WindowStage): void', prompt.text)
+        self.assertIn('protected void onResume()', prompt.text)
+
+    def test_prompt_callable(self):
+        """测试渲染器可直接作为单类提示词函数"""
+        self.assertEqual(self.renderer(main_activity()), self.renderer.render(main_activity()).text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 清单与资源转换测试
+
+测试覆盖:
+1. 值转换 - 字符串转义、xliff 占位符与样式标记、资源引用、尺寸单位、限定词目录
+2. 清单转换 - module.json5 / main_pages.json 与手写工程一致
+3. 多语言批量 - 每个输出文件只写一次, 未变化的文件不重写
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from resource_converter import (
+    ResourceConverter, convert_app, convert_dimen, convert_reference,
+    qualifier_dir, unescape_android_string,
+)
+
+PROJECT_DIR = Path(__file__).parent.parent
+ANDROID_MAIN = PROJECT_DIR / "android/app/src/main"
+HARMONY_MAIN = PROJECT_DIR / "harmony/entry/src/main"
+
+
+def write(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding='utf-8')
+
+
+class TestValueConversion(unittest.TestCase):
+    """测试值转换"""
+
+    def test_unescape(self):
+        """测试 Android 字符串转义"""
+        self.assertEqual(unescape_android_string(r"It\'s \"ok\"\n"), 'It\'s "ok"\n')
+        self.assertEqual(unescape_android_string('"  quoted  "'), '  quoted  ')
+        self.assertEqual(unescape_android_string(r'中'), '中')
+
+    def test_references_and_dimens(self):
+        """测试资源引用与尺寸单位"""
+        self.assertEqual(convert_reference('@string/app_name'), '$string:app_name')
+        self.assertEqual(convert_reference('@mipmap/ic_launcher'), '$media:ic_launcher')
+        self.assertEqual(convert_dimen('16dp'), '16vp')
+        self.assertEqual(convert_dimen('14sp'), '14fp')
+
+    def test_mixed_content_strings(self):
+        """测试 xliff 占位符与 <b> 等样式标记不丢失"""
+        with tempfile.TemporaryDirectory() as tmp:
+            write(Path(tmp) / "res/values/strings.xml",
+                  '<resources xmlns:xliff="urn:oasis:names:tc:xliff:document:1.2">'
+                  '<string name="delete">Delete <xliff:g id="n">%d</xliff:g> items</string>'
+                  '<string name="hi">Hi <b>you</b></string>'
+                  '<plurals name="n"><item quantity="other"><xliff:g id="c">%d</xliff:g> files</item></plurals>'
+                  '</resources>')
+            result = ResourceConverter(tmp).convert()
+        strings = {e['name']: e['value'] for e in result.outputs['resources/base/element/string.json']['string']}
+        self.assertEqual(strings, {'delete': 'Delete %d items', 'hi': 'Hi <b>you</b>'})
+        self.assertEqual(result.outputs['resources/base/element/plural.json']['plural'][0]['value'],
+                         [{'quantity': 'other', 'value': '%d files'}])
+
+    def test_qualifiers(self):
+        """测试 values 限定词 -> HarmonyOS 资源目录"""
+        self.assertEqual(qualifier_dir('values'), 'base')
+        self.assertEqual(qualifier_dir('values-zh-rCN'), 'zh_CN')
+        self.assertEqual(qualifier_dir('values-fr'), 'fr')
+        self.assertEqual(qualifier_dir('values-b+sr+Latn+RS'), 'sr_RS')
+        self.assertEqual(qualifier_dir('values-night'), 'dark')
+        self.assertEqual(qualifier_dir('values-en-night'), 'en-dark')
+        self.assertIsNone(qualifier_dir('values-v21'))
+
+
+class TestManifestConversion(unittest.TestCase):
+    """测试清单转换"""
+
+    def test_matches_project(self):
+        """测试 counter-app 的清单生成与工程中的 module.json5 一致"""
+        result = ResourceConverter(str(ANDROID_MAIN)).convert()
+        with open(HARMONY_MAIN / "module.json5", encoding='utf-8') as f:
+            self.assertEqual(result.outputs['module.json5'], json.load(f))
+        self.assertEqual(result.outputs['resources/base/profile/main_pages.json'], {'src': ['pages/Index']})
+
+    def test_secondary_activity(self):
+        """测试非启动 Activity 生成独立 Ability 与页面"""
+        with tempfile.TemporaryDirectory() as tmp:
+            write(Path(tmp) / "AndroidManifest.xml",
+                  '<manifest xmlns:android="http://schemas.android.com/apk/res/android">'
+                  '<application android:label="@string/app_name">'
+                  '<activity android:name=".SettingsActivity"/>'
+                  '<activity android:name=".MainActivity"><intent-filter>'
+                  '<action android:name="android.intent.action.MAIN"/>'
+                  '<category android:name="android.intent.category.LAUNCHER"/>'
+                  '</intent-filter></activity></application></manifest>')
+            write(Path(tmp) / "res/values/strings.xml",
+                  '<resources><string name="app_name">Demo</string></resources>')
+            result = ResourceConverter(tmp).convert()
+
+        module = result.outputs['module.json5']['module']
+        self.assertEqual([a['name'] for a in module['abilities']], ['EntryAbility', 'SettingsAbility'])
+        self.assertEqual(module['abilities'][0]['label'], '$string:app_name')
+        self.assertFalse(module['abilities'][1]['exported'])
+        self.assertNotIn('skills', module['abilities'][1])
+        self.assertEqual(result.outputs['resources/base/profile/main_pages.json']['src'],
+                         ['pages/Index', 'pages/SettingsActivity'])
+        strings = {e['name']: e['value'] for e in result.outputs['resources/base/element/string.json']['string']}
+        self.assertEqual(strings['module_desc'], 'Demo - CRAFT Generated')
+
+
+class TestBulkConversion(unittest.TestCase):
+    """测试多语言批量转换"""
+
+    LOCALES = ['values'] + [f'values-{lang}' for lang in ('de', 'fr', 'ja', 'zh-rCN', 'zh-rTW')]
+
+    def _make_project(self, root: Path, count: int):
+        for values_dir in self.LOCALES:
+            entries = ''.join(f'<string name="s{i}">{values_dir} {i}</string>' for i in range(count))
+            write(root / "res" / values_dir / "strings.xml", f'<resources>{entries}</resources>')
+        write(root / "res/values/misc.xml",
+              '<resources><dimen name="gap">8dp</dimen><bool name="tablet">false</bool>'
+              '<integer name="max">3</integer><string name="key" translatable="false">k</string>'
+              '<string-array name="days"><item>Mon</item><item>@string/s0</item></string-array>'
+              '<plurals name="n"><item quantity="one">1 item</item></plurals></resources>')
+        write(root / "res/values-sw600dp/strings.xml", '<resources/>')
+
+    def test_locales_and_types(self):
+        """测试每个语言一个输出, 各类型值正确"""
+        with tempfile.TemporaryDirectory() as tmp:
+            self._make_project(Path(tmp), 2000)
+            result = ResourceConverter(tmp).convert()
+
+        for locale in ('base', 'de', 'fr', 'ja', 'zh_CN', 'zh_TW'):
+            strings = result.outputs[f'resources/{locale}/element/string.json']['string']
+            self.assertEqual(len(strings), 2000 + (1 if locale == 'base' else 0))
+        self.assertEqual(result.outputs['resources/zh_CN/element/string.json']['string'][5],
+                         {'name': 's5', 'value': 'values-zh-rCN 5'})
+        self.assertEqual(result.outputs['resources/base/element/float.json'],
+                         {'float': [{'name': 'gap', 'value': '8vp'}]})
+        self.assertEqual(result.outputs['resources/base/element/boolean.json']['boolean'][0]['value'], False)
+        self.assertEqual(result.outputs['resources/base/element/strarray.json']['strarray'][0]['value'],
+                         [{'value': 'Mon'}, {'value': '$string:s0'}])
+        self.assertTrue(any('values-sw600dp' in s for s in result.skipped))
+
+    def test_each_output_written_once(self):
+        """测试输出一次写入, 再次转换时不重写"""
+        with tempfile.TemporaryDirectory() as tmp:
+            android, harmony = Path(tmp) / "android", Path(tmp) / "harmony"
+            self._make_project(android, 10)
+            first = convert_app(str(android), str(harmony))
+            self.assertEqual(len(first.written), len(set(first.written)))
+            self.assertTrue(os.path.exists(harmony / "resources/ja/element/string.json"))
+
+            second = convert_app(str(android), str(harmony))
+            self.assertEqual(second.written, [])
+            self.assertEqual(sorted(second.unchanged), sorted(first.written))
+
+
+if __name__ == '__main__':
+    unittest.main()
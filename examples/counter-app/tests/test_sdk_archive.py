@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - SDK 归档解析测试
+
+测试覆盖:
+1. 内存解析 - 直接从 zip/jar 条目解析, 结果与源文件一致
+2. 分片 - 各分片按条目区间划分, 合并后等于整体
+3. 并行 - 多进程解析保持归档顺序
+"""
+
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sdk_archive import iter_entries, parse_archive, parse_archive_parallel, shard_range
+from sdk_model import REPO_ROOT, JavaParser
+
+FIXTURES = REPO_ROOT / "tests/fixtures/android/app"
+
+
+class TestSdkArchive(unittest.TestCase):
+    """测试 SDK 归档解析"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = str(Path(self.tmp.name) / "android-sources.jar")
+        with zipfile.ZipFile(self.archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("META-INF/MANIFEST.MF", "Manifest-Version: 1.0\n")
+            zf.writestr("android/", "")
+            for name in ("Activity", "Fragment"):
+                zf.write(FIXTURES / f"{name}.java", f"android/app/{name}.java")
+            for i in range(10):
+                zf.writestr(f"android/gen/Gen{i}.java",
+                            f"package android.gen;\npublic class Gen{i} {{\n    public void run{i}() {{}}\n}}\n")
+            zf.writestr("android/gen/package-info.java", "package android.gen;\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_file_parser(self):
+        """测试归档条目解析结果与直接解析文件一致 (来源除外)"""
+        specs = {s.class_name: s for s in parse_archive(self.archive)}
+        from_file = JavaParser().parse_file(str(FIXTURES / "Activity.java"))
+        self.assertEqual(specs['Activity'].methods, from_file.methods)
+        self.assertEqual(specs['Activity'].parent_class, 'ContextThemeWrapper')
+        self.assertEqual(specs['Activity'].origin, f"{self.archive}!/android/app/Activity.java")
+
+    def test_non_source_entries_skipped(self):
+        """测试目录、清单和没有类型声明的条目被跳过"""
+        names = [name for name, _ in iter_entries(self.archive)]
+        self.assertNotIn("META-INF/MANIFEST.MF", names)
+        self.assertEqual(len(names), 13)
+        self.assertEqual(len(parse_archive(self.archive)), 12)
+
+    def test_shards_cover_archive(self):
+        """测试分片区间不重不漏"""
+        self.assertEqual([shard_range(10, (i, 3)) for i in range(3)], [(0, 3), (3, 6), (6, 10)])
+        full = [s.class_name for s in parse_archive(self.archive)]
+        sharded = [s.class_name for i in range(4) for s in parse_archive(self.archive, (i, 4))]
+        self.assertEqual(sharded, full)
+
+    def test_parallel_keeps_order(self):
+        """测试多进程解析与单进程结果一致"""
+        self.assertEqual(parse_archive_parallel(self.archive, workers=2), parse_archive(self.archive))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 词法括号扫描器测试
+
+测试覆盖:
+1. 跳过字符串、字符字面量、注释、Java 文本块、模板字符串 (含公开的跳过辅助函数)
+2. 三种括号的配对与位置
+3. 错误定位 (行号/列号)
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from syntax_scanner import language_for, scan, skip_block, skip_template_literal
+
+
+class TestLexicalSkipping(unittest.TestCase):
+    """测试字符串和注释中的括号被忽略"""
+
+    def test_hilog_format_string(self):
+        """测试 hilog 格式串中的 %{public}s"""
+        result = scan("hilog.error(DOMAIN, TAG, '失败: %{public}s', JSON.stringify(err));")
+        self.assertTrue(result.balanced)
+        self.assertEqual(result.count('{'), 0)
+
+    def test_comments(self):
+        """测试行注释和块注释"""
+        self.assertTrue(scan("// {\n/* ( [ */\nf();").balanced)
+
+    def test_template_literal_substitution(self):
+        """测试模板字符串及其中的 ${} 表达式"""
+        result = scan("const s = `a } ${ f({ x: [1] }) } b ${y}`;")
+        self.assertTrue(result.balanced)
+        self.assertEqual(result.count('{'), 1)
+        self.assertEqual(result.count('['), 1)
+
+    def test_skip_helpers(self):
+        """测试跳过模板字符串与代码块的公开辅助函数"""
+        source = "`a ${ {b: '}'} } c` + 1"
+        self.assertEqual(source[skip_template_literal(source, 1):], " + 1")
+        block = "{ f(`}`); { } } tail"
+        self.assertEqual(block[skip_block(block, 1):], " tail")
+
+    def test_java_text_block_and_char(self):
+        """测试 Java 文本块和字符字面量"""
+        code = 'String s = """\n  { ( \n""";\nchar c = \'{\';\nvoid f() {}'
+        self.assertTrue(scan(code, 'java').balanced)
+
+    def test_unterminated_string(self):
+        """测试未闭合的字符串被报告"""
+        result = scan("f('abc);")
+        self.assertFalse(result.balanced)
+        self.assertEqual(result.issues[0].kind, 'unterminated')
+
+
+class TestBracketPairs(unittest.TestCase):
+    """测试括号配对"""
+
+    def test_pair_positions(self):
+        """测试配对记录开闭位置"""
+        result = scan("f(a[0])")
+        self.assertEqual(sorted(result.pairs), [('(', 1, 6), ('[', 3, 5)])
+
+    def test_mismatch_located(self):
+        """测试交错括号报告行列号"""
+        result = scan("f() {\n  g(a[0)]\n}")
+        self.assertFalse(result.balanced)
+        self.assertEqual(result.first_error(), "Expected ']' but found ')' at line 2, column 8")
+        self.assertTrue(result.is_balanced('{'))
+        self.assertFalse(result.is_balanced('['))
+
+    def test_unclosed_and_unmatched(self):
+        """测试未闭合与多余闭括号"""
+        self.assertEqual(scan("{ (").issues[0].kind, 'unclosed')
+        self.assertEqual(scan("f() }").issues[0].kind, 'unmatched')
+
+    def test_language_for(self):
+        """测试按扩展名选择语言"""
+        self.assertEqual(language_for('A.java'), 'java')
+        self.assertEqual(language_for('Index.ets'), 'arkts')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+CRAFT Framework - 代码验证器测试
+
+测试覆盖:
+1. 单遍检查引擎 - 全部检查在一次扫描中完成
+2. 括号检查 - 花括号/圆括号/方括号同时检查
+3. CodeVerifier - 按文件类型验证生成的文件
+4. 验证缓存 - 可调用检查按源码与正则指纹化, 相同内容的文件共享条目, 并发分片合并写入
+"""
+
+import json
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from verify_code import (
+    BALANCED_BRACKETS, Check, CheckEngine, CodeVerifier, FILE_CHECKS, classify_file,
+    VerificationCache, _callable_fingerprint, checks_version, get_engine, merge_reports, run_tree, verify_tree,
+)
+
+_DIGITS = re.compile(r'\d+')
+
+
+def has_digits(content):
+    return bool(_DIGITS.search(content))
+
+PROJECT_DIR = Path(__file__).parent.parent
+HARMONY_DIR = PROJECT_DIR / "harmony/entry/src/main/ets"
+
+
+class TestCheckEngine(unittest.TestCase):
+    """测试单遍检查引擎"""
+
+    def test_results_in_declaration_order(self):
+        """测试结果按声明顺序返回"""
+        engine = get_engine("page")
+        results = engine.run("@Component\n@Entry\nstruct Index { build() { } }")
+        self.assertEqual([r.name for r in results], [
+            "@Entry decorator", "@Component decorator", "struct declaration",
+            "build() method", BALANCED_BRACKETS,
+        ])
+        self.assertTrue(all(r.passed for r in results))
+
+    def test_overlapping_checks_at_same_offset(self):
+        """测试同一位置开始的多个检查都能命中"""
+        engine = CheckEngine([
+            Check("onCreate", r'onCreate\s*\('),
+            Check("lifecycle", r'on(Create|Destroy)\s*\('),
+        ])
+        results = engine.run("x onCreate() y")
+        self.assertTrue(all(r.passed for r in results))
+
+    def test_missing_check_fails(self):
+        """测试缺失的检查失败"""
+        results = get_engine("ability").run("class A extends UIAbility { onCreate() {} }")
+        failed = {r.name for r in results if not r.passed}
+        self.assertEqual(failed, {
+            "Import UIAbility", "onDestroy method", "onForeground method", "onBackground method",
+        })
+
+    def test_forbidden_check(self):
+        """测试禁止出现的模式"""
+        results = get_engine("java").run("package a.b;\npublic class A { int x;; }")
+        syntax = [r for r in results if r.name == "No syntax errors"][0]
+        self.assertFalse(syntax.passed)
+        self.assertEqual(syntax.detail, "Double semicolon")
+
+    def test_all_bracket_kinds(self):
+        """测试三种括号在同一遍中检查"""
+        engine = CheckEngine([BALANCED_BRACKETS])
+        self.assertTrue(engine.run("f(a[0], { b: [1] })")[0].passed)
+        self.assertEqual(engine.run("f(a[0)]")[0].detail,
+                         "Expected ']' but found ')' at line 1, column 6")
+        self.assertEqual(engine.run("{ ( [")[0].detail, "Unclosed '{' at line 1, column 1")
+
+    def test_brackets_in_literals_ignored(self):
+        """测试字符串和注释中的括号不参与检查"""
+        engine = get_engine("ets")
+        code = "hilog.error(DOMAIN, TAG, '失败: %{public}s', x); // }\nconst s = `${a} }`;"
+        self.assertTrue(engine.run(code)[0].passed)
+
+    def test_checks_ignore_comments(self):
+        """测试注释中的内容不满足检查"""
+        results = get_engine("page").run("// @Entry\n@Component\nstruct Index { build() {} }")
+        self.assertFalse(results[0].passed)
+        self.assertTrue(results[1].passed)
+
+    def test_callable_check(self):
+        """测试可调用检查在扫描后执行"""
+        engine = CheckEngine([("Not empty", lambda c: True if c else "empty")])
+        self.assertTrue(engine.run("x")[0].passed)
+        self.assertEqual(engine.run("")[0].detail, "empty")
+
+
+class TestCodeVerifier(unittest.TestCase):
+    """测试 CodeVerifier 验证生成的文件"""
+
+    def test_generated_files_pass(self):
+        """测试生成的 .ets 文件全部通过"""
+        verifier = CodeVerifier()
+        files = [
+            (HARMONY_DIR / "pages/Index.ets", "page"),
+            (HARMONY_DIR / "EntryAbility.ets", "ability"),
+            (HARMONY_DIR / "adapters/MainActivityAdapter.ets", "adapter"),
+        ]
+        for path, file_type in files:
+            self.assertTrue(verifier.verify_arkts_file(str(path), file_type), path.name)
+        self.assertEqual(verifier.errors, [])
+        self.assertEqual(verifier.passed, sum(len(FILE_CHECKS[t]) for _, t in files))
+
+
+class TestTreeVerification(unittest.TestCase):
+    """测试目录级并行验证与 JSON 报告"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "pages").mkdir()
+        (self.root / "pages/Index.ets").write_text(
+            "@Entry\n@Component\nstruct Index { build() { } }", encoding='utf-8')
+        (self.root / "EntryAbility.ets").write_text("class X {", encoding='utf-8')
+        (self.root / "module.json5").write_text("// c\n{ \"a\": 1 }", encoding='utf-8')
+        (self.root / "notes.txt").write_text("ignored", encoding='utf-8')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_classify_file(self):
+        """测试按路径推断检查集"""
+        self.assertEqual(classify_file(Path("ets/pages/Index.ets")), "page")
+        self.assertEqual(classify_file(Path("ets/adapters/A.ets")), "adapter")
+        self.assertEqual(classify_file(Path("ets/EntryAbility.ets")), "ability")
+        self.assertEqual(classify_file(Path("res/layout/main.xml")), "xml")
+        self.assertIsNone(classify_file(Path("README.md")))
+
+    def test_report_structure(self):
+        """测试报告包含逐文件耗时与失败项"""
+        report = verify_tree(str(self.root), workers=1)
+        files = {f["path"]: f for f in report["files"]}
+        self.assertEqual(sorted(files), ["EntryAbility.ets", "module.json5", "pages/Index.ets"])
+        self.assertTrue(files["pages/Index.ets"]["passed"])
+        self.assertFalse(files["EntryAbility.ets"]["passed"])
+        self.assertIn("duration_ms", files["module.json5"])
+        self.assertEqual(report["summary"]["failed_files"], 1)
+
+    def test_process_pool_matches_serial(self):
+        """测试进程池结果与串行一致"""
+        serial = verify_tree(str(self.root), workers=1)
+        for i in range(8):
+            (self.root / f"pages/P{i}.ets").write_text("@Entry @Component struct P { build() {} }")
+        parallel = verify_tree(str(self.root), workers=2)
+        self.assertEqual(parallel["summary"]["files"], serial["summary"]["files"] + 8)
+        self.assertEqual(parallel["summary"]["failed_files"], 1)
+
+    def test_merge_shards(self):
+        """测试分片报告合并后与整体一致"""
+        whole = verify_tree(str(self.root), workers=1)
+        shards = [verify_tree(str(self.root), workers=1, shard=(i, 2)) for i in range(2)]
+        merged = merge_reports(shards)
+        self.assertEqual([f["path"] for f in merged["files"]], [f["path"] for f in whole["files"]])
+        self.assertEqual(merged["summary"]["checks_failed"], whole["summary"]["checks_failed"])
+        self.assertEqual(merged["shards"], ["0/2", "1/2"])
+
+    def test_cli_writes_json(self):
+        """测试命令行写出 JSON 报告"""
+        out = self.root / "report.json"
+        code = run_tree(["--root", str(self.root), "--workers", "1", "--json-out", str(out)])
+        self.assertEqual(code, 1)
+        self.assertEqual(json.loads(out.read_text())["summary"]["files"], 3)
+
+
+class TestVerificationCache(unittest.TestCase):
+    """测试验证结果缓存"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name) / "out"
+        (self.root / "pages").mkdir(parents=True)
+        self.page = self.root / "pages/Index.ets"
+        self.page.write_text("@Entry\n@Component\nstruct Index { build() { } }", encoding='utf-8')
+        (self.root / "pages/Other.ets").write_text("@Entry @Component struct O { build() {} }")
+        self.cache_path = str(Path(self.tmp.name) / "cache.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self):
+        cache = VerificationCache(self.cache_path)
+        return verify_tree(str(self.root), workers=1, cache=cache)
+
+    def test_unchanged_files_hit(self):
+        """测试未变化的文件命中缓存"""
+        first = self._run()
+        self.assertEqual(first["cache"], {"hits": 0, "misses": 2})
+        second = self._run()
+        self.assertEqual(second["cache"], {"hits": 2, "misses": 0})
+        self.assertEqual(second["summary"], {**first["summary"],
+                                             "total_duration_ms": second["summary"]["total_duration_ms"]})
+
+    def test_changed_file_reverified(self):
+        """测试内容变化的文件重新验证, 旧条目被替换"""
+        self._run()
+        self.page.write_text("@Entry @Component struct Index { build() {", encoding='utf-8')
+        report = self._run()
+        self.assertEqual(report["cache"], {"hits": 1, "misses": 1})
+        self.assertEqual(report["summary"]["failed_files"], 1)
+        self.assertEqual(len(VerificationCache(self.cache_path).entries), 2)
+
+    def test_checks_version_per_file_type(self):
+        """测试不同文件类型的检查集版本不同"""
+        self.assertNotEqual(checks_version("page"), checks_version("ability"))
+        self.assertEqual(checks_version("page"), checks_version("page"))
+
+    def test_callable_fingerprint(self):
+        """测试可调用检查的指纹包含源码与所用正则, 而不只是函数名"""
+        global _DIGITS
+        before = _callable_fingerprint(has_digits)
+        self.assertIn('bool(_DIGITS.search(content))', before)
+        original, _DIGITS = _DIGITS, re.compile(r'[0-9]')
+        try:
+            self.assertNotEqual(_callable_fingerprint(has_digits), before)
+        finally:
+            _DIGITS = original
+        other = lambda content: not content
+        other.__name__ = has_digits.__name__
+        self.assertNotEqual(_callable_fingerprint(other), before)
+
+    def test_identical_files_share_entry(self):
+        """测试内容相同的两个文件之一变化后, 另一个仍命中缓存"""
+        (self.root / "pages/Copy.ets").write_text(self.page.read_text(encoding='utf-8'), encoding='utf-8')
+        self._run()
+        self.page.write_text("@Entry @Component struct Index { build() {", encoding='utf-8')
+        self._run()
+        report = self._run()
+        self.assertEqual(report["cache"], {"hits": 3, "misses": 0})
+
+    def test_concurrent_shards_merge(self):
+        """测试共享缓存文件的并发分片合并条目而不是互相覆盖"""
+        caches = [VerificationCache(self.cache_path) for _ in range(2)]
+        for index, cache in enumerate(caches):
+            verify_tree(str(self.root), workers=1, shard=(index, 2), cache=cache)
+        merged = VerificationCache(self.cache_path)
+        self.assertEqual(sorted(p for value in merged.entries.values() for p in value["paths"]),
+                         ["pages/Index.ets", "pages/Other.ets"])
+        self.assertEqual(self._run()["cache"], {"hits": 2, "misses": 0})
+
+    def test_corrupt_cache_ignored(self):
+        """测试损坏的缓存文件被忽略"""
+        Path(self.cache_path).write_text("{not json")
+        self.assertEqual(self._run()["cache"]["misses"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
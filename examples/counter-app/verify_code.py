@@ -6,10 +6,229 @@ Verifies that the generated Android and HarmonyOS code is syntactically correct
 and follows the expected patterns.
 """
 
+import argparse
+import hashlib
+import inspect
+import json
 import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from android_xml import XmlDocument, load_xml, parse_xml
+from syntax_scanner import TOKEN_PATTERNS, BracketScanner
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; concurrent shards then race on the cache file
+    fcntl = None
+
+
+@dataclass
+class Check:
+    """A single regex check. Forbidden checks fail when the pattern is found."""
+    name: str
+    pattern: str
+    forbidden: bool = False
+    message: Optional[str] = None
+
+
+@dataclass
+class CheckResult:
+    name: str
+    passed: bool
+    detail: Optional[str] = None
+
+
+# Sentinel entry: balanced {}, () and [] are checked in the same pass
+BALANCED_BRACKETS = "Balanced brackets"
+
+
+CheckEntry = Union[Check, str, tuple]
+
+FILE_CHECKS: Dict[str, List[CheckEntry]] = {
+    "java": [
+        Check("Package declaration", r'package\s+[\w.]+;'),
+        Check("Class declaration", r'public\s+class\s+\w+'),
+        Check("onCreate method", r'protected\s+void\s+onCreate\s*\('),
+        BALANCED_BRACKETS,
+        Check("No syntax errors", r';\s*;', forbidden=True, message="Double semicolon"),
+    ],
+    "page": [
+        Check("@Entry decorator", r'@Entry'),
+        Check("@Component decorator", r'@Component'),
+        Check("struct declaration", r'struct\s+\w+'),
+        Check("build() method", r'build\s*\(\s*\)'),
+        BALANCED_BRACKETS,
+    ],
+    "ability": [
+        Check("Import UIAbility", r'import.*UIAbility'),
+        Check("Class extends UIAbility", r'class\s+\w+\s+extends\s+UIAbility'),
+        Check("onCreate method", r'onCreate\s*\('),
+        Check("onDestroy method", r'onDestroy\s*\('),
+        Check("onForeground method", r'onForeground\s*\('),
+        Check("onBackground method", r'onBackground\s*\('),
+        BALANCED_BRACKETS,
+    ],
+    "adapter": [
+        Check("Export class", r'export\s+class'),
+        Check("Constructor", r'constructor\s*\('),
+        Check("Lifecycle methods", r'on(Create|Start|Resume|Pause|Stop|Destroy)\s*\('),
+        BALANCED_BRACKETS,
+    ],
+    "ets": [
+        BALANCED_BRACKETS,
+    ],
+    # Adapters written by AdapterGenerator; lifecycle methods only appear when the source has them
+    "java_adapter": [
+        Check("Package declaration", r'package\s+[\w.]+;'),
+        Check("Adapter class", r'public\s+class\s+\w+\s+extends\s+[\w.]+'),
+        Check("Delegate field", r'private\s+final\s+[\w.]+\s+delegate\s*;'),
+        Check("Constructor", r'public\s+\w+Adapter\s*\('),
+        BALANCED_BRACKETS,
+        Check("No syntax errors", r';\s*;', forbidden=True, message="Double semicolon"),
+    ],
+    "arkts_adapter": [
+        Check("Export class", r'export\s+class\s+\w+'),
+        Check("Delegate field", r'private\s+delegate\s*:'),
+        Check("Constructor", r'constructor\s*\('),
+        BALANCED_BRACKETS,
+    ],
+}
+
+# Generated adapter suffix -> check set (classify_file is for hand-written project trees)
+GENERATED_ADAPTER_TYPES = {
+    '.java': "java_adapter",
+    '.ets': "arkts_adapter",
+}
+
+_JAVA_TYPES = ("java", "java_adapter")
+
+class CheckEngine:
+    """
+    Runs every check of a file type in a single forward pass over the content.
+
+    All regex checks are compiled into one alternation of lookaheads together
+    with the lexical tokens of syntax_scanner, so brackets inside strings,
+    template literals and comments are ignored and regex checks only match in
+    code. Each check only needs its first occurrence, so once a check matches
+    it is dropped and scanning resumes at the same offset with the regex for
+    the remaining checks (compiled once and cached).
+    Callable checks (name, func) run on the content after the pass.
+    """
+
+    def __init__(self, checks: List[CheckEntry], language: str = 'arkts'):
+        self.entries = checks
+        self.language = language
+        self.regex_checks = [c for c in checks if isinstance(c, Check)]
+        self.callable_checks = [c for c in checks if isinstance(c, tuple)]
+        self.check_brackets = BALANCED_BRACKETS in checks
+        self._compiled: Dict[frozenset, re.Pattern] = {}
+
+    def _regex_for(self, remaining: frozenset) -> Optional[re.Pattern]:
+        regex = self._compiled.get(remaining)
+        if regex is None and (remaining or self.check_brackets):
+            parts = [f'(?=(?P<chk{i}>{self.regex_checks[i].pattern}))' for i in sorted(remaining)]
+            if self.check_brackets:
+                parts.append(f'(?s:{TOKEN_PATTERNS[self.language]})')
+            regex = re.compile('|'.join(parts), re.MULTILINE)
+            self._compiled[remaining] = regex
+        return regex
+
+    def run(self, content: str) -> List[CheckResult]:
+        """Run all checks and return results in declaration order."""
+        found = [False] * len(self.regex_checks)
+        remaining = frozenset(range(len(self.regex_checks)))
+        scanner = BracketScanner(content)
+        pos = 0
+
+        regex = self._regex_for(remaining)
+        while regex is not None and pos < len(content):
+            resume = None
+            for m in regex.finditer(content, pos):
+                group = m.lastgroup
+                if group.startswith('chk'):
+                    index = int(group[3:])
+                    found[index] = True
+                    remaining = remaining - {index}
+                    regex = self._regex_for(remaining)
+                    resume = m.start()
+                    break
+                resume = scanner.feed(m)
+                if resume is not None:
+                    break
+            if resume is None:
+                break
+            pos = resume
+
+        brackets = scanner.finish()
+        results = []
+        regex_iter = iter(range(len(self.regex_checks)))
+        for entry in self.entries:
+            if isinstance(entry, Check):
+                index = next(regex_iter)
+                if entry.forbidden:
+                    results.append(CheckResult(entry.name, not found[index],
+                                               entry.message if found[index] else None))
+                else:
+                    results.append(CheckResult(entry.name, found[index]))
+            elif entry == BALANCED_BRACKETS:
+                results.append(CheckResult(entry, brackets.balanced, brackets.first_error()))
+            else:
+                name, func = entry
+                result = func(content)
+                results.append(CheckResult(name, result is True, None if result is True else result))
+        return results
+
+
+_ENGINES: Dict[str, CheckEngine] = {}
+
+
+def get_engine(file_type: str) -> CheckEngine:
+    """Return the cached engine for a file type."""
+    engine = _ENGINES.get(file_type)
+    if engine is None:
+        engine = CheckEngine(FILE_CHECKS.get(file_type, FILE_CHECKS["ets"]),
+                             language='java' if file_type in _JAVA_TYPES else 'arkts')
+        _ENGINES[file_type] = engine
+    return engine
+
+
+def check_json(content: str) -> List[CheckResult]:
+    """Validate JSON/JSON5 content (comments are stripped first)."""
+    # Remove single-line comments
+    content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
+    # Remove multi-line comments
+    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
+    try:
+        json.loads(content)
+    except json.JSONDecodeError as e:
+        return [CheckResult("Valid JSON structure", False, f"Invalid JSON: {e}")]
+    return [CheckResult("Valid JSON structure", True)]
+
+
+def xml_results(document: XmlDocument) -> List[CheckResult]:
+    """Check results for a document parsed by android_xml (one expat pass)."""
+    return [
+        CheckResult("XML declaration", document.has_declaration),
+        CheckResult("Root element", document.root is not None),
+        CheckResult("Balanced tags", document.error is None, document.error),
+    ]
+
+
+def check_content(content: str, file_type: str) -> List[CheckResult]:
+    """Run all checks for a file type without printing."""
+    if file_type == "json":
+        return check_json(content)
+    if file_type == "xml":
+        return xml_results(parse_xml(content))
+    return get_engine(file_type).run(content)
+
 
 class CodeVerifier:
     def __init__(self):
@@ -24,15 +243,7 @@ class CodeVerifier:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
 
-        checks = [
-            ("Package declaration", r'package\s+[\w.]+;'),
-            ("Class declaration", r'public\s+class\s+\w+'),
-            ("onCreate method", r'protected\s+void\s+onCreate\s*\('),
-            ("Balanced braces", self._check_balanced_braces),
-            ("No syntax errors", self._check_java_syntax),
-        ]
-
-        return self._run_checks(content, checks)
+        return self._report(get_engine("java").run(content))
 
     def verify_arkts_file(self, filepath: str, file_type: str = "page") -> bool:
         """Verify ArkTS source file structure."""
@@ -41,135 +252,416 @@ class CodeVerifier:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
 
-        if file_type == "page":
-            checks = [
-                ("@Entry decorator", r'@Entry'),
-                ("@Component decorator", r'@Component'),
-                ("struct declaration", r'struct\s+\w+'),
-                ("build() method", r'build\s*\(\s*\)'),
-                ("Balanced braces", self._check_balanced_braces),
-            ]
-        elif file_type == "ability":
-            checks = [
-                ("Import UIAbility", r'import.*UIAbility'),
-                ("Class extends UIAbility", r'class\s+\w+\s+extends\s+UIAbility'),
-                ("onCreate method", r'onCreate\s*\('),
-                ("onDestroy method", r'onDestroy\s*\('),
-                ("onForeground method", r'onForeground\s*\('),
-                ("onBackground method", r'onBackground\s*\('),
-                ("Balanced braces", self._check_balanced_braces),
-            ]
-        elif file_type == "adapter":
-            checks = [
-                ("Export class", r'export\s+class'),
-                ("Constructor", r'constructor\s*\('),
-                ("Lifecycle methods", r'on(Create|Start|Resume|Pause|Stop|Destroy)\s*\('),
-                ("Balanced braces", self._check_balanced_braces),
-            ]
-        else:
-            checks = [("Balanced braces", self._check_balanced_braces)]
-
-        return self._run_checks(content, checks)
+        return self._report(get_engine(file_type).run(content))
 
     def verify_xml_file(self, filepath: str) -> bool:
         """Verify XML file structure."""
         print(f"\n  Verifying XML: {Path(filepath).name}")
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        checks = [
-            ("XML declaration", r'<\?xml'),
-            ("Root element", r'<\w+[^>]*>'),
-            ("Balanced tags", self._check_xml_balanced),
-        ]
-
-        return self._run_checks(content, checks)
+        return self._report(xml_results(load_xml(filepath)))
 
     def verify_json_file(self, filepath: str) -> bool:
         """Verify JSON file structure."""
         print(f"\n  Verifying JSON: {Path(filepath).name}")
 
-        import json
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                # Handle JSON5 (remove comments)
-                content = f.read()
-                # Remove single-line comments
-                content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
-                # Remove multi-line comments
-                content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-                json.loads(content)
-            print("    [PASS] Valid JSON structure")
+        with open(filepath, 'r', encoding='utf-8') as f:
+            result = check_json(f.read())[0]
+
+        if result.passed:
+            print(f"    [PASS] {result.name}")
             self.passed += 1
             return True
-        except json.JSONDecodeError as e:
-            print(f"    [FAIL] Invalid JSON: {e}")
-            self.errors.append(f"{filepath}: {e}")
-            return False
+        print(f"    [FAIL] {result.detail}")
+        self.errors.append(f"{filepath}: {result.detail}")
+        return False
 
     def _run_checks(self, content: str, checks: list) -> bool:
-        """Run a list of checks on content."""
+        """Run a list of (name, pattern-or-callable) checks on content."""
+        entries = [
+            (name, pattern) if callable(pattern) else Check(name, pattern)
+            for name, pattern in checks
+        ]
+        return self._report(CheckEngine(entries).run(content))
+
+    def _report(self, results: List[CheckResult]) -> bool:
+        """Print check results and record them."""
         all_passed = True
 
-        for check_name, check_pattern in checks:
-            if callable(check_pattern):
-                result = check_pattern(content)
-                if result is True:
-                    print(f"    [PASS] {check_name}")
-                    self.passed += 1
-                else:
-                    print(f"    [FAIL] {check_name}: {result}")
-                    self.errors.append(f"{check_name}: {result}")
-                    all_passed = False
+        for result in results:
+            if result.passed:
+                print(f"    [PASS] {result.name}")
+                self.passed += 1
+            elif result.detail:
+                print(f"    [FAIL] {result.name}: {result.detail}")
+                self.errors.append(f"{result.name}: {result.detail}")
+                all_passed = False
             else:
-                if re.search(check_pattern, content):
-                    print(f"    [PASS] {check_name}")
-                    self.passed += 1
-                else:
-                    print(f"    [FAIL] {check_name}")
-                    self.errors.append(f"Missing: {check_name}")
-                    all_passed = False
+                print(f"    [FAIL] {result.name}")
+                self.errors.append(f"Missing: {result.name}")
+                all_passed = False
 
         return all_passed
 
     def _check_balanced_braces(self, content: str) -> bool:
-        """Check if braces are balanced."""
-        count = 0
-        for char in content:
-            if char == '{':
-                count += 1
-            elif char == '}':
-                count -= 1
-            if count < 0:
-                return "Unmatched closing brace"
-        if count != 0:
-            return f"Unbalanced braces: {count} unclosed"
-        return True
-
-    def _check_java_syntax(self, content: str) -> bool:
-        """Basic Java syntax check."""
-        # Check for common syntax errors
-        if re.search(r';\s*;', content):
-            return "Double semicolon"
-        if re.search(r'\(\s*\)', content) and not re.search(r'(void|new|super|this)\s*\(\s*\)', content):
-            pass  # Empty parens are OK in method definitions
-        return True
-
-    def _check_xml_balanced(self, content: str) -> bool:
-        """Check if XML tags are balanced."""
-        # Count opening tags (not self-closing)
-        opening = len(re.findall(r'<(\w+)(?:\s[^>]*)?>(?!</)', content))
-        # Count closing tags
-        closing = len(re.findall(r'</(\w+)>', content))
-        # Self-closing tags don't need matching
-        self_closing = len(re.findall(r'<\w+[^>]*/>', content))
-
-        # For Android XML, many elements are self-closing
-        # Just verify no obvious errors
-        if opening < closing:
-            return f"More closing tags than opening: {opening} vs {closing}"
-        return True
+        """Check if braces, parentheses and brackets are balanced."""
+        result = get_engine("ets").run(content)[0]
+        return True if result.passed else result.detail
+
+
+# ============================================================================
+# Tree verification (parallel, JSON report)
+# ============================================================================
+
+REPORT_VERSION = 1
+
+_SKIP_DIRS = {'build', 'node_modules', 'oh_modules', '.hvigor', '.gradle', '.git'}
+
+
+def classify_file(path: Path) -> Optional[str]:
+    """Map a generated file to its check set, or None if it is not verified."""
+    suffix = path.suffix
+    if suffix == '.java':
+        return "java"
+    if suffix == '.xml':
+        return "xml"
+    if suffix in ('.json', '.json5'):
+        return "json"
+    if suffix == '.ets':
+        parts = path.parts
+        if 'pages' in parts:
+            return "page"
+        if 'adapters' in parts:
+            return "adapter"
+        if path.stem.endswith('Ability'):
+            return "ability"
+        return "ets"
+    return None
+
+
+def discover_files(root: str) -> List[tuple]:
+    """List (path, file_type) for every verifiable file under root, sorted."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS)
+        for name in sorted(filenames):
+            path = Path(dirpath) / name
+            file_type = classify_file(path)
+            if file_type:
+                found.append((str(path), file_type))
+    return found
+
+
+# Bump when check semantics change in ways the check definitions do not show
+# (scanner behaviour, callable checks, JSON handling).
+CHECKS_VERSION = 2
+
+_CHECKS_VERSIONS: Dict[str, str] = {}
+
+
+def _callable_fingerprint(check) -> str:
+    """Source of a callable check plus the regexes it reads from module globals."""
+    code = getattr(check, '__code__', None)
+    try:
+        source = inspect.getsource(check)
+    except (OSError, TypeError):
+        source = f"{code.co_code.hex()}|{code.co_consts!r}" if code else repr(check)
+    namespace = getattr(check, '__globals__', {})
+    patterns = [f"{name}={namespace[name].pattern!r}/{namespace[name].flags}"
+                for name in (code.co_names if code else ())
+                if isinstance(namespace.get(name), re.Pattern)]
+    return '|'.join([source] + patterns)
+
+
+def checks_version(file_type: str) -> str:
+    """Fingerprint of the check set for a file type."""
+    version = _CHECKS_VERSIONS.get(file_type)
+    if version is None:
+        parts = [str(CHECKS_VERSION), file_type]
+        for entry in FILE_CHECKS.get(file_type, []):
+            if isinstance(entry, Check):
+                parts.append(f"{entry.name}|{entry.pattern}|{entry.forbidden}|{entry.message}")
+            elif isinstance(entry, tuple):
+                parts.append(f"{entry[0]}|{_callable_fingerprint(entry[1])}")
+            else:
+                parts.append(f"{entry}|{TOKEN_PATTERNS['java' if file_type in _JAVA_TYPES else 'arkts']}")
+        version = hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()[:12]
+        _CHECKS_VERSIONS[file_type] = version
+    return version
+
+
+def cache_key(digest: str, file_type: str) -> str:
+    return f"{digest}:{file_type}:{checks_version(file_type)}"
+
+
+class VerificationCache:
+    """
+    Persistent CodeVerifier results keyed by (content hash, file type,
+    checks version). Stored as one JSON file; each entry lists the paths
+    currently holding that content, and is dropped once none do.
+
+    Shards of one tree may share a cache file: save() re-reads the file
+    under a lock and applies only the paths this run verified, so shards
+    add to each other's entries instead of overwriting them.
+    """
+
+    FORMAT = 2
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.entries = self._load()
+        self._by_path = _path_index(self.entries)
+        self._recorded: Dict[str, str] = {}
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get("entries", {}) if data.get("format") == self.FORMAT else {}
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Key -> result mapping handed to workers."""
+        return {key: value["result"] for key, value in self.entries.items()}
+
+    def record(self, rel_path: str, entry: dict):
+        """Update statistics and point rel_path at the result for its current content."""
+        if entry.get("cached"):
+            self.hits += 1
+        else:
+            self.misses += 1
+        key = entry.get("key")
+        if not key:
+            return
+        result = {"passed": entry["passed"], "checks": entry["checks"]}
+        if _assign(self.entries, self._by_path, rel_path, key, result):
+            self._recorded[rel_path] = key
+
+    def save(self):
+        if not self._recorded:
+            return
+        with self._locked():
+            entries = self._load()
+            by_path = _path_index(entries)
+            for rel_path, key in self._recorded.items():
+                _assign(entries, by_path, rel_path, key, self.entries[key]["result"])
+            tmp = f"{self.path}.tmp.{os.getpid()}"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({"format": self.FORMAT, "entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        self.entries, self._by_path = entries, by_path
+        self._recorded.clear()
+
+    @contextmanager
+    def _locked(self):
+        """Serialize read-merge-write cycles of concurrent shards."""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _path_index(entries: Dict[str, dict]) -> Dict[str, str]:
+    return {path: key for key, value in entries.items() for path in value["paths"]}
+
+
+def _assign(entries: Dict[str, dict], by_path: Dict[str, str], rel_path: str, key: str, result: dict) -> bool:
+    """Point rel_path at key; an entry no path points to any more is dropped. Returns whether anything changed."""
+    old = by_path.get(rel_path)
+    if old == key and key in entries:
+        return False
+    if old is not None and old in entries:
+        paths = entries[old]["paths"]
+        if rel_path in paths:
+            paths.remove(rel_path)
+        if not paths:
+            del entries[old]
+    entries.setdefault(key, {"paths": [], "result": result})["paths"].append(rel_path)
+    by_path[rel_path] = key
+    return True
+
+
+def verify_path(path: str, file_type: str, cached: Optional[Dict[str, dict]] = None) -> dict:
+    """Verify one file and return its report entry, reusing cached results."""
+    start = time.perf_counter()
+    entry = {"path": path, "file_type": file_type}
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        key = cache_key(hashlib.sha256(data).hexdigest(), file_type)
+        entry["key"] = key
+        hit = cached.get(key) if cached else None
+        if hit is not None:
+            entry.update(hit)
+            entry["cached"] = True
+            entry["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            return entry
+        results = check_content(data.decode('utf-8'), file_type)
+    except (OSError, UnicodeDecodeError) as e:
+        results = [CheckResult("Readable", False, str(e))]
+    entry["passed"] = all(r.passed for r in results)
+    entry["checks"] = [asdict(r) for r in results]
+    entry["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return entry
+
+
+_WORKER_CACHE: Optional[Dict[str, dict]] = None
+
+
+def _init_worker(cached: Optional[Dict[str, dict]]):
+    global _WORKER_CACHE
+    _WORKER_CACHE = cached
+
+
+def _verify_job(job: tuple) -> dict:
+    return verify_path(*job, cached=_WORKER_CACHE)
+
+
+def _summarize(files: List[dict]) -> dict:
+    checks = [c for f in files for c in f["checks"]]
+    return {
+        "files": len(files),
+        "passed_files": sum(1 for f in files if f["passed"]),
+        "failed_files": sum(1 for f in files if not f["passed"]),
+        "checks_passed": sum(1 for c in checks if c["passed"]),
+        "checks_failed": sum(1 for c in checks if not c["passed"]),
+        "total_duration_ms": round(sum(f["duration_ms"] for f in files), 3),
+    }
+
+
+def verify_tree(root: str, workers: Optional[int] = None, shard: tuple = (0, 1),
+                cache: Optional[VerificationCache] = None) -> dict:
+    """
+    Verify every generated file under root across a process pool.
+
+    shard=(index, count) selects every count-th file starting at index, so
+    separate machines can split a tree and merge_reports() the results.
+    With a cache, unchanged files are answered from it inside the workers
+    and only changed files are checked.
+    """
+    start = time.perf_counter()
+    index, count = shard
+    jobs = discover_files(root)[index::count]
+    workers = workers or os.cpu_count() or 1
+    cached = cache.snapshot() if cache else None
+
+    if workers == 1 or len(jobs) < 2 * workers:
+        files = [verify_path(*job, cached=cached) for job in jobs]
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(cached,)) as pool:
+            files = list(pool.map(_verify_job, jobs, chunksize=chunksize))
+
+    for entry in files:
+        entry["path"] = os.path.relpath(entry["path"], root)
+        if cache:
+            cache.record(entry["path"], entry)
+        entry.pop("key", None)
+    if cache:
+        cache.save()
+
+    report = {
+        "version": REPORT_VERSION,
+        "root": str(root),
+        "shards": [f"{index}/{count}"],
+        "wall_time_ms": round((time.perf_counter() - start) * 1000, 3),
+        "summary": _summarize(files),
+        "files": files,
+    }
+    if cache:
+        report["cache"] = {"hits": cache.hits, "misses": cache.misses}
+    return report
+
+
+def merge_reports(reports: List[dict]) -> dict:
+    """Merge shard reports; a path seen twice keeps the later entry."""
+    by_path = {}
+    for report in reports:
+        for entry in report["files"]:
+            by_path[entry["path"]] = entry
+    files = [by_path[path] for path in sorted(by_path)]
+    merged = {
+        "version": REPORT_VERSION,
+        "root": reports[0]["root"] if reports else "",
+        "shards": [s for r in reports for s in r.get("shards", [])],
+        # Shards run concurrently, so the merged wall time is the slowest shard
+        "wall_time_ms": max((r.get("wall_time_ms", 0) for r in reports), default=0),
+        "summary": _summarize(files),
+        "files": files,
+    }
+    caches = [r["cache"] for r in reports if "cache" in r]
+    if caches:
+        merged["cache"] = {
+            "hits": sum(c["hits"] for c in caches),
+            "misses": sum(c["misses"] for c in caches),
+        }
+    return merged
+
+
+def print_report(report: dict):
+    """Print the failures and summary of a tree report."""
+    for entry in report["files"]:
+        if not entry["passed"]:
+            print(f"\n  [FAIL] {entry['path']} ({entry['file_type']})")
+            for check in entry["checks"]:
+                if not check["passed"]:
+                    detail = f": {check['detail']}" if check["detail"] else ""
+                    print(f"    - {check['name']}{detail}")
+    summary = report["summary"]
+    print("\n" + "=" * 70)
+    print("  Verification Summary")
+    print("=" * 70)
+    print(f"\n  Files: {summary['files']} ({summary['failed_files']} failed)")
+    print(f"  Checks passed: {summary['checks_passed']}")
+    print(f"  Checks failed: {summary['checks_failed']}")
+    if "cache" in report:
+        print(f"  Cache: {report['cache']['hits']} hits, {report['cache']['misses']} misses")
+    print(f"  Wall time: {report['wall_time_ms']:.1f} ms")
+
+
+def _parse_shard(value: str) -> tuple:
+    index, count = (int(v) for v in value.split('/'))
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"invalid shard {value!r}, expected INDEX/COUNT")
+    return index, count
+
+
+def run_tree(argv: Optional[List[str]] = None) -> int:
+    """Command line entry for discovery mode and report merging."""
+    arg_parser = argparse.ArgumentParser(description="CRAFT code verification")
+    arg_parser.add_argument("--root", help="verify every generated file under this directory")
+    arg_parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    arg_parser.add_argument("--shard", type=_parse_shard, default=(0, 1), help="INDEX/COUNT")
+    arg_parser.add_argument("--json-out", help="write the JSON report to this file")
+    arg_parser.add_argument("--merge", nargs='+', metavar="REPORT", help="merge shard reports")
+    arg_parser.add_argument("--cache", help="verification result cache file (reused across runs)")
+    args = arg_parser.parse_args(argv)
+
+    if args.merge:
+        reports = []
+        for path in args.merge:
+            with open(path, 'r', encoding='utf-8') as f:
+                reports.append(json.load(f))
+        report = merge_reports(reports)
+    elif args.root:
+        cache = VerificationCache(args.cache) if args.cache else None
+        report = verify_tree(args.root, args.workers, args.shard, cache)
+    else:
+        arg_parser.error("either --root or --merge is required")
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print_report(report)
+    return 0 if report["summary"]["failed_files"] == 0 else 1
 
 
 def main():
@@ -288,4 +780,4 @@ def main():
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit(run_tree() if len(sys.argv) > 1 else main())